@@ -0,0 +1,97 @@
+"""
+Benchmark for the async repository methods under concurrent load.
+
+Fires --requests requests (default 2000, 1 in 5 a write) at a
+ProjectRepository from --concurrency concurrent clients (default 100) on one
+event loop, once calling the blocking methods directly in the coroutines and
+once through the *_async methods. Reports throughput and the worst delay seen
+by a heartbeat task, i.e. how long the event loop was blocked.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_async_repository.py [--requests 2000] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from backend.repositories.project_repository import ProjectRepository
+
+FILES = ['wbs_levels.json', 'resources.json', 'allocations.json', 'project_start_date.json']
+
+
+async def heartbeat(stop, interval=0.005):
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def load(repository, projects, requests, concurrency, use_async, payload):
+    rng = random.Random(0)
+    plan = []
+    for _ in range(requests):
+        write = rng.random() < 0.2
+        # Reads and writes share the files; writes are atomic, so no reader sees a partial file
+        plan.append((rng.choice(projects), rng.choice(FILES), write))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(project_id, filename, write):
+        async with semaphore:
+            if use_async:
+                if write:
+                    await repository.write_json_file_async(project_id, filename, payload)
+                else:
+                    await repository.read_json_file_async(project_id, filename)
+            else:
+                if write:
+                    repository.write_json_file(project_id, filename, payload)
+                else:
+                    repository.read_json_file(project_id, filename)
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*request) for request in plan))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await monitor
+
+
+def run(requests, concurrency, projects_count, items):
+    base_dir = tempfile.mkdtemp()
+    try:
+        repository = ProjectRepository(base_dir)
+        projects = [f"project{i}" for i in range(projects_count)]
+        payload = [{"id": i, "name": f"Resource {i}", "role": "Developer", "hours": i % 40} for i in range(items)]
+        for project_id in projects:
+            repository.create_project(project_id)
+            for filename in FILES:
+                repository.write_json_file(project_id, filename, payload)
+        for use_async in (False, True):
+            elapsed, worst_lag = asyncio.run(load(repository, projects, requests, concurrency, use_async, payload))
+            mode = "async (worker threads)" if use_async else "blocking on the loop"
+            print(f"{mode:24s} requests={requests} concurrency={concurrency} in {elapsed:.3f}s "
+                  f"({requests / elapsed:.0f} req/s) worst event-loop stall={worst_lag * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Async repository benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--items", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.projects, args.items)
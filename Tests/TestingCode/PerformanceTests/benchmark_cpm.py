@@ -0,0 +1,58 @@
+"""
+Benchmark for the critical path (CPM) engine.
+
+Builds a random dependency graph of --activities activities (default 100k)
+with up to --max-preds predecessors each, runs a full compute() and then
+--updates incremental duration changes (default 1000), each followed by a
+check of the critical path length.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_cpm.py [--activities 100000] [--updates 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.critical_path import CriticalPathEngine
+
+
+def build_activities(count, max_preds, seed=0):
+    rng = random.Random(seed)
+    activities = []
+    for i in range(count):
+        # Predecessors are drawn from a window of recent activities, like phases of work
+        window = range(max(0, i - 200), i)
+        predecessors = rng.sample(window, min(len(window), rng.randint(0, max_preds)))
+        activities.append((i, rng.randint(1, 10), predecessors))
+    return activities
+
+
+def run(count, max_preds, updates):
+    activities = build_activities(count, max_preds)
+    start = time.perf_counter()
+    engine = CriticalPathEngine(activities)
+    built = time.perf_counter()
+    engine.compute()
+    computed = time.perf_counter()
+    rng = random.Random(1)
+    for _ in range(updates):
+        engine.set_duration(rng.randrange(count), rng.randint(1, 10))
+    updated = time.perf_counter()
+    edges = sum(len(preds) for preds in engine.predecessors)
+    print(f"activities={count} edges={edges} build={built - start:.3f}s compute={computed - built:.3f}s "
+          f"updates={updates} in {updated - computed:.3f}s critical={len(engine.critical_activities())} "
+          f"finish={engine.project_finish:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Critical path engine benchmark")
+    parser.add_argument("--activities", type=int, default=100000)
+    parser.add_argument("--max-preds", type=int, default=3)
+    parser.add_argument("--updates", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.activities, args.max_preds, args.updates)
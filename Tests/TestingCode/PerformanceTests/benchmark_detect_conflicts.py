@@ -0,0 +1,60 @@
+"""
+Benchmark for TaskManagement.detect_conflicts.
+
+Builds --tasks tasks (default 100k) with up to --max-preds dependencies each,
+a few dangling references and one long cycle, assigns them to --users users
+with a schedule, and times a full validation.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_detect_conflicts.py [--tasks 100000] [--users 500]
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.task_management import Task, TaskManagement
+
+
+def build(count, max_preds, users, seed=0):
+    rng = random.Random(seed)
+    manager = TaskManagement()
+    schedule = {}
+    for i in range(count):
+        window = range(max(0, i - 200), i)
+        dependencies = rng.sample(window, min(len(window), rng.randint(0, max_preds)))
+        if rng.random() < 0.001:
+            dependencies.append(count + i)
+        manager.tasks[i] = Task(id=i, title=f"Task {i}", dependencies=dependencies,
+                                assigned_to=[f"user{rng.randrange(users)}"])
+        start = rng.randint(0, 2000)
+        schedule[i] = (start, start + rng.randint(1, 10))
+    # Close one long cycle
+    manager.tasks[0].dependencies.append(count - 1)
+    return manager, schedule
+
+
+def run(count, max_preds, users):
+    manager, schedule = build(count, max_preds, users)
+    start = time.perf_counter()
+    graph_conflicts = manager.detect_conflicts()
+    checked = time.perf_counter()
+    all_conflicts = manager.detect_conflicts(schedule=schedule, max_concurrent=3)
+    finished = time.perf_counter()
+    kinds = collections.Counter(conflict.kind for conflict in all_conflicts)
+    print(f"tasks={count} graph check={checked - start:.3f}s ({len(graph_conflicts)} conflicts) "
+          f"with schedule={finished - checked:.3f}s {dict(kinds)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conflict detection benchmark")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--max-preds", type=int, default=3)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+    run(args.tasks, args.max_preds, args.users)
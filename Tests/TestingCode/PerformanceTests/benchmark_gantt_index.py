@@ -0,0 +1,75 @@
+"""
+Benchmark for windowed Gantt queries.
+
+Builds a WBS of about --tasks tasks (default 100k) spread over a year,
+indexes it once and times --queries page requests (default 1000) for random
+one-week windows, compared with filtering the full build_gantt_data() list.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_gantt_index.py [--tasks 100000] [--queries 1000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.gantt_chart_data import GanttChartData
+
+
+def build_wbs(count, seed=0):
+    rng = random.Random(seed)
+    base = datetime.date(2025, 1, 1)
+    roots = []
+    task_id = 0
+    while task_id < count:
+        task_id += 1
+        phase = {"id": task_id, "name": f"Phase {task_id}", "duration_days": 60,
+                 "start_date": (base + datetime.timedelta(days=rng.randint(0, 300))).isoformat(), "subtasks": []}
+        roots.append(phase)
+        for _ in range(min(99, count - task_id)):
+            task_id += 1
+            phase["subtasks"].append({
+                "id": task_id, "name": f"Task {task_id}", "duration_days": rng.randint(1, 10),
+                "start_date": (base + datetime.timedelta(days=rng.randint(0, 360))).isoformat(),
+            })
+    return roots
+
+
+def run(count, queries, limit):
+    generator = GanttChartData()
+    generator.tasks = build_wbs(count)
+    start = time.perf_counter()
+    index = generator.get_index()
+    built = time.perf_counter()
+    rng = random.Random(1)
+    windows = []
+    for _ in range(queries):
+        day = datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randint(0, 360))
+        windows.append((day, day + datetime.timedelta(days=7)))
+    rows = 0
+    for window_start, window_end in windows:
+        rows += len(index.query(start=window_start, end=window_end, limit=limit)['tasks'])
+    queried = time.perf_counter()
+    fresh = GanttChartData()
+    fresh.tasks = generator.tasks
+    full = fresh.build_gantt_data()
+    window_start, window_end = (day.isoformat() for day in windows[0])
+    [row for row in full if row['start_date'] <= window_end and row['end_date'] >= window_start][:limit]
+    scanned = time.perf_counter()
+    print(f"tasks={len(index)} index={built - start:.3f}s queries={queries} limit={limit} "
+          f"in {queried - built:.3f}s ({(queried - built) / queries * 1000:.2f}ms each, rows={rows}) "
+          f"full build+scan={scanned - queried:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gantt index benchmark")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    run(args.tasks, args.queries, args.limit)
@@ -0,0 +1,80 @@
+"""
+Benchmark for ImportanceUrgencyCalculator batch scoring.
+
+Generates a synthetic 3-level WBS, then times:
+  - calculate_all (per-task scoring) on the smaller sizes,
+  - flatten_wbs (one pass over the nested dicts into NumPy columns),
+  - score_batch on the pre-flattened columns (array expressions only).
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_importance_urgency_batch.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.importance_urgency_calculator_refactored import ImportanceUrgencyCalculator
+
+
+def build_wbs(size: int, seed: int = 42):
+    """Build a WBS of roughly `size` nodes: roots -> 5 groups -> 4 leaf tasks."""
+    rng = random.Random(seed)
+    now = datetime.datetime.now()
+    deadlines = [(now + datetime.timedelta(hours=h)).isoformat() for h in range(-24, 120)]
+    wbs = []
+    node_id = 0
+    while node_id < size:
+        root = {'id': f'R{node_id}', 'subtasks': []}
+        node_id += 1
+        for _ in range(5):
+            group = {'id': f'G{node_id}', 'subtasks': []}
+            node_id += 1
+            for _ in range(4):
+                group['subtasks'].append({
+                    'id': f'T{node_id}',
+                    'dependencies': list(range(rng.randint(0, 12))),
+                    'critical_path': rng.random() < 0.3,
+                    'cost_impact': rng.uniform(0, 200000),
+                    'priority': rng.choice([1, 5, 'high', 'low', 7.5, 'medium']),
+                    'deadline': rng.choice(deadlines),
+                    'risk_of_delay': rng.randint(0, 10),
+                    'stakeholder_pressure': rng.uniform(0, 10),
+                })
+                node_id += 1
+            root['subtasks'].append(group)
+        wbs.append(root)
+    return wbs, node_id
+
+
+def run(sizes, per_task_limit):
+    print(f"{'nodes':>10} {'per-task (s)':>14} {'flatten (s)':>12} {'score (s)':>10}")
+    for size in sizes:
+        wbs, nodes = build_wbs(size)
+        calculator = ImportanceUrgencyCalculator(wbs)
+        per_task = '-'
+        if nodes <= per_task_limit:
+            start = time.perf_counter()
+            calculator.calculate_all()
+            per_task = f"{time.perf_counter() - start:.3f}"
+        start = time.perf_counter()
+        flattened = calculator.flatten_wbs()
+        flatten_time = time.perf_counter() - start
+        start = time.perf_counter()
+        calculator.score_batch(flattened=flattened)
+        score_time = time.perf_counter() - start
+        print(f"{nodes:>10} {per_task:>14} {flatten_time:>12.3f} {score_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importance/urgency batch scoring benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--per-task-limit", type=int, default=200000,
+                        help="largest size for which the per-task calculate_all is also timed")
+    args = parser.parse_args()
+    run(args.sizes, args.per_task_limit)
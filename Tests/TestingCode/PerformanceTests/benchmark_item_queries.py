@@ -0,0 +1,63 @@
+"""
+Benchmark for paginated, filtered collection queries in the project stores.
+
+Stores --allocations allocations (default 100000) over 1000 resources in each
+store, then times --queries filtered first pages (default 500) against
+loading the whole collection and filtering it, as the list endpoints used to.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_item_queries.py [--allocations 100000] [--queries 500]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from backend.repositories.project_repository import ProjectRepository
+from backend.repositories.sqlite_repository import SQLiteProjectRepository
+
+RESOURCES = 1000
+
+
+def run(allocations_count, queries):
+    base_dir = tempfile.mkdtemp()
+    try:
+        allocations = [{"wbs_id": str(i // 4), "resource_id": f"r{i % RESOURCES}", "allocation_percentage": 25.0}
+                       for i in range(allocations_count)]
+        rng = random.Random(0)
+        wanted = [f"r{rng.randrange(RESOURCES)}" for _ in range(queries)]
+        stores = [("json", ProjectRepository(base_dir)),
+                  ("sqlite", SQLiteProjectRepository(os.path.join(base_dir, "projects.db")))]
+        for name, store in stores:
+            store.create_project("demo")
+            store.replace_items("demo", "allocations", allocations)
+
+            start = time.perf_counter()
+            for resource_id in wanted:
+                items, _ = store.get_items("demo", "allocations")
+                [item for item in items if item["resource_id"] == resource_id]
+            full = (time.perf_counter() - start) / queries
+
+            start = time.perf_counter()
+            for resource_id in wanted:
+                page, _ = store.query_items("demo", "allocations", filters={"resource_id": resource_id},
+                                            fields=["wbs_id"], limit=50)
+            paged = (time.perf_counter() - start) / queries
+            print(f"{name:6s} allocations={allocations_count} load+filter={full * 1000:.2f}ms "
+                  f"indexed page={paged * 1000:.3f}ms ({full / paged:.0f}x)")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project store query benchmark")
+    parser.add_argument("--allocations", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    run(args.allocations, args.queries)
@@ -0,0 +1,61 @@
+"""
+Benchmark for ResourceLeveler.resource_leveling().
+
+Builds --tasks tasks (default 50k) with up to --max-preds predecessors each,
+allocates each task to one or two of --resources roles (default 500) and
+levels them with the selected duration type.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_resource_leveling.py [--tasks 50000] [--resources 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+
+
+def build_inputs(count, resources, max_preds, seed=0):
+    rng = random.Random(seed)
+    tasks = []
+    allocations = []
+    for i in range(count):
+        window = range(max(0, i - 200), i)
+        tasks.append({
+            "id": i,
+            "optimistic_hours": rng.randint(1, 4),
+            "normal_hours": rng.randint(2, 8),
+            "pessimistic_hours": rng.randint(6, 16),
+            "dependencies": rng.sample(window, min(len(window), rng.randint(0, max_preds))),
+        })
+        for role in rng.sample(range(resources), rng.randint(1, 2)):
+            allocations.append({"task_id": i, "role": f"Role {role}"})
+    return tasks, allocations
+
+
+def run(count, resources, max_preds, duration_type):
+    tasks, allocations = build_inputs(count, resources, max_preds)
+    leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json', duration_type=duration_type)
+    leveler.flat_tasks = tasks
+    leveler.allocations = allocations
+    start = time.perf_counter()
+    schedules = leveler.resource_leveling()
+    elapsed = time.perf_counter() - start
+    finish = max(entry['end'] for entry in schedules.values())
+    print(f"tasks={count} resources={resources} allocations={len(allocations)} duration_type={duration_type} "
+          f"leveled in {elapsed:.3f}s makespan={finish}h")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resource leveling benchmark")
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--resources", type=int, default=500)
+    parser.add_argument("--max-preds", type=int, default=2)
+    parser.add_argument("--duration-type", default="normal", choices=["optimistic", "normal", "pessimistic"])
+    args = parser.parse_args()
+    run(args.tasks, args.resources, args.max_preds, args.duration_type)
@@ -0,0 +1,61 @@
+"""
+Benchmark for the Monte Carlo schedule simulation.
+
+Builds a flat WBS of --tasks tasks (default 2000) with three-point estimates
+and up to --max-preds dependencies each, then simulates --iterations
+schedules (default 10k) with --workers processes.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_schedule_simulation.py [--tasks 2000] [--iterations 10000] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.schedule_simulation import ScheduleSimulation
+
+
+def build_wbs(count, max_preds, seed=0):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        window = range(max(0, i - 50), i)
+        normal = rng.randint(2, 16)
+        tasks.append({
+            "id": i,
+            "optimistic_hours": normal * rng.uniform(0.5, 1.0),
+            "normal_hours": normal,
+            "pessimistic_hours": normal * rng.uniform(1.0, 3.0),
+            "dependencies": rng.sample(window, min(len(window), rng.randint(0, max_preds))),
+        })
+    return tasks
+
+
+def run(count, max_preds, iterations, workers, distribution):
+    wbs = build_wbs(count, max_preds)
+    start = time.perf_counter()
+    simulation = ScheduleSimulation(wbs, distribution=distribution, seed=0)
+    built = time.perf_counter()
+    result = simulation.run(iterations=iterations, workers=workers)
+    simulated = time.perf_counter()
+    percentiles = " ".join(f"{key}={value:.0f}h" for key, value in result.percentiles().items())
+    critical = sum(1 for share in result.criticality.values() if share >= 0.5)
+    print(f"tasks={count} iterations={iterations} workers={workers} distribution={distribution} "
+          f"build={built - start:.3f}s simulate={simulated - built:.3f}s {percentiles} "
+          f"critical(>=50%)={critical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Schedule simulation benchmark")
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--max-preds", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--distribution", default="pert", choices=["pert", "triangular"])
+    args = parser.parse_args()
+    run(args.tasks, args.max_preds, args.iterations, args.workers, args.distribution)
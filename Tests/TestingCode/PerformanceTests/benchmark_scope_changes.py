@@ -0,0 +1,68 @@
+"""
+Benchmark for ScopeManagement.apply_scope_changes.
+
+Builds a WBS of --nodes tasks (default 50k) and applies --changes scope
+changes (default 10k, an even mix of add, remove and modify). Lookups go
+through the shared WBSIndex, so the time depends on the number of changes
+and not on the size of the WBS.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_scope_changes.py [--nodes 50000] [--changes 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.scope_management import ScopeManagement
+
+
+def build_wbs(size, branching=8):
+    nodes = [{"id": 1, "name": "Root", "subtasks": []}]
+    for task_id in range(2, size + 1):
+        node = {"id": task_id, "name": f"Task {task_id}", "subtasks": []}
+        nodes[(task_id - 2) // branching]["subtasks"].append(node)
+        nodes.append(node)
+    return nodes[0]
+
+
+def build_changes(size, count, seed=0):
+    rng = random.Random(seed)
+    changes = []
+    next_id = size + 1
+    for i in range(count):
+        kind = ("add", "remove", "modify")[i % 3]
+        task_id = rng.randint(2, size)
+        if kind == "add":
+            changes.append({"change_type": "add", "details": {"parent_id": task_id, "task": {"id": next_id, "name": "New"}}})
+            next_id += 1
+        elif kind == "remove":
+            changes.append({"task_id": task_id, "change_type": "remove"})
+        else:
+            changes.append({"task_id": task_id, "change_type": "modify", "details": {"status": "changed"}})
+    return changes
+
+
+def run(nodes, changes):
+    manager = ScopeManagement()
+    manager.detailed_wbs = build_wbs(nodes)
+    manager.scope_changes = build_changes(nodes, changes)
+    start = time.perf_counter()
+    manager.wbs_index
+    indexed = time.perf_counter()
+    manager.apply_scope_changes()
+    done = time.perf_counter()
+    status = {key: len(value) for key, value in manager.scope_status.items()}
+    print(f"nodes={nodes} changes={changes} index={indexed - start:.3f}s apply={done - indexed:.3f}s {status}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ScopeManagement scope change benchmark")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--changes", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.nodes, args.changes)
@@ -0,0 +1,65 @@
+"""
+Benchmark for single-item edits in the JSON and SQLite project stores.
+
+Stores --levels WBS levels (default 100000) in one project of each store,
+then times --edits single-level PATCH-style updates (default 20) and one
+full read of the collection.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_sqlite_repository.py [--levels 100000] [--edits 20]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from backend.repositories.project_repository import ProjectRepository
+from backend.repositories.sqlite_repository import SQLiteProjectRepository
+
+
+def make_levels(count):
+    return [{"id": str(i), "name": f"Level {i}", "parent_id": str((i - 1) // 10) if i else None,
+             "duration_days": i % 20} for i in range(count)]
+
+
+def run(levels_count, edits):
+    base_dir = tempfile.mkdtemp()
+    try:
+        levels = make_levels(levels_count)
+        stores = [("json", ProjectRepository(base_dir)),
+                  ("sqlite", SQLiteProjectRepository(os.path.join(base_dir, "projects.db")))]
+        rng = random.Random(0)
+        targets = [str(rng.randrange(levels_count)) for _ in range(edits)]
+        for name, store in stores:
+            store.create_project("demo")
+            start = time.perf_counter()
+            store.replace_items("demo", "wbs_levels", levels)
+            save = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for n, level_id in enumerate(targets):
+                store.patch_item("demo", "wbs_levels", level_id, {"duration_days": n})
+            patch = (time.perf_counter() - start) / edits
+
+            start = time.perf_counter()
+            items, _ = store.get_items("demo", "wbs_levels")
+            read = time.perf_counter() - start
+            assert len(items) == levels_count
+            print(f"{name:6s} levels={levels_count} save={save:.3f}s patch={patch * 1000:.2f}ms/edit "
+                  f"full read={read:.3f}s")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project store single-item edit benchmark")
+    parser.add_argument("--levels", type=int, default=100000)
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+    run(args.levels, args.edits)
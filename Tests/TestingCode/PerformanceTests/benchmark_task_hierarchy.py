@@ -0,0 +1,47 @@
+"""
+Benchmark for TaskManagement.calculate_urgency_importance.
+
+Builds balanced WBS hierarchies from 1k to 100k tasks and times the
+leaf scoring + post-order propagation pass. With the parent -> children
+index the time per task should stay roughly constant as the size grows.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_task_hierarchy.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.task_management import Task, TaskManagement
+
+
+def build_hierarchy(size: int, branching: int = 8) -> TaskManagement:
+    """Build a balanced hierarchy of `size` tasks with the given branching factor."""
+    tm = TaskManagement()
+    tm.add_task(Task(id=1, title="Root"))
+    for task_id in range(2, size + 1):
+        parent_id = (task_id - 2) // branching + 1
+        tm.add_task(Task(id=task_id, title=f"Task {task_id}", parent_id=parent_id))
+    return tm
+
+
+def run(sizes):
+    print(f"{'tasks':>10} {'build (s)':>12} {'propagate (s)':>15} {'us/task':>10}")
+    for size in sizes:
+        start = time.perf_counter()
+        tm = build_hierarchy(size)
+        built = time.perf_counter()
+        tm.calculate_urgency_importance()
+        done = time.perf_counter()
+        elapsed = done - built
+        print(f"{size:>10} {built - start:>12.3f} {elapsed:>15.3f} {elapsed / size * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TaskManagement hierarchy propagation benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000, 50000, 100000])
+    run(parser.parse_args().sizes)
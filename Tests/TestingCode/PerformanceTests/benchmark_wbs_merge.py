@@ -0,0 +1,76 @@
+"""
+Benchmark for WBSMerger.merge_all_parts.
+
+Writes --parts part files into a temporary directory. Each holds one phase
+of its own with --tasks tasks and adds another --tasks tasks to a phase that
+all parts share, so the shared subtasks list keeps growing during the merge.
+Reports the merge time, then the peak traced memory of a second run.
+--workers sets how many parts are loaded concurrently.
+
+Usage:
+    python Tests/TestingCode/PerformanceTests/benchmark_wbs_merge.py [--parts 200] [--tasks 500] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from project_management.modules.main_modules.wbs_merger import WBSMerger
+
+
+def write_parts(parts_dir, parts, tasks):
+    for part in range(parts):
+        phase_id = f"{part + 2}"
+        subtasks = [{"id": f"{phase_id}.{i}", "name": f"Task {i}", "level": 2, "description": "x" * 80}
+                    for i in range(tasks)]
+        data = {
+            "id": 1, "name": "Project", "level": 0,
+            "subtasks": [
+                {"id": phase_id, "name": f"Phase {phase_id}", "level": 1, "subtasks": subtasks},
+                {"id": "shared", "name": "Shared", "level": 1,
+                 "subtasks": [{"id": f"shared.{part}.{i}", "level": 2} for i in range(tasks)]},
+            ],
+        }
+        with open(os.path.join(parts_dir, f"part_{part:05d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+def run(parts, tasks, workers):
+    work_dir = tempfile.mkdtemp()
+    try:
+        parts_dir = os.path.join(work_dir, 'wbs_parts')
+        os.makedirs(parts_dir)
+        write_parts(parts_dir, parts, tasks)
+        merger = WBSMerger(parts_dir=parts_dir, output_file=os.path.join(work_dir, 'detailed_wbs.json'),
+                           max_workers=workers)
+        start = time.perf_counter()
+        merged = merger.merge_all_parts()
+        elapsed = time.perf_counter() - start
+        del merged
+        tracemalloc.start()
+        merged = merger.merge_all_parts()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        output_size = os.path.getsize(merger.output_file)
+        slowest = max(merger.part_timings, key=lambda timing: timing["seconds"])
+        print(f"parts={parts} tasks/part={tasks} workers={workers} top-level={len(merged['subtasks'])} "
+              f"time={elapsed:.3f}s peak={peak / 2**20:.1f}MiB output={output_size / 2**20:.1f}MiB "
+              f"slowest part={slowest['file']} ({slowest['seconds']:.3f}s)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WBSMerger merge benchmark")
+    parser.add_argument("--parts", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.parts, args.tasks, args.workers)
@@ -239,5 +239,71 @@ class TestCommitProgressManager(unittest.TestCase):
         manager.generate_commit_progress()
         self.assertEqual(manager.commit_progress, {})
 
+class TestCommitProgressManagerIncremental(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from project_management.modules.main_modules.commit_task_log import CommitTaskLog
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'commit_task_database.json')
+        self.progress_path = os.path.join(self.test_dir, 'commit_progress.json')
+        self.log = CommitTaskLog(os.path.join(self.test_dir, 'commit_task_database.jsonl'))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _run(self):
+        from project_management.modules.main_modules.commit_progress_manager import CommitProgressManager
+        manager = CommitProgressManager(self.db_path, self.progress_path)
+        with patch("builtins.print"):
+            manager.run()
+        return manager
+
+    def test_reads_only_new_records(self):
+        self.log.append([
+            {"commit_hash": "c1", "task_id": "task1", "commit_date": "2023-01-01T12:00:00"},
+            {"commit_hash": "c2", "task_id": "task2", "commit_date": "2023-01-01T12:00:00"},
+        ])
+        self._run()
+        self.log.append([{"commit_hash": "c3", "task_id": "task1", "commit_date": "2023-01-05T12:00:00"}])
+        manager = self._run()
+        self.assertEqual(list(manager.commit_task_db), ["c3"])
+        self.assertEqual(manager.commit_progress["task1"]["commit_count"], 2)
+        self.assertEqual(manager.commit_progress["task1"]["last_commit_date"], "2023-01-05T12:00:00")
+        self.assertEqual(manager.commit_progress["task2"]["commit_count"], 1)
+        with open(self.progress_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), manager.commit_progress)
+
+    def test_superseded_record_is_not_counted_twice(self):
+        self.log.append([{"commit_hash": "c1", "task_id": "task1", "commit_date": "2023-01-01T12:00:00"}])
+        self._run()
+        self.log.append([{"commit_hash": "c1", "task_id": "task1", "commit_date": "2023-01-01T12:00:00"}])
+        manager = self._run()
+        self.assertEqual(manager.commit_progress["task1"]["commit_count"], 1)
+
+    def test_progress_survives_compaction(self):
+        self.log.append([{"commit_hash": "c1", "task_id": "task1", "commit_date": "2023-01-01T12:00:00"}] * 3)
+        manager = self._run()
+        self.log.compact()
+        self.log.append([{"commit_hash": "c2", "task_id": "task1", "commit_date": "2023-01-02T12:00:00"}])
+        manager = self._run()
+        # The compacted log is read again from the start and gives the same totals
+        self.assertEqual(manager.commit_progress["task1"]["commit_count"], 2)
+
+    def test_compaction_keeps_records_appended_after_read(self):
+        from project_management.modules.main_modules.commit_progress_manager import CommitProgressManager
+        self.log.append([{"commit_hash": "c1", "task_id": "task1", "commit_date": "2023-01-01T12:00:00"}] * 3)
+        manager = CommitProgressManager(self.db_path, self.progress_path)
+        manager.load_commit_task_db()
+        manager.generate_commit_progress()
+        manager.save_commit_progress()
+        # An AutoCommit append lands after this run read the log
+        self.log.append([{"commit_hash": "c2", "task_id": "task1", "commit_date": "2023-01-02T12:00:00"}])
+        with patch.object(manager.commit_task_log, "needs_compaction", return_value=True):
+            self.assertTrue(manager.compact_commit_task_log())
+        self.assertEqual(set(self.log.load_all()), {"c1", "c2"})
+        manager = self._run()
+        self.assertEqual(manager.commit_progress["task1"]["commit_count"], 2)
+
 if __name__ == "__main__":
     unittest.main()
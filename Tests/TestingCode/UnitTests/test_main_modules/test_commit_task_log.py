@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from project_management.modules.main_modules.commit_task_log import CommitTaskLog, log_path_for
+
+class TestCommitTaskLog(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.log = CommitTaskLog(os.path.join(self.test_dir, 'commit_task_database.jsonl'))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_log_path_for_legacy_database(self):
+        self.assertEqual(log_path_for('out/commit_task_database.json'), 'out/commit_task_database.jsonl')
+
+    def test_append_only_adds_lines(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1'}])
+        size = self.log.size()
+        self.log.append([{'commit_hash': 'b', 'task_id': '2'}])
+        with open(self.log.log_path, 'rb') as f:
+            f.seek(size)
+            self.assertEqual(json.loads(f.read()), {'commit_hash': 'b', 'task_id': '2'})
+
+    def test_read_since_returns_new_records_only(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1'}])
+        records, offset = self.log.read_since(0)
+        self.assertEqual(len(records), 1)
+        self.log.append([{'commit_hash': 'b', 'task_id': '1'}])
+        records, _ = self.log.read_since(offset)
+        self.assertEqual([record['commit_hash'] for _, record in records], ['b'])
+
+    def test_read_since_skips_partial_line(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1'}])
+        with open(self.log.log_path, 'a', encoding='utf-8') as f:
+            f.write('{"commit_hash": "b"')
+        records, offset = self.log.read_since(0)
+        self.assertEqual(len(records), 1)
+        self.assertLess(offset, self.log.size())
+
+    def test_task_index_persists_and_catches_up(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1'}, {'commit_hash': 'b', 'task_id': '2'}])
+        self.log.ensure_index()
+        self.log.save_index()
+        self.log.append([{'commit_hash': 'c', 'task_id': '1'}])
+        reopened = CommitTaskLog(self.log.log_path)
+        self.assertEqual([r['commit_hash'] for r in reopened.records_for_task('1')], ['a', 'c'])
+        self.assertEqual(reopened.generation, self.log.generation)
+
+    def test_later_record_supersedes_earlier(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1'}, {'commit_hash': 'a', 'task_id': '2'}])
+        self.assertEqual(self.log.load_all(), {'a': {'task_id': '2'}})
+
+    def test_compact_drops_superseded_records(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1', 'n': n} for n in range(5)])
+        self.log.ensure_index()
+        generation = self.log.generation
+        self.assertTrue(self.log.needs_compaction(min_records=1))
+        self.log.compact()
+        self.assertEqual(self.log.load_all(), {'a': {'task_id': '1', 'n': 4}})
+        self.assertEqual(self.log.record_count, 1)
+        self.assertNotEqual(self.log.generation, generation)
+
+    def test_compact_keeps_unconsumed_records(self):
+        self.log.append([{'commit_hash': 'a', 'task_id': '1', 'n': n} for n in range(3)])
+        _, consumed = self.log.read_since(0)
+        self.log.append([{'commit_hash': 'a', 'task_id': '1', 'n': 3}, {'commit_hash': 'b', 'task_id': '2'}])
+        offset = self.log.compact(keep_from=consumed)
+        records, _ = self.log.read_since(offset)
+        self.assertEqual([record['commit_hash'] for _, record in records], ['a', 'b'])
+        self.assertEqual(self.log.load_all(), {'a': {'task_id': '1', 'n': 3}, 'b': {'task_id': '2'}})
+        self.assertEqual(self.log.record_count, 3)
+
+    def test_import_json_database(self):
+        db_path = os.path.join(self.test_dir, 'commit_task_database.json')
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'a': {'task_id': '1'}}, f)
+        self.assertEqual(self.log.import_json_database(db_path), 1)
+        self.assertEqual(self.log.load_all(), {'a': {'task_id': '1'}})
+        # Only imported once
+        self.assertEqual(self.log.import_json_database(db_path), 0)
+
+if __name__ == "__main__":
+    unittest.main()
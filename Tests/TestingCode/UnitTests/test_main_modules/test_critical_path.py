@@ -0,0 +1,163 @@
+"""
+Unit tests for the critical path (CPM) engine
+"""
+
+import os
+import json
+import random
+import tempfile
+import unittest
+
+from project_management.modules.main_modules.critical_path import (
+    CriticalPathEngine, build_engine_from_wbs, critical_task_ids,
+)
+from project_management.modules.main_modules.importance_urgency_calculator_refactored import ImportanceUrgencyCalculator
+from project_management.modules.main_modules.time_management import TimeManagement
+
+
+class TestCriticalPathEngine(unittest.TestCase):
+    def setUp(self):
+        # a -> b -> d and a -> c -> d, with c shorter than b
+        self.engine = CriticalPathEngine([
+            ('a', 2, []),
+            ('b', 4, ['a']),
+            ('c', 1, ['a']),
+            ('d', 3, ['b', 'c']),
+        ]).compute()
+
+    def test_forward_and_backward_pass(self):
+        self.assertEqual(self.engine.project_finish, 9)
+        c = self.engine.schedule('c')
+        self.assertEqual((c['early_start'], c['early_finish'], c['late_start'], c['late_finish']), (2, 3, 5, 6))
+        self.assertEqual(c['total_slack'], 3)
+        self.assertFalse(c['critical'])
+        self.assertEqual(self.engine.free_slack('c'), 3)
+
+    def test_critical_path(self):
+        self.assertEqual(self.engine.critical_activities(), ['a', 'b', 'd'])
+        self.assertEqual(self.engine.critical_path(), ['a', 'b', 'd'])
+
+    def test_set_duration_moves_critical_path(self):
+        self.engine.set_duration('c', 6)
+        self.assertEqual(self.engine.project_finish, 11)
+        self.assertEqual(self.engine.critical_path(), ['a', 'c', 'd'])
+        self.assertEqual(self.engine.total_slack('b'), 2)
+
+    def test_dependency_changes(self):
+        self.engine.add_dependency('c', 'b')
+        self.assertEqual(self.engine.schedule('b')['early_start'], 3)
+        self.assertEqual(self.engine.critical_path(), ['a', 'c', 'b', 'd'])
+        self.assertTrue(self.engine.remove_dependency('c', 'b'))
+        self.assertFalse(self.engine.remove_dependency('c', 'b'))
+        self.assertEqual(self.engine.project_finish, 9)
+
+    def test_cycles_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.engine.add_dependency('d', 'a')
+        with self.assertRaises(ValueError):
+            CriticalPathEngine([('x', 1, ['y']), ('y', 1, ['x'])]).compute()
+
+    def test_break_cycles(self):
+        engine = CriticalPathEngine([('x', 1, ['z']), ('y', 2, ['x']), ('z', 3, ['y']), ('w', 1, ['z'])])
+        self.assertEqual([sorted(cycle) for cycle in engine.find_cycles()], [['x', 'y', 'z']])
+        with self.assertLogs('project_management.modules.main_modules.critical_path', level='WARNING'):
+            self.assertEqual(len(engine.break_cycles()), 1)
+        self.assertEqual(engine.find_cycles(), [])
+        self.assertEqual(engine.compute().project_finish, 7)
+        self.assertEqual(self.engine.break_cycles(), [])
+
+    def test_invalid_durations(self):
+        with self.assertRaises(ValueError):
+            CriticalPathEngine([('x', -1, [])])
+        with self.assertRaises(ValueError):
+            self.engine.set_duration('a', 'long')
+
+    def test_incremental_updates_match_full_compute(self):
+        rng = random.Random(7)
+        n = 60
+        activities = [(i, rng.randint(0, 5), rng.sample(range(i), min(i, rng.randint(0, 3)))) for i in range(n)]
+        engine = CriticalPathEngine(activities).compute()
+        for _ in range(200):
+            a, b = rng.randrange(n), rng.randrange(n)
+            action = rng.random()
+            if action < 0.4:
+                engine.set_duration(a, rng.randint(0, 8))
+            elif action < 0.7:
+                try:
+                    engine.add_dependency(a, b)
+                except ValueError:
+                    pass
+            else:
+                engine.remove_dependency(a, b)
+        reference = CriticalPathEngine(
+            (engine.ids[i], engine.durations[i], [engine.ids[p] for p in engine.predecessors[i]]) for i in range(n)
+        ).compute()
+        for activity_id in range(n):
+            self.assertEqual(engine.schedule(activity_id), reference.schedule(activity_id))
+
+
+class TestWBSCriticalPath(unittest.TestCase):
+    def setUp(self):
+        self.wbs = {
+            "id": 1, "name": "Project", "subtasks": [
+                {"id": 2, "name": "Design", "subtasks": [
+                    {"id": 3, "name": "Spec", "duration_days": 3},
+                    {"id": 4, "name": "Review", "duration_days": 1, "dependencies": [3]},
+                ]},
+                {"id": 5, "name": "Build", "dependencies": [2], "subtasks": [
+                    {"id": 6, "name": "Code", "duration_days": 5},
+                    {"id": 7, "name": "Docs", "duration_days": 2},
+                ]},
+            ]
+        }
+
+    def test_summary_dependencies(self):
+        engine, summary_leaves = build_engine_from_wbs(self.wbs)
+        self.assertEqual(sorted(summary_leaves[2]), [3, 4])
+        # Build depends on Design, so every Build leaf waits for Review
+        self.assertEqual(engine.schedule(6)['early_start'], 4)
+        self.assertEqual(engine.schedule(7)['early_start'], 4)
+        self.assertEqual(engine.critical_path(), [3, 4, 6])
+        self.assertEqual(critical_task_ids(engine, summary_leaves), {1, 2, 3, 4, 5, 6})
+
+    def test_unknown_dependency_is_ignored(self):
+        self.wbs["subtasks"][0]["subtasks"][0]["dependencies"] = [99]
+        engine, _ = build_engine_from_wbs(self.wbs)
+        self.assertEqual(engine.project_finish, 9)
+
+    def test_time_management_flags(self):
+        manager = TimeManagement()
+        manager.detailed_wbs = self.wbs
+        manager.schedule_tasks()
+        manager.compute_critical_path()
+        self.assertTrue(manager.task_schedules[6]['critical_path'])
+        self.assertFalse(manager.task_schedules[7]['critical_path'])
+        self.assertEqual(manager.task_schedules[7]['total_slack'], 3)
+        self.assertEqual(manager.critical_path, [3, 4, 6])
+
+    def test_time_management_saves_schedule_despite_cycle(self):
+        # Spec depends on Review, which depends on Spec
+        self.wbs["subtasks"][0]["subtasks"][0]["dependencies"] = [4]
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ('wbs.json', 'allocations.json', 'schedule.json')]
+            with open(paths[0], 'w') as f:
+                json.dump(self.wbs, f)
+            manager = TimeManagement(*paths)
+            with self.assertLogs('project_management.modules.main_modules.time_management', level='ERROR') as logs:
+                manager.run()
+            self.assertRegex(''.join(logs.output), r'\[(3, 4|4, 3)\]')
+            with open(paths[2]) as f:
+                schedules = json.load(f)
+        self.assertEqual(len(schedules), 7)
+        self.assertNotIn('critical_path', schedules['6'])
+        self.assertIsNone(manager.cpm_engine)
+
+    def test_flags_feed_importance(self):
+        engine, summary_leaves = build_engine_from_wbs(self.wbs)
+        calculator = ImportanceUrgencyCalculator([self.wbs], critical_task_ids(engine, summary_leaves))
+        scores = calculator.calculate_all()
+        self.assertEqual(scores[6]['importance'] - scores[7]['importance'], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
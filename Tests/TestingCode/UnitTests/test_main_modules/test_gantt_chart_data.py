@@ -1,3 +1,5 @@
+import datetime
+import random
 import unittest
 from project_management.modules.main_modules import gantt_chart_data
 
@@ -310,5 +312,211 @@ class TestGanttChartData(unittest.TestCase):
         chart = gantt_chart_data.generate_gantt_chart(tasks)
         self.assertIsInstance(chart, dict)
 
+class TestGanttIndex(unittest.TestCase):
+    def setUp(self):
+        self.generator = gantt_chart_data.GanttChartData()
+        self.generator.tasks = [
+            {"id": 1, "name": "Design", "start_date": "2025-01-01", "duration_days": 10, "subtasks": [
+                {"id": 2, "name": "Spec", "duration_days": 3, "subtasks": [
+                    {"id": 3, "name": "Draft", "duration_days": 2},
+                ]},
+                {"id": 4, "name": "Review", "start_date": "2025-01-06", "duration_days": 2},
+            ]},
+            {"id": 5, "name": "Build", "start_date": "2025-02-01", "duration_days": 20, "subtasks": [
+                {"id": 6, "name": "Code", "duration_days": 15},
+            ]},
+        ]
+
+    def ids(self, page):
+        return [row['id'] for row in page['tasks']]
+
+    def test_rows_match_build_gantt_data(self):
+        index = self.generator.get_index()
+        rows = self.generator.build_gantt_data()
+        self.assertEqual(len(index), 6)
+        page = index.query(limit=10)
+        self.assertEqual([{k: v for k, v in row.items() if k not in ('depth', 'parent_id')} for row in page['tasks']], rows)
+        self.assertEqual([(row['parent_id'], row['depth']) for row in page['tasks']],
+                         [(None, 0), (1, 1), (2, 2), (1, 1), (None, 0), (5, 1)])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_date_window(self):
+        self.assertEqual(self.ids(self.generator.query(start="2025-01-05", end="2025-01-06")), [1, 4])
+        self.assertEqual(self.ids(self.generator.query(start=datetime.date(2025, 2, 10))), [5, 6])
+
+    def test_subtree_and_depth_limit(self):
+        self.assertEqual(self.ids(self.generator.query(root_id=1)), [1, 2, 3, 4])
+        self.assertEqual(self.ids(self.generator.query(root_id="2")), [2, 3])
+        self.assertEqual(self.ids(self.generator.query(max_depth=0)), [1, 5])
+        self.assertEqual(self.ids(self.generator.query(root_id=1, max_depth=1)), [1, 2, 4])
+        with self.assertRaises(KeyError):
+            self.generator.query(root_id=99)
+
+    def test_cursor_pagination(self):
+        first = self.generator.query(limit=4)
+        self.assertEqual(self.ids(first), [1, 2, 3, 4])
+        second = self.generator.query(limit=4, cursor=first['next_cursor'])
+        self.assertEqual(self.ids(second), [5, 6])
+        self.assertIsNone(second['next_cursor'])
+        with self.assertRaises(ValueError):
+            self.generator.query(cursor="abc")
+        with self.assertRaises(ValueError):
+            self.generator.query(limit=0)
+
+    def test_matches_a_full_scan(self):
+        rng = random.Random(3)
+        base = datetime.date(2025, 1, 1)
+
+        def make(depth):
+            return [{"id": f"{depth}-{rng.random()}",
+                     "start_date": (base + datetime.timedelta(days=rng.randint(0, 300))).isoformat(),
+                     "duration_days": rng.randint(1, 30),
+                     "subtasks": make(depth + 1) if depth < 3 and rng.random() < 0.5 else []}
+                    for _ in range(rng.randint(1, 4))]
+
+        self.generator.tasks = make(0)
+        rows = [row for row, _, _ in self.generator.iter_rows()]
+        depths = [depth for _, depth, _ in self.generator.iter_rows()]
+        for _ in range(20):
+            start = base + datetime.timedelta(days=rng.randint(0, 300))
+            end = start + datetime.timedelta(days=rng.randint(0, 60))
+            max_depth = rng.randint(0, 3)
+            expected = [row['id'] for row, depth in zip(rows, depths)
+                        if row['start_date'] <= end.isoformat() and row['end_date'] >= start.isoformat()
+                        and depth <= max_depth]
+            collected, cursor = [], None
+            while True:
+                page = self.generator.query(start=start, end=end, max_depth=max_depth, cursor=cursor, limit=3)
+                collected.extend(self.ids(page))
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            self.assertEqual(collected, expected)
+
+
+class TestGanttDependencies(unittest.TestCase):
+    def setUp(self):
+        self.generator = gantt_chart_data.GanttChartData()
+        self.generator.tasks = [
+            {"id": 1, "name": "Design", "start_date": "2025-01-01", "duration_days": 5},
+            {"id": 2, "name": "Build", "start_date": "2025-01-01", "duration_days": 10, "dependencies": [1],
+             "subtasks": [
+                 {"id": 3, "name": "Code", "duration_days": 4},
+                 {"id": 4, "name": "Test", "duration_days": 2, "dependencies": [{"id": 3, "lag": 1}]},
+             ]},
+            {"id": 5, "name": "Release", "start_date": "2025-01-02", "duration_days": 1, "dependencies": [4]},
+        ]
+
+    def dates(self):
+        return {row['id']: (row['start_date'], row['end_date']) for row in self.generator.build_gantt_data()}
+
+    def test_finish_to_start_with_lag(self):
+        dates = self.dates()
+        self.assertEqual(dates[1], ("2025-01-01", "2025-01-06"))
+        # Build waits for Design and its subtasks start with it
+        self.assertEqual(dates[2], ("2025-01-06", "2025-01-16"))
+        self.assertEqual(dates[3], ("2025-01-06", "2025-01-10"))
+        self.assertEqual(dates[4], ("2025-01-11", "2025-01-13"))
+        self.assertEqual(dates[5], ("2025-01-13", "2025-01-14"))
+        self.assertEqual(self.generator.dependency_cycles, [])
+
+    def test_cycles_are_reported(self):
+        self.generator.tasks[0]["dependencies"] = [5]
+        dates = self.dates()
+        self.assertEqual(self.generator.dependency_cycles, [[1, 2, 3, 4, 5]])
+        self.assertEqual(len(dates), 5)
+
+    def test_update_task_shifts_only_dependents(self):
+        self.generator.build_gantt_data()
+        index = self.generator.get_index()
+        changed = self.generator.update_task(3, duration_days=6)
+        self.assertEqual(changed, [3, 4, 5])
+        dates = {row['id']: (row['start_date'], row['end_date']) for row in self.generator.rows()}
+        self.assertEqual(dates[4], ("2025-01-13", "2025-01-15"))
+        self.assertEqual(dates[2], ("2025-01-06", "2025-01-16"))
+        self.assertEqual(self.generator.query(start="2025-01-15", end="2025-01-15")['tasks'][-1]['id'], 5)
+        self.assertIs(self.generator.get_index(), index)
+        self.assertEqual(self.generator.update_task(5, start_date="2025-01-01"), [])
+        self.assertEqual(self.generator.update_task(1, start_date="2025-01-03"), [1, 2, 3, 4, 5])
+        with self.assertRaises(KeyError):
+            self.generator.update_task(99, duration_days=1)
+
+    def test_update_matches_full_recompute(self):
+        rng = random.Random(5)
+        tasks = [{"id": i, "start_date": "2025-01-01", "duration_days": rng.randint(1, 5),
+                  "dependencies": [{"id": d, "lag": rng.randint(-1, 2)} for d in rng.sample(range(i), min(i, 2))]}
+                 for i in range(40)]
+        self.generator.tasks = tasks
+        self.generator.build_gantt_data()
+        for _ in range(30):
+            task_id = rng.randrange(40)
+            duration = rng.randint(1, 8)
+            self.generator.update_task(task_id, duration_days=duration)
+            tasks[task_id]["duration_days"] = duration
+        reference = gantt_chart_data.GanttChartData()
+        reference.tasks = tasks
+        self.assertEqual(self.generator.build_gantt_data(), reference.build_gantt_data())
+
+    def test_dependency_on_summary_waits_for_subtasks(self):
+        self.generator.tasks = [
+            {"id": "P", "start_date": "2025-01-01", "duration_days": 1, "subtasks": [
+                {"id": "P1", "duration_days": 10},
+                {"id": "P2", "start_date": "2025-01-11", "duration_days": 20,
+                 "dependencies": ["P"]},
+            ]},
+            {"id": "Q", "start_date": "2025-01-01", "duration_days": 2, "dependencies": ["P"]},
+        ]
+        dates = self.dates()
+        # P2 is inside P, so it only waits for P's own day
+        self.assertEqual(dates["P2"], ("2025-01-11", "2025-01-31"))
+        self.assertEqual(dates["P"], ("2025-01-01", "2025-01-31"))
+        self.assertEqual(dates["Q"], ("2025-01-31", "2025-02-02"))
+        self.assertEqual(self.generator.update_task("P1", duration_days=40), ["P1", "P", "Q"])
+        self.assertEqual(self.dates()["Q"], ("2025-02-10", "2025-02-12"))
+
+    def test_zero_and_invalid_durations(self):
+        self.generator.build_gantt_data()
+        self.generator.update_task(1, duration_days=0)
+        self.generator.tasks[0]["duration_days"] = 0
+        reference = gantt_chart_data.GanttChartData()
+        reference.tasks = self.generator.tasks
+        self.assertEqual(self.generator.build_gantt_data(), reference.build_gantt_data())
+        self.assertEqual(self.dates()[1], ("2025-01-01", "2025-01-01"))
+        for duration in (-1, "3", True):
+            with self.assertRaises(ValueError):
+                self.generator.update_task(1, duration_days=duration)
+
+    def test_nested_update_matches_full_recompute(self):
+        rng = random.Random(7)
+        ids = iter(range(1000))
+
+        def make(depth):
+            return [{"id": next(ids), "duration_days": rng.randint(0, 5),
+                     "subtasks": make(depth + 1) if depth < 2 and rng.random() < 0.4 else []}
+                    for _ in range(rng.randint(1, 4))]
+
+        tasks = make(0)
+        flat, stack = [], list(tasks)
+        while stack:
+            task = stack.pop()
+            flat.append(task)
+            stack.extend(task["subtasks"])
+        for task in flat:
+            earlier = [other["id"] for other in flat if other["id"] < task["id"]]
+            task["dependencies"] = rng.sample(earlier, min(len(earlier), 2))
+        self.generator.tasks = tasks
+        index = self.generator.get_index()
+        for _ in range(30):
+            task = rng.choice(flat)
+            task["duration_days"] = rng.randint(0, 8)
+            self.generator.update_task(task["id"], duration_days=task["duration_days"])
+        reference = gantt_chart_data.GanttChartData()
+        reference.tasks = tasks
+        self.assertEqual(self.generator.build_gantt_data(), reference.build_gantt_data())
+        self.assertEqual(self.generator.dependency_cycles, reference.dependency_cycles)
+        self.assertEqual([(row['start_date'], row['end_date']) for row in index.rows],
+                         [(row['start_date'], row['end_date']) for row in reference.build_gantt_data()])
+
+
 if __name__ == "__main__":
     unittest.main()
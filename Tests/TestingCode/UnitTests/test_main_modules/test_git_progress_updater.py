@@ -1,4 +1,8 @@
 import unittest
+import os
+import shutil
+import subprocess
+import tempfile
 from project_management.modules.main_modules import git_progress_updater
 
 class TestGitProgressUpdater(unittest.TestCase):
@@ -307,5 +311,68 @@ class TestGitProgressUpdater(unittest.TestCase):
         self.assertTrue(result1)
         self.assertTrue(result2)
 
+class TestGitProgressUpdaterIncremental(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir = tempfile.mkdtemp()
+        self._git("init", "-q")
+        self._git("config", "user.email", "test@example.com")
+        self._git("config", "user.name", "Test")
+        self.updater = git_progress_updater.GitProgressUpdater(repo_path=self.repo_dir)
+        self.updater.cursor_file_path = os.path.join(self.repo_dir, "cursor", "git_progress_cursor.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+
+    def _git(self, *args):
+        return subprocess.run(["git"] + list(args), cwd=self.repo_dir, check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def _commit(self, filename, message):
+        with open(os.path.join(self.repo_dir, filename), "w") as f:
+            f.write(message)
+        self._git("add", filename)
+        self._git("commit", "-q", "-m", message)
+        return self._git("rev-parse", "HEAD")
+
+    def test_parse_git_log_lines(self):
+        self._commit("a.txt", "Task 1.1 started")
+        commits = list(self.updater.iter_git_log())
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(commits[0]["message"], "Task 1.1 started")
+        self.assertEqual(commits[0]["files"], ["a.txt"])
+
+    def test_iter_git_log_reports_git_errors(self):
+        self._commit("a.txt", "Task 1.1 started")
+        with self.assertRaises(subprocess.CalledProcessError) as raised:
+            list(self.updater.iter_git_log("no-such-branch"))
+        self.assertIn("no-such-branch", raised.exception.stderr)
+
+    def test_update_progress_reads_only_new_commits(self):
+        self._commit("a.txt", "Work on 1.1")
+        self._commit("b.txt", "Work on 1.1 and 2")
+        # Combined progress averages commit progress with (empty) workflow progress
+        progress = self.updater.update_progress()
+        self.assertEqual(progress["1.1"], 50.0)
+        self.assertEqual(progress["2"], 25.0)
+
+        head = self._commit("c.txt", "Finish 2")
+        original_iter = self.updater.iter_git_log
+        ranges = []
+
+        def tracking_iter(revision_range="HEAD"):
+            ranges.append(revision_range)
+            return original_iter(revision_range)
+
+        self.updater.iter_git_log = tracking_iter
+        progress = self.updater.update_progress()
+        self.assertEqual(len(ranges), 1)
+        self.assertTrue(ranges[0].endswith(".." + head))
+        self.assertEqual(progress["1.1"], 50.0)
+        self.assertEqual(progress["2"], 50.0)
+
+        # Nothing new: no git log call at all
+        self.updater.update_progress()
+        self.assertEqual(len(ranges), 1)
+
 if __name__ == "__main__":
     unittest.main()
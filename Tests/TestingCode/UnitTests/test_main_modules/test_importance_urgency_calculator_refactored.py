@@ -1,5 +1,6 @@
 import unittest
-from project_management.modules.main_modules.importance_urgency_calculator_refactored import ImportanceUrgencyCalculator
+import datetime
+from project_management.modules.main_modules.importance_urgency_calculator_refactored import ImportanceUrgencyCalculator, np
 
 class TestImportanceUrgencyCalculatorRefactored(unittest.TestCase):
     def setUp(self):
@@ -206,5 +207,47 @@ class TestImportanceUrgencyCalculatorRefactored(unittest.TestCase):
         urgency = self.calculator.calculate_urgency(task)
         self.assertIsInstance(urgency, (int, float))
 
+
+@unittest.skipIf(np is None, "numpy is required for batch scoring")
+class TestImportanceUrgencyCalculatorBatch(unittest.TestCase):
+    def setUp(self):
+        deadline = (datetime.datetime.now() + datetime.timedelta(days=1)).isoformat()
+        self.wbs = [{
+            "id": "1",
+            "subtasks": [
+                {"id": "1.1", "priority": "high", "critical_path": True, "dependencies": [1, 2],
+                 "cost_impact": 50000, "deadline": deadline, "risk_of_delay": 4},
+                {"id": "1.2", "subtasks": [
+                    {"id": "1.2.1", "priority": 3, "stakeholder_pressure": 7.5},
+                    {"id": "1.2.2", "priority": "low", "deadline": "not a date"},
+                ]},
+            ],
+        }]
+
+    def test_batch_matches_per_task_scores(self):
+        expected = ImportanceUrgencyCalculator(self.wbs).calculate_all()
+        actual = ImportanceUrgencyCalculator(self.wbs).calculate_all_batch()
+        self.assertEqual(expected.keys(), actual.keys())
+        for task_id, scores in expected.items():
+            self.assertAlmostEqual(actual[task_id]["importance"], scores["importance"], places=2)
+            # Deadline-based urgency depends on now(), allow for the time between the two runs
+            self.assertAlmostEqual(actual[task_id]["urgency"], scores["urgency"], places=1)
+
+    def test_batch_reports_errors_per_row(self):
+        self.wbs[0]["subtasks"][1]["subtasks"].append({"id": "1.2.3", "priority": True, "cost_impact": "high"})
+        result = ImportanceUrgencyCalculator(self.wbs).score_batch()
+        fields = sorted(error["field"] for error in result.errors)
+        self.assertEqual(fields, ["cost_impact", "priority"])
+        self.assertTrue(all(error["id"] == "1.2.3" for error in result.errors))
+        scores = result.to_dict()
+        self.assertNotIn("1.2.3", scores)
+        # The invalid row is left out of its parent's average
+        self.assertAlmostEqual(scores["1.2"]["importance"],
+                               (scores["1.2.1"]["importance"] + scores["1.2.2"]["importance"]) / 2)
+
+    def test_batch_parent_averages_subtasks(self):
+        scores = ImportanceUrgencyCalculator(self.wbs).calculate_all_batch()
+        self.assertAlmostEqual(scores["1"]["urgency"], (scores["1.1"]["urgency"] + scores["1.2"]["urgency"]) / 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared JSON document cache
+"""
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from project_management.modules.main_modules.json_cache import JSONDocumentCache, FrozenDict, FrozenList, freeze
+
+
+class TestJSONDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = JSONDocumentCache(max_bytes=1 << 20, max_entries=8)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    def test_second_load_is_served_from_cache(self):
+        path = self.write('wbs.json', {"id": 1, "subtasks": [{"id": 2}]})
+        first = self.cache.load(path)
+        with patch('project_management.modules.main_modules.json_cache._read_json') as read:
+            second = self.cache.load(path)
+        read.assert_not_called()
+        self.assertIs(first, second)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_changed_file_is_reloaded(self):
+        path = self.write('wbs.json', {"id": 1})
+        self.cache.load(path)
+        self.write('wbs.json', {"id": 1, "name": "Project"})
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.cache.load(path), {"id": 1, "name": "Project"})
+
+    def test_views_are_read_only(self):
+        path = self.write('wbs.json', {"id": 1, "subtasks": [{"id": 2}]})
+        view = self.cache.load(path)
+        self.assertIsInstance(view, dict)
+        self.assertIsInstance(view['subtasks'], list)
+        with self.assertRaises(TypeError):
+            view['id'] = 3
+        with self.assertRaises(TypeError):
+            view['subtasks'].append({"id": 4})
+        with self.assertRaises(TypeError):
+            view['subtasks'][0].update(name="x")
+        self.assertEqual(json.loads(json.dumps(view)), {"id": 1, "subtasks": [{"id": 2}]})
+
+    def test_copy_is_private_and_mutable(self):
+        path = self.write('wbs.json', {"id": 1, "subtasks": [{"id": 2}]})
+        for _ in range(2):
+            data = self.cache.load(path, copy=True)
+            self.assertNotIsInstance(data, FrozenDict)
+            data['subtasks'].append({"id": 3})
+        self.assertEqual(self.cache.load(path), {"id": 1, "subtasks": [{"id": 2}]})
+
+    def test_copies_of_frozen_values_are_mutable(self):
+        view = freeze({"a": [1, {"b": 2}]})
+        for duplicate in (view.copy(), copy.deepcopy(view)):
+            self.assertIs(type(duplicate), dict)
+            self.assertIs(type(duplicate['a']), list)
+            duplicate['a'].append(3)
+        self.assertIsInstance(view['a'], FrozenList)
+
+    def test_freezing_a_view_returns_it(self):
+        view = freeze({"a": [1]})
+        self.assertIs(freeze(view), view)
+        self.assertIs(freeze(view['a']), view['a'])
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = JSONDocumentCache(max_bytes=1 << 20, max_entries=2)
+        paths = [self.write(f'{i}.json', {"i": i}) for i in range(3)]
+        cache.load(paths[0])
+        cache.load(paths[1])
+        cache.load(paths[0])
+        cache.load(paths[2])
+        self.assertEqual(len(cache), 2)
+        cache.load(paths[0])
+        self.assertEqual(cache.hits, 2)
+
+        small = JSONDocumentCache(max_bytes=40)
+        big = self.write('big.json', {"text": "x" * 100})
+        self.assertEqual(small.load(big)['text'], "x" * 100)
+        self.assertEqual((len(small), small.current_bytes), (0, 0))
+
+    def test_invalidate(self):
+        path = self.write('wbs.json', {"id": 1})
+        self.cache.load(path)
+        self.cache.invalidate(path)
+        self.assertEqual((len(self.cache), self.cache.current_bytes), (0, 0))
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.load(os.path.join(self.temp_dir, 'missing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -258,3 +258,54 @@ class TestProgressCalculator:
         
         result = self.calculator.calculate_individual_productivity(individual_data)
         assert result >= 0
+
+
+class TestProgressCalculatorIndexes:
+    """Test cases for the indexed and incremental progress calculation."""
+
+    def setup_method(self):
+        """Set up a calculator with in-memory inputs."""
+        self.calculator = ProgressCalculator()
+        self.calculator.tasks = [
+            {"id": "T1", "status": "completed"},
+            {"id": "T2", "status": "in_progress"},
+        ]
+        self.calculator.workflow_steps = [
+            {"task_id": "T1", "step_id": "coding", "completed": True},
+            {"task_id": "T2", "step_id": "coding", "completed": True},
+            {"task_id": "T2", "step_id": "testing", "completed": False},
+        ]
+        self.calculator.commit_progress = {"T2": 0.4}
+        self.calculator.build_indexes()
+
+    def test_indexed_workflow_progress(self):
+        """Workflow progress comes from the per-task step counts."""
+        assert self.calculator.calculate_workflow_progress("T2") == 0.5
+        assert self.calculator.calculate_workflow_progress("missing") == 0.0
+
+    def test_update_workflow_step_refreshes_only_task(self):
+        """Completing one step updates the counts and that task's combined progress."""
+        self.calculator.enrich_tasks_with_progress()
+        t1_progress = self.calculator.combined_progress["T1"]
+        progress = self.calculator.update_workflow_step({"task_id": "T2", "step_id": "testing", "completed": True})
+        assert self.calculator.calculate_workflow_progress("T2") == 1.0
+        assert progress == 0.5  # capped for tasks that are not completed
+        assert self.calculator.tasks[1]["progress"] == progress
+        assert self.calculator.combined_progress["T1"] == t1_progress
+        assert len(self.calculator.workflow_steps) == 3
+
+    def test_update_workflow_step_adds_new_step(self):
+        """Unknown steps are appended and counted."""
+        self.calculator.update_workflow_step({"task_id": "T1", "step_id": "review", "completed": False})
+        assert self.calculator.calculate_workflow_progress("T1") == 0.5
+
+    def test_update_commit_progress(self):
+        """Commit progress changes refresh the combined progress of the task."""
+        self.calculator.update_workflow_step({"task_id": "T2", "step_id": "coding", "completed": False})
+        progress = self.calculator.update_commit_progress("T2", 0.8)
+        assert progress == pytest.approx(0.4)
+
+    def test_indexes_rebuilt_after_direct_assignment(self):
+        """Replacing the task list directly is picked up by the index check."""
+        self.calculator.tasks = [{"id": "T3", "status": "completed"}]
+        assert self.calculator.calculate_combined_progress("T3") == 1.0
@@ -410,5 +410,114 @@ class TestResourceLeveling(unittest.TestCase):
         # Should return empty schedules
         self.assertEqual(result, {})
 
+    # Test 21: Dependencies are honoured and a shared resource is never double-booked
+    def test_resource_leveling_respects_dependencies_and_capacity(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json')
+        leveler.flat_tasks = [
+            {"id": 1, "normal_hours": 4},
+            {"id": 2, "normal_hours": 2, "dependencies": [1]},
+            {"id": 3, "normal_hours": 3},
+            {"id": 4, "normal_hours": 1, "dependencies": [2, 3]},
+        ]
+        leveler.allocations = [
+            {"task_id": 1, "role": "Developer"},
+            {"task_id": 2, "role": "Developer"},
+            {"task_id": 3, "role": "Tester"},
+            {"task_id": 4, "role": "Developer"},
+            {"task_id": 4, "role": "Tester"},
+        ]
+        result = leveler.resource_leveling()
+        self.assertEqual((result[1]['start'], result[1]['end']), (0, 4))
+        self.assertEqual((result[2]['start'], result[2]['end']), (4, 6))
+        self.assertEqual((result[3]['start'], result[3]['end']), (0, 3))
+        self.assertEqual((result[4]['start'], result[4]['end']), (6, 7))
+        self.assertEqual(result[4]['resources'], ["Developer", "Tester"])
+        self.assertEqual([entry['task_id'] for entry in leveler.resource_schedules["Developer"]], [1, 2, 4])
+
+    # Test 22: Tasks with the least slack are scheduled first
+    def test_resource_leveling_prioritizes_least_slack(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json')
+        # Task 2 feeds a long chain through the unallocated task 3, so it is more urgent than task 1
+        leveler.flat_tasks = [
+            {"id": 1, "normal_hours": 2},
+            {"id": 2, "normal_hours": 2},
+            {"id": 3, "normal_hours": 10, "dependencies": [2]},
+        ]
+        leveler.allocations = [{"task_id": 1, "role": "Developer"}, {"task_id": 2, "role": "Developer"}]
+        result = leveler.resource_leveling()
+        self.assertEqual(result[2]['start'], 0)
+        self.assertEqual(result[1]['start'], 2)
+        self.assertNotIn(3, result)
+
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json', priority_rule='priority')
+        leveler.flat_tasks = [{"id": 1, "normal_hours": 2, "priority": "high"}, {"id": 2, "normal_hours": 2}]
+        leveler.allocations = [{"task_id": 2, "role": "Developer"}, {"task_id": 1, "role": "Developer"}]
+        self.assertEqual(leveler.resource_leveling()[1]['start'], 0)
+
+    # Test 23: Capacities allow parallel work and calendar blocks are skipped
+    def test_resource_leveling_capacities_and_calendars(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json',
+                                  resource_capacities={"Developer": 2},
+                                  resource_calendars={"Tester": [{"start": 1, "end": 5}]})
+        leveler.flat_tasks = [{"id": i, "normal_hours": 2} for i in range(1, 4)] + [{"id": 4, "normal_hours": 2}]
+        leveler.allocations = [{"task_id": i, "role": "Developer"} for i in range(1, 4)] + [{"task_id": 4, "role": "Tester"}]
+        result = leveler.resource_leveling()
+        self.assertEqual(sorted(result[i]['start'] for i in range(1, 4)), [0, 0, 2])
+        self.assertEqual((result[4]['start'], result[4]['end']), (5, 7))
+
+    # Test 24: Invalid options and capacities are rejected
+    def test_resource_leveling_invalid_input(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler, ResourceTimeline
+        with self.assertRaises(ValueError):
+            ResourceLeveler('tasks.json', 'allocations.json', 'output.json', duration_type='likely')
+        with self.assertRaises(ValueError):
+            ResourceLeveler('tasks.json', 'allocations.json', 'output.json', priority_rule='random')
+        with self.assertRaises(ValueError):
+            ResourceLeveler('tasks.json', 'allocations.json', 'output.json', resource_capacities={"Developer": 0})
+        with self.assertRaises(ValueError):
+            ResourceTimeline(capacity=0)
+        with self.assertRaises(ValueError):
+            ResourceTimeline(1).earliest_fit(0, 5, units=2)
+        self.assertEqual(ResourceTimeline(2).earliest_fit(0, 5, units=2), 0)
+
+    # Test 25: Dependencies closing a cycle are ignored instead of aborting the run
+    def test_resource_leveling_dependency_cycle(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json')
+        leveler.flat_tasks = [
+            {"id": 1, "normal_hours": 2, "dependencies": [2]},
+            {"id": 2, "normal_hours": 3, "dependencies": [1]},
+            {"id": 3, "normal_hours": 1, "dependencies": [2]},
+        ]
+        leveler.allocations = [{"task_id": i, "role": "Developer"} for i in (1, 2, 3)]
+        with self.assertLogs('project_management.modules.main_modules.critical_path', level='WARNING'):
+            result = leveler.resource_leveling()
+        self.assertEqual(sorted(result), [1, 2, 3])
+        self.assertEqual((result[1]['start'], result[1]['end']), (0, 2))
+        self.assertEqual((result[2]['start'], result[2]['end']), (2, 5))
+        self.assertEqual(result[3]['start'], 5)
+
+    # Test 26: A dependency on a summary task waits for every task under it
+    def test_resource_leveling_summary_dependency(self):
+        from project_management.modules.main_modules.resource_leveling import ResourceLeveler
+        leveler = ResourceLeveler('tasks.json', 'allocations.json', 'output.json')
+        leveler.flat_tasks = [
+            {"id": 1, "parent_id": None},
+            {"id": 2, "parent_id": 1, "normal_hours": 4},
+            {"id": 3, "parent_id": 1, "normal_hours": 6},
+            {"id": 4, "parent_id": None, "dependencies": [1]},
+            {"id": 5, "parent_id": 4, "normal_hours": 2},
+        ]
+        leveler.allocations = [
+            {"task_id": 2, "role": "Developer"},
+            {"task_id": 3, "role": "Tester"},
+            {"task_id": 5, "role": "Analyst"},
+        ]
+        result = leveler.resource_leveling()
+        self.assertEqual((result[5]['start'], result[5]['end']), (6, 8))
+
 if __name__ == "__main__":
     unittest.main()
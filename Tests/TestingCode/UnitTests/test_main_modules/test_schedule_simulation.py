@@ -0,0 +1,82 @@
+"""
+Unit tests for the Monte Carlo schedule simulation
+"""
+
+import datetime
+import unittest
+
+import numpy as np
+
+from project_management.modules.main_modules.schedule_simulation import ScheduleSimulation, three_point_estimate
+
+
+class TestScheduleSimulation(unittest.TestCase):
+    def setUp(self):
+        # Spec -> Build, and Docs in parallel with both
+        self.wbs = {
+            "id": 1, "name": "Project", "subtasks": [
+                {"id": 2, "name": "Spec", "optimistic_hours": 4, "normal_hours": 8, "pessimistic_hours": 18},
+                {"id": 3, "name": "Build", "dependencies": [2],
+                 "optimistic_hours": 10, "normal_hours": 16, "pessimistic_hours": 40},
+                {"id": 4, "name": "Docs", "normal_hours": 6},
+            ]
+        }
+
+    def test_three_point_estimate_defaults(self):
+        self.assertEqual(three_point_estimate({"normal_hours": 5}), (5, 5, 5))
+        self.assertEqual(three_point_estimate({}), (1, 1, 1))
+        self.assertEqual(three_point_estimate({"optimistic_hours": 9, "normal_hours": 5, "pessimistic_hours": 2}),
+                         (2, 5, 9))
+
+    def test_fixed_durations_give_the_critical_path(self):
+        for task in self.wbs["subtasks"]:
+            task.pop("optimistic_hours", None)
+            task.pop("pessimistic_hours", None)
+        result = ScheduleSimulation(self.wbs, seed=1).run(iterations=50)
+        self.assertEqual(result.percentiles(), {"P50": 24.0, "P80": 24.0, "P95": 24.0})
+        self.assertEqual(result.criticality, {2: 1.0, 3: 1.0, 4: 0.0})
+
+    def test_pert_samples_stay_within_estimates(self):
+        for distribution in ("pert", "triangular"):
+            result = ScheduleSimulation(self.wbs, distribution=distribution, seed=3).run(iterations=4000)
+            self.assertTrue(np.all(result.project_finish >= 14))
+            self.assertTrue(np.all(result.project_finish <= 58))
+            percentiles = result.percentiles()
+            self.assertLess(percentiles["P50"], percentiles["P80"])
+            self.assertLess(percentiles["P80"], percentiles["P95"])
+        # Beta-PERT mean of the chain is sum((o + 4m + p) / 6) = 9 + 19
+        result = ScheduleSimulation(self.wbs, seed=5).run(iterations=20000)
+        self.assertAlmostEqual(result.project_finish.mean(), 28, delta=0.3)
+
+    def test_criticality_of_parallel_branches(self):
+        wbs = [
+            {"id": "a", "optimistic_hours": 1, "normal_hours": 5, "pessimistic_hours": 9},
+            {"id": "b", "optimistic_hours": 1, "normal_hours": 5, "pessimistic_hours": 9},
+        ]
+        result = ScheduleSimulation(wbs, seed=2).run(iterations=5000)
+        self.assertAlmostEqual(result.criticality["a"], 0.5, delta=0.05)
+        self.assertAlmostEqual(result.criticality["a"] + result.criticality["b"], 1.0, delta=0.01)
+
+    def test_results_do_not_depend_on_workers(self):
+        simulation = ScheduleSimulation(self.wbs, seed=11)
+        serial = simulation.run(iterations=900, chunk_size=200)
+        parallel = simulation.run(iterations=900, workers=2, chunk_size=200)
+        np.testing.assert_array_equal(serial.project_finish, parallel.project_finish)
+        self.assertEqual(serial.criticality, parallel.criticality)
+
+    def test_to_dict_with_finish_dates(self):
+        result = ScheduleSimulation(self.wbs, seed=4).run(iterations=100)
+        summary = result.to_dict(start_date=datetime.datetime(2024, 1, 1), hours_per_day=8)
+        self.assertEqual(summary["iterations"], 100)
+        self.assertEqual(set(summary["finish_dates"]), {"P50", "P80", "P95"})
+        self.assertGreater(summary["finish_dates"]["P95"], "2024-01-03")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ScheduleSimulation(self.wbs, distribution="normal")
+        with self.assertRaises(ValueError):
+            ScheduleSimulation(self.wbs).run(iterations=10, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -327,6 +327,62 @@ class TestTaskManagement(unittest.TestCase):
             self.assertIsNotNone(task.urgency)
             self.assertIsNotNone(task.importance)
 
+    def test_generate_wbs_builds_children_index(self):
+        self.task_manager.generate_wbs_from_idea("Project")
+        root_children = self.task_manager.get_children(1)
+        self.assertEqual([t.id for t in root_children], [2, 5, 8])
+        self.assertEqual([t.id for t in self.task_manager.get_children(2)], [3, 4])
+        self.assertEqual(self.task_manager.get_children(3), [])
+
+    def test_remove_task_removes_subtree(self):
+        self.task_manager.generate_wbs_from_idea("Project")
+        self.assertTrue(self.task_manager.remove_task(2))
+        self.assertNotIn(2, self.task_manager.tasks)
+        self.assertNotIn(3, self.task_manager.tasks)
+        self.assertNotIn(4, self.task_manager.tasks)
+        self.assertEqual([t.id for t in self.task_manager.get_children(1)], [5, 8])
+        self.assertFalse(self.task_manager.remove_task(2))
+
+    def test_propagation_sums_children(self):
+        self.task_manager.generate_wbs_from_idea("Project")
+        self.task_manager.calculate_urgency_importance()
+        tasks = self.task_manager.tasks
+        self.assertAlmostEqual(tasks[2].urgency, tasks[3].urgency + tasks[4].urgency)
+        self.assertAlmostEqual(tasks[1].importance, sum(tasks[i].importance for i in (2, 5, 8)))
+
+    def test_deep_hierarchy_propagation_without_recursion_limit(self):
+        for task_id in range(1, 5001):
+            self.task_manager.add_task(Task(id=task_id, title=f"Task {task_id}",
+                                            parent_id=task_id - 1 if task_id > 1 else None))
+        self.task_manager.calculate_urgency_importance()
+        self.assertAlmostEqual(self.task_manager.tasks[1].urgency, self.task_manager.tasks[5000].urgency)
+
+    def test_task_uses_slots(self):
+        task = Task(id=1, title="Test Task")
+        self.assertFalse(hasattr(task, "__dict__"))
+        with self.assertRaises(AttributeError):
+            task.unknown_attribute = 1
+
+    def test_workflow_steps_view_assignment(self):
+        task = Task(id=1, title="Test Task")
+        task.workflow_steps["Testing"] = True
+        self.assertTrue(task.workflow_steps["Testing"])
+        self.assertAlmostEqual(task.workflow_progress_percentage(), 100/6, places=2)
+        task.workflow_steps = {"Coding": True, "Verification": True}
+        self.assertEqual([step for step, done in task.workflow_steps.items() if done], ["Coding", "Verification"])
+        self.assertEqual(task.to_dict()["workflow_steps"]["Coding"], True)
+
+    def test_bulk_workflow_progress(self):
+        self.task_manager.generate_wbs_from_idea("Project")
+        for step in list(self.task_manager.tasks[2].workflow_steps):
+            self.task_manager.tasks[2].mark_workflow_step_completed(step)
+        self.task_manager.tasks[3].mark_workflow_step_completed("Coding")
+        progress = self.task_manager.workflow_progress_percentages()
+        self.assertEqual(progress[2], 100.0)
+        self.assertAlmostEqual(progress[3], 100/6, places=2)
+        self.assertEqual(progress[1], 0.0)
+        self.assertEqual(self.task_manager.completed_workflow_task_ids(), [2])
+
     def test_extract_task_details(self):
         task = Task(id=1, title="Test Task", description="Test description")
         # Since extract_task_details doesn't exist, we'll test the attributes directly
@@ -334,5 +390,57 @@ class TestTaskManagement(unittest.TestCase):
         self.assertEqual(task.title, "Test Task")
         self.assertEqual(task.description, "Test description")
 
+    def test_detect_conflicts_structured(self):
+        self.task_manager.tasks = {
+            1: Task(id=1, title="Task 1", dependencies=[3]),
+            2: Task(id=2, title="Task 2", dependencies=[1, 999]),
+            3: Task(id=3, title="Task 3", dependencies=[2]),
+            4: Task(id=4, title="Task 4", dependencies=[4], parent_id=50),
+            5: Task(id=5, title="Task 5", dependencies=[1]),
+        }
+        conflicts = self.task_manager.detect_conflicts()
+        by_kind = {}
+        for conflict in conflicts:
+            by_kind.setdefault(conflict.kind, []).append(conflict)
+        self.assertEqual(by_kind["unknown_dependency"][0].to_dict(),
+                         {"kind": "unknown_dependency", "message": "Task 2 depends on unknown task 999",
+                          "task_ids": [2], "dependency_id": 999})
+        self.assertEqual(by_kind["unknown_parent"][0].details, {"parent_id": 50})
+        self.assertEqual(sorted(conflict.task_ids for conflict in by_kind["dependency_cycle"]), [[1, 2, 3], [4]])
+        self.assertIn("Task 4 depends on itself", conflicts)
+
+    def test_detect_conflicts_over_allocation(self):
+        day = datetime.date(2025, 1, 1)
+        self.task_manager.tasks = {
+            1: Task(id=1, title="Task 1", assigned_to=["alice"]),
+            2: Task(id=2, title="Task 2", assigned_to=["alice", "bob"]),
+            3: Task(id=3, title="Task 3", assigned_to=["alice"]),
+            4: Task(id=4, title="Task 4", assigned_to=["bob"], status="completed"),
+        }
+        schedule = {
+            1: (day, day + datetime.timedelta(days=3)),
+            2: (day + datetime.timedelta(days=2), day + datetime.timedelta(days=5)),
+            # Back-to-back with task 2, so not overlapping
+            3: (day + datetime.timedelta(days=5), day + datetime.timedelta(days=6)),
+            4: (day, day + datetime.timedelta(days=9)),
+        }
+        conflicts = self.task_manager.detect_conflicts(schedule=schedule)
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0].kind, "over_allocation")
+        self.assertEqual(conflicts[0].task_ids, [1, 2])
+        self.assertEqual(conflicts[0].details, {"user": "alice", "start": day + datetime.timedelta(days=2),
+                                                "end": day + datetime.timedelta(days=3)})
+        self.assertEqual(self.task_manager.detect_conflicts(schedule=schedule, max_concurrent=2), [])
+
+    def test_detect_conflicts_large_chain(self):
+        count = 20000
+        self.task_manager.tasks = {i: Task(id=i, title=f"Task {i}", dependencies=[i - 1] if i else [])
+                                   for i in range(count)}
+        self.assertEqual(self.task_manager.detect_conflicts(), [])
+        self.task_manager.tasks[0].dependencies = [count - 1]
+        conflicts = self.task_manager.detect_conflicts()
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(len(conflicts[0].task_ids), count)
+
 if __name__ == "__main__":
     unittest.main()
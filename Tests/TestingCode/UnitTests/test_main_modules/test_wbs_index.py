@@ -0,0 +1,69 @@
+import unittest
+from project_management.modules.main_modules.wbs_index import WBSIndex
+
+class TestWBSIndex(unittest.TestCase):
+    def setUp(self):
+        self.wbs = {
+            "id": 1, "name": "Root", "subtasks": [
+                {"id": 2, "name": "A", "subtasks": [
+                    {"id": 4, "name": "A1"},
+                    {"id": 5, "name": "A2"},
+                ]},
+                {"id": 3, "name": "B"},
+            ],
+        }
+        self.index = WBSIndex(self.wbs)
+
+    def test_maps_id_to_node_parent_position(self):
+        self.assertIs(self.index.get(5), self.wbs["subtasks"][0]["subtasks"][1])
+        self.assertIs(self.index.parent_of(5), self.wbs["subtasks"][0])
+        self.assertEqual(self.index.position_of(5), 1)
+        self.assertIsNone(self.index.parent_of(1))
+        self.assertIsNone(self.index.get(99))
+        self.assertEqual(len(self.index), 5)
+
+    def test_list_root(self):
+        index = WBSIndex([{"id": "a"}, {"id": "b", "subtasks": [{"id": "c"}]}])
+        self.assertEqual(index.position_of("b"), 1)
+        self.assertTrue(index.remove("a"))
+        self.assertEqual(index.position_of("b"), 0)
+        self.assertEqual([node["id"] for node in index.root], ["b"])
+
+    def test_add_indexes_subtree(self):
+        self.assertTrue(self.index.add(3, {"id": 6, "subtasks": [{"id": 7}]}))
+        self.assertIs(self.index.parent_of(7), self.index.get(6))
+        self.assertEqual(self.wbs["subtasks"][1]["subtasks"][0]["id"], 6)
+        self.assertFalse(self.index.add(99, {"id": 8}))
+
+    def test_remove_drops_subtree_and_renumbers(self):
+        self.assertTrue(self.index.remove(2))
+        self.assertIsNone(self.index.get(4))
+        self.assertEqual([node["id"] for node in self.wbs["subtasks"]], [3])
+        self.assertEqual(self.index.position_of(3), 0)
+        self.assertFalse(self.index.remove(2))
+        # The root has no list to be removed from
+        self.assertFalse(self.index.remove(1))
+
+    def test_deferred_removals_flush_once(self):
+        self.index.remove(4, deferred=True)
+        self.index.remove(5, deferred=True)
+        self.assertIsNone(self.index.get(4))
+        self.assertEqual(len(self.wbs["subtasks"][0]["subtasks"]), 2)
+        self.index.flush()
+        self.assertEqual(self.wbs["subtasks"][0]["subtasks"], [])
+
+    def test_update_reindexes_changed_id(self):
+        self.assertTrue(self.index.update(5, {"id": 50, "name": "Renamed"}))
+        self.assertIsNone(self.index.get(5))
+        self.assertEqual(self.index.get(50)["name"], "Renamed")
+        self.assertEqual(self.index.position_of(50), 1)
+
+    def test_duplicate_ids_fall_back_to_next_match(self):
+        self.wbs["subtasks"][1]["subtasks"] = [{"id": 4, "name": "Duplicate"}]
+        index = WBSIndex(self.wbs)
+        self.assertEqual(index.get(4)["name"], "A1")
+        index.remove(4)
+        self.assertEqual(index.get(4)["name"], "Duplicate")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -190,6 +190,138 @@ class TestWBSMerger(unittest.TestCase):
         self.assertEqual(merged["name"], "Project")
         self.assertEqual(merged["subtasks"], [])
 
+    def test_merge_all_parts_merges_nested_tasks_across_parts(self):
+        """Test that matching tasks from later parts are merged level by level"""
+        parts = {
+            'a.json': {"id": 1, "subtasks": [{"id": 2, "name": "Phase", "subtasks": [{"id": 3, "name": "Design"}]}]},
+            'b.json': {"id": 1, "subtasks": [{"id": 2, "owner": "x", "subtasks": [{"id": 3, "estimate": 5}, {"id": 4}]}]},
+            'c.json': {"id": 1, "subtasks": [{"id": 2, "subtasks": [{"id": 4, "subtasks": [{"id": 5}]}]}]},
+        }
+        for name, part in parts.items():
+            with open(os.path.join(self.parts_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(part, f)
+
+        merged = self.merger.merge_all_parts()
+        phase = merged["subtasks"][0]
+        self.assertEqual(len(merged["subtasks"]), 1)
+        self.assertEqual((phase["name"], phase["owner"]), ("Phase", "x"))
+        tasks = {task["id"]: task for task in phase["subtasks"]}
+        self.assertEqual(sorted(tasks), [3, 4])
+        self.assertEqual((tasks[3]["name"], tasks[3]["estimate"]), ("Design", 5))
+        self.assertEqual(tasks[4]["subtasks"], [{"id": 5}])
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), merged)
+
+    def _write_part(self, name, subtasks):
+        with open(os.path.join(self.parts_dir, name), 'w', encoding='utf-8') as f:
+            json.dump({"id": 1, "subtasks": subtasks}, f)
+
+    def _full_merge(self):
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=os.path.join(self.temp_dir, 'full.json'),
+                           use_cache=False)
+        return merger.merge_all_parts()
+
+    def test_merge_all_parts_cache_hit_skips_merge(self):
+        """Test that an unchanged set of parts reuses the existing output"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        self._write_part('b.json', [{"id": 3, "name": "Build"}])
+        merged = self.merger.merge_all_parts()
+        self.assertEqual(self.merger.cache_status, 'miss')
+        self.assertTrue(os.path.exists(self.merger.manifest_file))
+        output_mtime = os.stat(self.output_file).st_mtime_ns
+
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        self.assertEqual(merger.merge_all_parts(), merged)
+        self.assertEqual(merger.cache_status, 'hit')
+        self.assertEqual(os.stat(self.output_file).st_mtime_ns, output_mtime)
+
+    def test_merge_all_parts_cache_touched_part_is_hit(self):
+        """Test that a part with a new mtime but the same content is still a hit"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        self.merger.merge_all_parts()
+        path = os.path.join(self.parts_dir, 'a.json')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        merger.merge_all_parts()
+        self.assertEqual(merger.cache_status, 'hit')
+        self.assertEqual(merger.load_manifest()['parts']['a.json']['mtime_ns'], stat.st_mtime_ns + 10 ** 9)
+
+    def test_merge_all_parts_partial_remerge(self):
+        """Test that only the subtrees of changed parts are re-merged"""
+        self._write_part('a.json', [{"id": 2, "subtasks": [{"id": 21}]}, {"id": 3, "name": "Test"}])
+        self._write_part('b.json', [{"id": 2, "subtasks": [{"id": 22}]}])
+        self._write_part('c.json', [{"id": 4, "name": "Deploy"}])
+        self.merger.merge_all_parts()
+
+        self._write_part('b.json', [{"id": 2, "owner": "x", "subtasks": [{"id": 23}]}, {"id": 5}])
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        merged = merger.merge_all_parts()
+        self.assertEqual(merger.cache_status, 'partial')
+        self.assertEqual(sorted(merger.changed_subtask_ids), [2, 5])
+        self.assertEqual(merged, self._full_merge())
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), merged)
+
+    def test_merge_all_parts_removed_part(self):
+        """Test that the subtrees of a removed part are dropped or re-merged"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        self._write_part('b.json', [{"id": 2, "owner": "x"}, {"id": 3}])
+        self.merger.merge_all_parts()
+
+        os.remove(os.path.join(self.parts_dir, 'b.json'))
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        merged = merger.merge_all_parts()
+        self.assertEqual(merger.cache_status, 'partial')
+        self.assertEqual(merged["subtasks"], [{"id": 2, "name": "Phase"}])
+
+    def test_merge_all_parts_modified_output_is_miss(self):
+        """Test that an output changed outside the merger forces a full merge"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        merged = self.merger.merge_all_parts()
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            json.dump({"id": 1, "subtasks": []}, f)
+
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        self.assertEqual(merger.merge_all_parts(), merged)
+        self.assertEqual(merger.cache_status, 'miss')
+
+    def test_merge_all_parts_invalid_part_falls_back(self):
+        """Test that a changed part that cannot be read falls back to a full merge"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        self.merger.merge_all_parts()
+        with open(os.path.join(self.parts_dir, 'b.json'), 'w', encoding='utf-8') as f:
+            f.write('invalid json content')
+
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        merged = merger.merge_all_parts()
+        self.assertEqual(merger.cache_status, 'miss')
+        self.assertEqual(merged["subtasks"], [{"id": 2, "name": "Phase"}])
+
+    def test_merge_all_parts_invalid_task_leaves_no_partial_merge(self):
+        """Test that a part with an invalid nested task is skipped as a whole"""
+        self._write_part('a.json', [{"id": 2, "name": "Phase"}])
+        self._write_part('b.json', [{"id": 2, "owner": "x"}, {"id": 3, "subtasks": [{"name": "No id"}]}])
+        with self.assertLogs('project_management.modules.main_modules.wbs_merger', level='ERROR') as logs:
+            merged = self.merger.merge_all_parts()
+        self.assertIn('b.json', logs.output[0])
+        self.assertEqual(merged["subtasks"], [{"id": 2, "name": "Phase"}])
+        self.assertTrue(self.merger.load_manifest()['parts']['b.json']['error'])
+
+    def test_load_part_subtasks(self):
+        """Test reading a part's top-level subtasks and rejecting malformed parts"""
+        parts = {'a.json': '{"id": 1, "subtasks": [{"id": 2}]}', 'b.json': '{}', 'c.json': '[]', 'd.json': '{"subtasks": [1'}
+        for filename, text in parts.items():
+            with open(os.path.join(self.parts_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(text)
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=self.output_file)
+        self.assertEqual(merger.load_part_subtasks('a.json'), [{"id": 2}])
+        self.assertEqual(merger.load_part_subtasks('b.json'), [])
+        for filename in ('c.json', 'd.json'):
+            with self.assertRaises(ValueError, msg=filename):
+                merger.load_part_subtasks(filename)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from project_management.modules.main_modules.wbs_part_loader import (
+    iter_parts_in_order, list_part_files, load_json_part,
+)
+from project_management.modules.main_modules.wbs_merger import WBSMerger
+
+class TestWBSPartLoader(unittest.TestCase):
+    def setUp(self):
+        self.parts_dir = tempfile.mkdtemp()
+        for name in ("b.json", "a.json", "c.json", "notes.txt"):
+            with open(os.path.join(self.parts_dir, name), "w", encoding="utf-8") as f:
+                json.dump({"id": 1, "name": name}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
+
+    def test_list_part_files_sorted(self):
+        self.assertEqual(list_part_files(self.parts_dir), ["a.json", "b.json", "c.json"])
+
+    def test_results_follow_input_order(self):
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+        def load(name):
+            time.sleep(delays[name])
+            return name.upper()
+        results = list(iter_parts_in_order(["a", "b", "c"], load, max_workers=3))
+        self.assertEqual([result.data for result in results], ["A", "B", "C"])
+        self.assertTrue(all(result.seconds >= delays[result.filename] for result in results))
+
+    def test_loads_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        def load(name):
+            barrier.wait()
+            return name
+        results = list(iter_parts_in_order(["a", "b", "c"], load, max_workers=3))
+        self.assertTrue(all(result.error is None for result in results))
+
+    def test_errors_are_reported_per_part(self):
+        def load(name):
+            if name == "b":
+                raise ValueError("broken part")
+            return name
+        results = list(iter_parts_in_order(["a", "b", "c"], load, max_workers=2))
+        self.assertEqual([result.data for result in results], ["a", None, "c"])
+        self.assertEqual(str(results[1].error), "broken part")
+        self.assertEqual(results[1].to_dict()["error"], "broken part")
+
+    def test_large_parts_use_process_pool(self):
+        load = partial(load_json_part, self.parts_dir)
+        results = list(iter_parts_in_order(["a.json", "b.json"], load, max_workers=2,
+                                           large_load=load, is_large=lambda name: name == "b.json"))
+        self.assertEqual([result.data["name"] for result in results], ["a.json", "b.json"])
+
+    def test_merger_applies_parts_in_name_order(self):
+        for name, value in (("part_10.json", "last"), ("part_01.json", "first")):
+            with open(os.path.join(self.parts_dir, name), "w", encoding="utf-8") as f:
+                json.dump({"id": 1, "subtasks": [{"id": 2, "name": value}]}, f)
+        merger = WBSMerger(parts_dir=self.parts_dir, output_file=os.path.join(self.parts_dir, "out", "wbs.json"))
+        merged = merger.merge_all_parts()
+        self.assertEqual(merged["subtasks"][0]["name"], "last")
+        self.assertEqual([timing["file"] for timing in merger.part_timings],
+                         ["a.json", "b.json", "c.json", "part_01.json", "part_10.json"])
+
+if __name__ == "__main__":
+    unittest.main()
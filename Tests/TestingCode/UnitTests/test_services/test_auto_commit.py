@@ -1,5 +1,11 @@
 import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest.mock import patch
 from project_management.modules.services import auto_commit
+from project_management.modules.main_modules.commit_task_log import CommitTaskLog, log_path_for
 
 class TestAutoCommitService(unittest.TestCase):
     def setUp(self):
@@ -315,5 +321,132 @@ class TestAutoCommitService(unittest.TestCase):
         formatted = auto_commit.format_commit_message(message)
         self.assertIn("'single quotes'", formatted)
 
+class TestAutoCommitGitMetadata(unittest.TestCase):
+    def setUp(self):
+        self.auto_commit = auto_commit.AutoCommit()
+        self.original_cwd = os.getcwd()
+        self.repo_dir = tempfile.mkdtemp()
+        os.chdir(self.repo_dir)
+        self._git("init", "-q")
+        self._git("config", "user.email", "test@example.com")
+        self._git("config", "user.name", "Test User")
+        self.hashes = [self._commit(name) for name in ("a.txt", "b.txt", "c.txt")]
+
+    def tearDown(self):
+        self.auto_commit.cat_file.close()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+
+    def _git(self, *args):
+        return subprocess.run(["git"] + list(args), check=True, capture_output=True, text=True).stdout.strip()
+
+    def _commit(self, filename):
+        with open(filename, "w") as f:
+            f.write(filename)
+        self._git("add", filename)
+        self._git("commit", "-q", "-m", f"Add {filename}")
+        return self._git("rev-parse", "HEAD")
+
+    def test_get_commits_metadata_single_call(self):
+        metadata = self.auto_commit.get_commits_metadata(self.hashes)
+        self.assertEqual(set(metadata), set(self.hashes))
+        self.assertEqual(metadata[self.hashes[0]]["parent_commits"], [])
+        self.assertEqual(metadata[self.hashes[2]]["parent_commits"], [self.hashes[1]])
+        self.assertEqual(metadata[self.hashes[1]]["author"], "Test User")
+        self.assertEqual(metadata[self.hashes[1]]["email"], "test@example.com")
+        self.assertEqual(metadata[self.hashes[1]]["date"], self._git("log", "-1", "--pretty=format:%ad", self.hashes[1]))
+
+    def test_cat_file_metadata_matches_git_log(self):
+        batched = self.auto_commit.get_commits_metadata(self.hashes)
+        for commit_hash in self.hashes:
+            self.assertEqual(self.auto_commit.get_commit_metadata(commit_hash), batched[commit_hash])
+        self.assertEqual(self.auto_commit.cat_file.resolve("HEAD"), self.hashes[-1])
+        self.assertIsNone(self.auto_commit.cat_file.resolve("0" * 40))
+
+    def test_update_commit_task_database_uses_metadata(self):
+        db_path = os.path.join(self.repo_dir, "out", "commit_task_database.json")
+        self.auto_commit.update_commit_task_database(self.hashes[1], "1.1", "b.txt", "Add b.txt", db_path=db_path)
+        entry = CommitTaskLog(log_path_for(db_path)).load_all()[self.hashes[1]]
+        self.assertEqual(entry["author"], "Test User")
+        self.assertEqual(entry["parent_commits"], [self.hashes[0]])
+        self.assertEqual(entry["branch"], self._git("rev-parse", "--abbrev-ref", "HEAD"))
+
+    def test_stage_files_takes_paths_literally(self):
+        for name in ("a1.py", "a[1].py", "notes.md", "*.md"):
+            with open(name, "w") as f:
+                f.write(name)
+        self.assertTrue(self.auto_commit.stage_files(["a[1].py", "*.md"]))
+        staged = self._git("diff", "--staged", "--name-only").splitlines()
+        self.assertEqual(sorted(staged), ["*.md", "a[1].py"])
+
+    def test_grouped_commit_pushes_once(self):
+        remote_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, remote_dir, True)
+        self._git("init", "-q", "--bare", remote_dir)
+        self._git("remote", "add", "origin", remote_dir)
+        self._git("branch", "-M", "main")
+        for name in ("a.txt", "d.txt", "e.txt"):
+            with open(name, "w") as f:
+                f.write(name + " changed")
+
+        pushes = []
+        run_git_command = self.auto_commit.run_git_command
+        def counting_run_git_command(args):
+            if args[0] == "push":
+                pushes.append(args)
+            return run_git_command(args)
+
+        with patch.object(self.auto_commit, "run_git_command", side_effect=counting_run_git_command), \
+                patch.object(self.auto_commit, "write_commit_progress_to_json",
+                             wraps=self.auto_commit.write_commit_progress_to_json) as write_progress:
+            self.auto_commit.commit_and_push(grouped=True)
+
+        self.assertEqual(len(pushes), 1)
+        self.assertEqual(self._git("status", "--porcelain", "--", "*.txt"), "")
+        self.assertEqual(self._git("--git-dir", remote_dir, "rev-parse", "main"), self._git("rev-parse", "HEAD"))
+        new_hashes = self._git("rev-list", f"{self.hashes[-1]}..HEAD").splitlines()
+        db = CommitTaskLog(os.path.join("JSonDataBase", "OutPuts", "commit_task_database.jsonl")).load_all()
+        self.assertEqual(set(db), set(new_hashes))
+        committed = sorted(path for entry in db.values() for path in entry["file_paths"])
+        self.assertTrue(all(entry["file_path"] == entry["file_paths"][0] for entry in db.values()))
+        self.assertEqual(committed, ["a.txt", "d.txt", "e.txt"])
+        self.assertTrue(all(entry["author"] == "Test User" for entry in db.values()))
+        self.assertTrue(os.path.exists(os.path.join("JSonDataBase", "OutPuts", "commit_progress.json")))
+        # Progress data has the same shape as collect_commit_progress
+        progress_data = write_progress.call_args.kwargs["progress_data"]
+        messages = {entry["commit_message"] for entry in db.values()}
+        for categories in progress_data.values():
+            for data in categories.values():
+                self.assertEqual([entry["file"] for entry in data["commit_messages"]], data["files"])
+                self.assertTrue(all(entry["commit_message"] in messages for entry in data["commit_messages"]))
+
+    def test_failed_grouped_commit_unstages_its_files(self):
+        remote_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, remote_dir, True)
+        self._git("init", "-q", "--bare", remote_dir)
+        self._git("remote", "add", "origin", remote_dir)
+        self._git("branch", "-M", "main")
+        for name in ("a.txt", "d.txt"):
+            with open(name, "w") as f:
+                f.write(name + " changed")
+
+        commits = []
+        run_git_command = self.auto_commit.run_git_command
+        def failing_first_commit(args):
+            if args[0] == "commit":
+                commits.append(args)
+                if len(commits) == 1:
+                    return False, "pre-commit hook failed"
+            return run_git_command(args)
+
+        with patch.object(self.auto_commit, "run_git_command", side_effect=failing_first_commit), \
+                patch("builtins.print"):
+            self.auto_commit.commit_and_push(grouped=True)
+
+        self.assertEqual(len(commits), 2)
+        committed = self._git("show", "--name-only", "--pretty=format:", "HEAD").splitlines()
+        self.assertEqual(len(committed), 1)
+        self.assertEqual(self._git("diff", "--staged", "--name-only"), "")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the backend background job manager
+"""
+
+import threading
+import unittest
+
+from backend.services.job_manager import JobManager, SUCCEEDED, FAILED
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = JobManager(max_workers=2, max_jobs=3)
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_job_runs_in_background(self):
+        release = threading.Event()
+        job = self.manager.submit("install_dependencies", lambda: release.wait(5) and "Dependencies installed.")
+        self.assertFalse(job.done)
+        release.set()
+        job = self.manager.wait(job.id, timeout=5)
+        self.assertEqual(job.status, SUCCEEDED)
+        self.assertEqual(job.to_dict()["result"], "Dependencies installed.")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_records_error(self):
+        def fail():
+            raise RuntimeError("pip not found in virtual environment.")
+
+        job = self.manager.wait(self.manager.submit("install_dependencies", fail).id, timeout=5)
+        self.assertEqual(job.status, FAILED)
+        self.assertEqual(job.error, "pip not found in virtual environment.")
+
+    def test_running_job_is_not_duplicated(self):
+        release = threading.Event()
+        first = self.manager.submit("create_virtualenv", release.wait, 5)
+        second = self.manager.submit("create_virtualenv", release.wait, 5)
+        self.assertIs(first, second)
+        release.set()
+        self.manager.wait(first.id, timeout=5)
+        third = self.manager.submit("create_virtualenv", lambda: "Virtual environment already exists.")
+        self.assertIsNot(third, first)
+
+    def test_old_finished_jobs_are_pruned(self):
+        ids = []
+        for i in range(5):
+            ids.append(self.manager.submit(f"job{i}", lambda: None).id)
+            self.manager.wait(ids[-1], timeout=5)
+        self.assertLessEqual(len(self.manager.list_jobs()), 4)
+        self.assertIsNone(self.manager.get(ids[0]))
+        self.assertIsNotNone(self.manager.get(ids[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
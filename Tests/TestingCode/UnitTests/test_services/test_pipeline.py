@@ -0,0 +1,170 @@
+"""
+Unit tests for the in-process pipeline runner
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from project_management.modules.main_modules.json_cache import FrozenDict
+from project_management.modules.main_modules.scope_management import ScopeManagement
+from project_management.modules.main_modules.time_management import TimeManagement
+from project_management.modules.services.pipeline import Pipeline, PipelineError, Stage, ManagerStage, normalize_path
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_dependencies_from_paths_and_after(self):
+        stages = [
+            Stage('report', lambda a: None, inputs=[self.path('b.json')], after=['a']),
+            Stage('a', lambda a: None, outputs=[self.path('a.json')]),
+            Stage('b', lambda a: None, inputs=[self.path('a.json')], outputs=[self.path('b.json')]),
+        ]
+        pipeline = Pipeline(stages)
+        self.assertEqual(pipeline.dependencies, {'report': {'a', 'b'}, 'a': set(), 'b': {'a'}})
+
+    def test_invalid_graphs(self):
+        with self.assertRaises(PipelineError):
+            Pipeline([Stage('a', None, after=['b']), Stage('b', None, after=['a'])])
+        with self.assertRaises(PipelineError):
+            Pipeline([Stage('a', None, after=['missing'])])
+        with self.assertRaises(PipelineError):
+            Pipeline([Stage('a', None), Stage('a', None)])
+
+    def test_runs_in_dependency_order(self):
+        order = []
+        lock = threading.Lock()
+
+        def step(name):
+            def run(artifacts):
+                with lock:
+                    order.append(name)
+            return run
+
+        stages = [Stage('c', step('c'), after=['b']), Stage('b', step('b'), after=['a']), Stage('a', step('a'))]
+        self.assertTrue(Pipeline(stages).run())
+        self.assertEqual(order, ['a', 'b', 'c'])
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other(artifacts):
+            # Raises BrokenBarrierError unless both stages are running at once
+            barrier.wait()
+
+        stages = [Stage('a', wait_for_other), Stage('b', wait_for_other)]
+        self.assertTrue(Pipeline(stages, max_workers=2).run())
+
+    def test_outputs_passed_in_memory(self):
+        wbs_path = self.path('wbs.json')
+        seen = {}
+        wbs = {"id": 1, "subtasks": []}
+
+        def consume(artifacts):
+            seen['wbs'] = artifacts[os.path.normcase(os.path.abspath(wbs_path))]
+
+        stages = [
+            Stage('merge', lambda a: {wbs_path: wbs}, outputs=[wbs_path]),
+            Stage('consume', consume, inputs=[wbs_path]),
+        ]
+        self.assertTrue(Pipeline(stages).run())
+        self.assertEqual(seen['wbs'], wbs)
+        self.assertIsInstance(seen['wbs'], FrozenDict)
+        with self.assertRaises(TypeError):
+            seen['wbs']['subtasks'].append({"id": 2})
+        # The producer's own object is left mutable
+        wbs['subtasks'].append({"id": 2})
+
+    def test_manager_stage_reads_upstream_output_from_memory(self):
+        wbs_path = self.path('detailed_wbs.json')
+        wbs = {"id": 1, "name": "Project", "subtasks": [{"id": 2, "name": "Build", "subtasks": []}]}
+        scope = ScopeManagement(detailed_wbs_path=wbs_path, scope_changes_path=self.path('changes.json'),
+                                output_path=self.path('scope.json'))
+        time_management = TimeManagement(detailed_wbs_path=wbs_path, resource_allocation_path=self.path('alloc.json'),
+                                         output_path=self.path('time.json'))
+        stages = [
+            # The WBS is never written to disk, so the managers can only get it from the pipeline
+            Stage('merge', lambda a: {wbs_path: wbs}, outputs=[wbs_path]),
+            ManagerStage('scope', scope),
+            ManagerStage('time', time_management, copy_inputs=False),
+        ]
+        pipeline = Pipeline(stages)
+        self.assertTrue(pipeline.run())
+        self.assertFalse(os.path.exists(wbs_path))
+        artifact = pipeline.artifacts[normalize_path(wbs_path)]
+        self.assertNotIsInstance(scope.detailed_wbs, FrozenDict)
+        self.assertIsNot(scope.detailed_wbs, artifact)
+        self.assertIs(time_management.detailed_wbs, artifact)
+        self.assertIsInstance(time_management.detailed_wbs, FrozenDict)
+        with open(self.path('time.json'), 'r', encoding='utf-8') as f:
+            self.assertEqual(sorted(json.load(f)), ['1', '2'])
+        self.assertIn(os.path.normcase(os.path.abspath(self.path('scope.json'))), pipeline.artifacts)
+        self.assertNotIn('load_json', vars(scope))
+
+    def test_failure_stops_later_stages(self):
+        def fail(artifacts):
+            raise ValueError("broken")
+
+        stages = [Stage('a', fail), Stage('b', lambda a: None, after=['a'])]
+        pipeline = Pipeline(stages, max_workers=1)
+        self.assertFalse(pipeline.run())
+        statuses = {t['stage']: t['status'] for t in pipeline.timings}
+        self.assertEqual(statuses, {'a': 'failed', 'b': 'not_run'})
+
+    def test_skipped_stage_and_timings(self):
+        ran = []
+        stages = [
+            Stage('a', lambda a: ran.append('a'), skip_if=lambda: True),
+            Stage('b', lambda a: ran.append('b'), after=['a']),
+        ]
+        pipeline = Pipeline(stages)
+        self.assertTrue(pipeline.run())
+        self.assertEqual(ran, ['b'])
+        timings = {t['stage']: t for t in pipeline.timings}
+        self.assertEqual(timings['a']['status'], 'skipped')
+        self.assertEqual(timings['b']['status'], 'ok')
+        self.assertGreaterEqual(timings['b']['seconds'], 0)
+        self.assertGreaterEqual(timings['b']['start'], timings['a']['start'])
+
+
+class TestIntegrationPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        # The managers' default paths are relative to the working directory
+        os.chdir(self.temp_dir)
+        os.makedirs(os.path.join('SystemInputs', 'user_inputs', 'wbs_parts'))
+        os.makedirs(os.path.join('JSonDataBase', 'OutPuts'))
+        with open(os.path.join('SystemInputs', 'user_inputs', 'wbs_parts', 'part_1.json'), 'w', encoding='utf-8') as f:
+            json.dump({"subtasks": [{"id": 7, "name": "Build", "duration_days": 2}]}, f)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_wbs_stages_receive_merged_wbs(self):
+        from project_management.modules.services.integration_manager import IntegrationManager
+        integration = IntegrationManager()
+        stages = {stage.name: stage for stage in integration.build_pipeline().stages}
+        pipeline = Pipeline([stages['wbs_merger'], stages['time_management']])
+        self.assertEqual(pipeline.dependencies['time_management'], {'wbs_merger'})
+        self.assertTrue(pipeline.run())
+        merged = pipeline.artifacts[normalize_path(integration.wbs_merger.output_file)]
+        time_management = stages['time_management'].manager
+        self.assertIs(time_management.detailed_wbs, merged)
+        self.assertEqual([task['id'] for task in time_management.detailed_wbs['subtasks']], [7])
+
+
+if __name__ == '__main__':
+    unittest.main()
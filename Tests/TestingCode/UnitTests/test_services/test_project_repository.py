@@ -0,0 +1,130 @@
+"""
+Unit tests for the backend project repository
+"""
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from backend.repositories import project_repository
+from backend.repositories.project_repository import ProjectRepository, VersionConflictError
+
+
+def _increment_counter(base_dir, times):
+    repository = ProjectRepository(base_dir)
+    for _ in range(times):
+        with repository.lock("demo", "counter.json"):
+            count = repository.read_json_file("demo", "counter.json")
+            repository.write_json_file("demo", "counter.json", count + 1)
+
+
+class TestProjectRepository(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.repository = ProjectRepository(self.temp_dir)
+        self.repository.create_project("demo")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_read_write_delete(self):
+        self.assertIsNone(self.repository.read_json_file("demo", "resources.json"))
+        self.repository.write_json_file("demo", "resources.json", [{"name": "Ali"}])
+        self.assertEqual(self.repository.read_json_file("demo", "resources.json"), [{"name": "Ali"}])
+        self.assertTrue(self.repository.delete_file("demo", "resources.json"))
+        self.assertFalse(self.repository.delete_file("demo", "resources.json"))
+
+    def test_invalid_project_id(self):
+        for project_id in ("", "../other", "a/b"):
+            with self.assertRaises(ValueError):
+                self.repository.get_project_path(project_id)
+
+    def test_async_methods(self):
+        async def scenario():
+            await self.repository.write_json_file_async("demo", "allocations.json", [{"task_id": 1}])
+            # Concurrent reads run on worker threads and all see the same document
+            reads = await asyncio.gather(*(self.repository.read_json_file_async("demo", "allocations.json")
+                                           for _ in range(20)))
+            created = await self.repository.create_project_async("second")
+            projects = await self.repository.list_projects_async()
+            deleted = await self.repository.delete_file_async("demo", "allocations.json")
+            return reads, created, projects, deleted
+
+        reads, created, projects, deleted = asyncio.run(scenario())
+        self.assertTrue(all(read == [{"task_id": 1}] for read in reads))
+        self.assertTrue(created)
+        self.assertEqual(sorted(projects), ["demo", "second"])
+        self.assertTrue(deleted)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "demo", "allocations.json")))
+
+    def test_write_is_atomic_and_leaves_no_temp_files(self):
+        path = os.path.join(self.temp_dir, "demo", "resources.json")
+        self.repository.write_json_file("demo", "resources.json", [{"name": "Ali"}])
+        os.chmod(path, 0o640)
+        self.repository.write_json_file("demo", "resources.json", [{"name": "Sara"}])
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        self.assertFalse([name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')])
+
+        # A failed serialization leaves the previous file untouched
+        with self.assertRaises(TypeError):
+            self.repository.write_json_file("demo", "resources.json", [object()])
+        self.assertEqual(self.repository.read_json_file("demo", "resources.json"), [{"name": "Sara"}])
+        self.assertFalse([name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')])
+
+    def test_expected_version(self):
+        self.assertIsNone(self.repository.get_version("demo", "wbs_levels.json"))
+        with self.assertRaises(VersionConflictError):
+            self.repository.write_json_file("demo", "wbs_levels.json", [], expected_version='*')
+        first = self.repository.write_json_file("demo", "wbs_levels.json", [{"id": 1}])
+        data, version = self.repository.read_json_file_versioned("demo", "wbs_levels.json")
+        self.assertEqual((data, version), ([{"id": 1}], first))
+
+        second = self.repository.write_json_file("demo", "wbs_levels.json", [{"id": 2}], expected_version=first)
+        self.assertNotEqual(first, second)
+        # A writer still holding the first version has lost the race
+        with self.assertRaises(VersionConflictError) as context:
+            self.repository.write_json_file("demo", "wbs_levels.json", [{"id": 3}], expected_version=first)
+        self.assertEqual(context.exception.current, second)
+        with self.assertRaises(VersionConflictError):
+            self.repository.delete_file("demo", "wbs_levels.json", expected_version=first)
+        self.assertTrue(self.repository.delete_file("demo", "wbs_levels.json", expected_version=second))
+
+    def test_concurrent_conditional_writes(self):
+        version = self.repository.write_json_file("demo", "allocations.json", [])
+        barrier = threading.Barrier(8)
+        outcomes = []
+
+        def writer(n):
+            barrier.wait()
+            try:
+                self.repository.write_json_file("demo", "allocations.json", [n], expected_version=version)
+                outcomes.append(n)
+            except VersionConflictError:
+                pass
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Exactly one writer saw the version it read
+        self.assertEqual(len(outcomes), 1)
+        self.assertEqual(self.repository.read_json_file("demo", "allocations.json"), outcomes)
+
+    @unittest.skipIf(project_repository.fcntl is None, "flock() is not available")
+    def test_lock_across_processes(self):
+        self.repository.write_json_file("demo", "counter.json", 0)
+        processes = [multiprocessing.Process(target=_increment_counter, args=(self.temp_dir, 20)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(self.repository.read_json_file("demo", "counter.json"), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
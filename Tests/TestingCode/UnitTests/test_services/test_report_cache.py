@@ -0,0 +1,96 @@
+"""
+Unit tests for the backend report cache (ETag, conditional GET, compression)
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from backend.services.report_cache import ReportCache, choose_encoding, MIN_COMPRESS_BYTES
+
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ReportCache()
+        self.path = os.path.join(self.temp_dir, 'progress_report.json')
+        self.write({"tasks": [{"id": i, "name": f"Task {i}", "progress": i % 100} for i in range(200)]})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, data, bump_ns=0):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        if bump_ns:
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+    def test_body_is_cached_until_file_changes(self):
+        status, headers, body = self.cache.respond(self.path)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["tasks"][5]["name"], "Task 5")
+        with patch('backend.services.report_cache.load_json_cached') as load:
+            _, again_headers, again = self.cache.respond(self.path)
+        load.assert_not_called()
+        self.assertIs(again, body)
+        self.assertEqual(again_headers['ETag'], headers['ETag'])
+
+        self.write({"tasks": []}, bump_ns=10 ** 9)
+        _, new_headers, new_body = self.cache.respond(self.path)
+        self.assertEqual(json.loads(new_body), {"tasks": []})
+        self.assertNotEqual(new_headers['ETag'], headers['ETag'])
+
+    def test_conditional_get(self):
+        _, headers, _ = self.cache.respond(self.path)
+        status, not_modified_headers, body = self.cache.respond(self.path, if_none_match=headers['ETag'])
+        self.assertEqual((status, body), (304, b''))
+        self.assertEqual(not_modified_headers['ETag'], headers['ETag'])
+        self.assertEqual(self.cache.respond(self.path, if_none_match='W/' + headers['ETag'])[0], 304)
+        self.assertEqual(self.cache.respond(self.path, if_none_match='"other"')[0], 200)
+        self.assertEqual(self.cache.respond(self.path, if_modified_since=headers['Last-Modified'])[0], 304)
+        self.assertEqual(self.cache.respond(self.path, if_modified_since='Thu, 01 Jan 1970 00:00:00 GMT')[0], 200)
+        # If-None-Match wins over If-Modified-Since
+        self.assertEqual(self.cache.respond(self.path, if_none_match='"other"',
+                                            if_modified_since=headers['Last-Modified'])[0], 200)
+
+    def test_compressed_bodies(self):
+        _, plain_headers, plain = self.cache.respond(self.path)
+        self.assertGreater(len(plain), MIN_COMPRESS_BYTES)
+        self.assertNotIn('Content-Encoding', plain_headers)
+        status, headers, body = self.cache.respond(self.path, accept_encoding='gzip, deflate')
+        self.assertEqual((status, headers['Content-Encoding']), (200, 'gzip'))
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertIs(self.cache.respond(self.path, accept_encoding='gzip')[2], body)
+
+        # Each encoding has its own ETag, and any of them revalidates the report
+        self.assertEqual(headers['ETag'], plain_headers['ETag'][:-1] + '-gzip"')
+        status, not_modified_headers, _ = self.cache.respond(self.path, if_none_match=headers['ETag'])
+        self.assertEqual((status, not_modified_headers['ETag']), (304, plain_headers['ETag']))
+        status, not_modified_headers, _ = self.cache.respond(self.path, if_none_match=plain_headers['ETag'],
+                                                             accept_encoding='gzip')
+        self.assertEqual((status, not_modified_headers['ETag']), (304, headers['ETag']))
+        self.assertEqual(self.cache.respond(self.path, if_none_match=headers['ETag'][:-1] + '-zstd"')[0], 200)
+
+        self.write({"small": True}, bump_ns=10 ** 9)
+        _, headers, body = self.cache.respond(self.path, accept_encoding='gzip')
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(json.loads(body), {"small": True})
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('gzip;q=0.5, identity'), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0'))
+        self.assertIsNone(choose_encoding(None))
+        self.assertEqual(choose_encoding('*'), choose_encoding('br, gzip'))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.respond(os.path.join(self.temp_dir, 'missing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Unit tests for the SQLite project store and the JSON-to-SQLite import
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from backend.repositories.migrate_to_sqlite import migrate_projects
+from backend.repositories.project_repository import ProjectRepository
+from backend.repositories.project_store import VersionConflictError
+from backend.repositories.sqlite_repository import SQLiteProjectRepository
+
+
+class ProjectStoreBehaviour:
+    """Checks every ProjectStore implementation must pass; make_store() returns the store under test."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = self.make_store()
+        self.store.create_project("demo")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_replace_and_get_items(self):
+        self.assertEqual(self.store.get_items("demo", "wbs_levels"), ([], None))
+        levels = [{"id": "1", "name": "Root", "parent_id": None, "duration_days": None},
+                  {"id": "1.1", "name": "Design", "parent_id": "1", "duration_days": 5, "note": "kept"}]
+        version = self.store.replace_items("demo", "wbs_levels", levels)
+        self.assertEqual(self.store.get_items("demo", "wbs_levels"), (levels, version))
+        self.assertTrue(self.store.delete_items("demo", "wbs_levels"))
+        self.assertFalse(self.store.delete_items("demo", "wbs_levels"))
+        self.assertEqual(self.store.get_items("demo", "wbs_levels"), ([], None))
+
+    def test_item_updates_keep_order(self):
+        self.store.replace_items("demo", "resources", [{"id": "r1", "name": "Ali", "type": "dev"},
+                                                       {"id": "r2", "name": "Sara", "type": "qa"}])
+        self.store.upsert_item("demo", "resources", {"id": "r3", "name": "Omid", "type": "dev"})
+        self.store.upsert_item("demo", "resources", {"id": "r1", "name": "Ali R.", "type": "dev"})
+        patched = self.store.patch_item("demo", "resources", "r2", {"availability": 50})
+        self.assertEqual(patched, {"id": "r2", "name": "Sara", "type": "qa", "availability": 50})
+        self.assertIsNone(self.store.patch_item("demo", "resources", "missing", {"name": "x"}))
+        with self.assertRaises(ValueError):
+            self.store.patch_item("demo", "resources", "r2", {"id": "r9"})
+        self.assertTrue(self.store.delete_item("demo", "resources", "r3"))
+        self.assertFalse(self.store.delete_item("demo", "resources", "r3"))
+        items, _ = self.store.get_items("demo", "resources")
+        self.assertEqual([(item["id"], item["name"]) for item in items], [("r1", "Ali R."), ("r2", "Sara")])
+
+    def test_composite_keys_and_validation(self):
+        self.store.replace_items("demo", "allocations", [{"wbs_id": "1", "resource_id": "r1", "allocation_percentage": 50}])
+        validate = lambda item: dict(item, allocation_percentage=float(item["allocation_percentage"]))
+        patched = self.store.patch_item("demo", "allocations", ("1", "r1"), {"allocation_percentage": "75"}, validate)
+        self.assertEqual(patched["allocation_percentage"], 75.0)
+        self.assertEqual(self.store.get_items("demo", "allocations")[0], [patched])
+        with self.assertRaises(ValueError):
+            self.store.patch_item("demo", "allocations", "1", {})
+
+    def test_versions(self):
+        first = self.store.replace_items("demo", "allocations", [])
+        second = self.store.upsert_item("demo", "allocations", {"wbs_id": "1", "resource_id": "r1"})
+        self.assertNotEqual(first, second)
+        with self.assertRaises(VersionConflictError):
+            self.store.replace_items("demo", "allocations", [], expected_version=first)
+        self.store.replace_items("demo", "allocations", [], expected_version=second)
+        with self.assertRaises(VersionConflictError):
+            self.store.put_document("demo", "project_start_date", {"start_date": "2024-01-01"}, expected_version='*')
+        version = self.store.put_document("demo", "project_start_date", {"start_date": "2024-01-01"})
+        self.assertEqual(self.store.get_document("demo", "project_start_date"), ({"start_date": "2024-01-01"}, version))
+
+    def test_query_items(self):
+        self.store.replace_items("demo", "wbs_levels", [
+            {"id": str(i), "name": f"Level {i}", "parent_id": str(i % 3) if i else None} for i in range(10)])
+        pages, cursor = [], None
+        while True:
+            page, _ = self.store.query_items("demo", "wbs_levels", cursor=cursor, limit=4)
+            pages.append([item["id"] for item in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, [["0", "1", "2", "3"], ["4", "5", "6", "7"], ["8", "9"]])
+
+        page, version = self.store.query_items("demo", "wbs_levels", filters={"parent_id": 1}, fields=["id"], limit=2)
+        self.assertEqual(page["items"], [{"id": "1"}, {"id": "4"}])
+        self.assertEqual(version, self.store.get_items("demo", "wbs_levels")[1])
+        page, _ = self.store.query_items("demo", "wbs_levels", filters={"parent_id": "1"}, cursor=page["next_cursor"])
+        self.assertEqual([item["id"] for item in page["items"]], ["7"])
+        self.assertIsNone(page["next_cursor"])
+
+        # An item updated in place keeps its place in the listing
+        self.store.patch_item("demo", "wbs_levels", "4", {"parent_id": "2"})
+        page, _ = self.store.query_items("demo", "wbs_levels", filters={"parent_id": "2"}, fields=["id"])
+        self.assertEqual(page["items"], [{"id": "2"}, {"id": "4"}, {"id": "5"}, {"id": "8"}])
+
+        self.store.replace_items("demo", "allocations", [
+            {"wbs_id": "1", "resource_id": "r1"}, {"wbs_id": "2", "resource_id": "r1"}, {"wbs_id": "1", "resource_id": "r2"}])
+        page, _ = self.store.query_items("demo", "allocations", filters={"wbs_id": "1", "resource_id": "r2"})
+        self.assertEqual(page["items"], [{"wbs_id": "1", "resource_id": "r2"}])
+        self.assertEqual(self.store.query_items("demo", "resources")[0], {"items": [], "next_cursor": None})
+
+        for kwargs in ({"filters": {"name": "x"}}, {"cursor": "abc"}, {"cursor": "-1"}, {"limit": 0}):
+            with self.assertRaises(ValueError):
+                self.store.query_items("demo", "wbs_levels", **kwargs)
+
+    def test_projects(self):
+        self.assertFalse(self.store.create_project("demo"))
+        self.assertTrue(self.store.create_project("other"))
+        self.assertEqual(sorted(self.store.list_projects()), ["demo", "other"])
+        self.assertTrue(self.store.delete_project("other"))
+        self.assertEqual(self.store.list_projects(), ["demo"])
+        with self.assertRaises(ValueError):
+            self.store.create_project("../escape")
+
+
+class TestJSONProjectStore(ProjectStoreBehaviour, unittest.TestCase):
+    def make_store(self):
+        return ProjectRepository(self.temp_dir)
+
+    def test_query_index_cache_is_bounded(self):
+        from backend.repositories.project_repository import MAX_CACHED_INDEXES
+        for n in range(MAX_CACHED_INDEXES + 5):
+            project_id = f"p{n}"
+            self.store.create_project(project_id)
+            self.store.replace_items(project_id, "wbs_levels", [{"id": "1", "parent_id": None}])
+            self.store.query_items(project_id, "wbs_levels", filters={"parent_id": "x"})
+        self.assertEqual(len(self.store._indexes), MAX_CACHED_INDEXES)
+        self.assertNotIn(self.store._file_path("p0", "wbs_levels.json"), self.store._indexes)
+
+
+class TestSQLiteProjectStore(ProjectStoreBehaviour, unittest.TestCase):
+    def make_store(self):
+        return SQLiteProjectRepository(os.path.join(self.temp_dir, "projects.db"))
+
+    def tearDown(self):
+        self.store.close()
+        super().tearDown()
+
+    def test_wal_mode_and_indexes(self):
+        conn = self.store._connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT data FROM wbs_levels WHERE project_id = ? AND id = ?",
+                            ("demo", "1")).fetchall()
+        self.assertTrue(any("INDEX" in row[-1] for row in plan))
+
+    def test_filtered_query_uses_index(self):
+        plan = self.store._connection().execute(
+            "EXPLAIN QUERY PLAN SELECT position, data FROM allocations WHERE project_id = ? AND resource_id = ? "
+            "AND position >= ? ORDER BY position LIMIT ?", ("demo", "r1", 0, 10)).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("allocations_resource_id_position", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    def test_concurrent_upserts(self):
+        def writer(n):
+            for i in range(20):
+                self.store.upsert_item("demo", "wbs_levels", {"id": f"{n}.{i}", "name": "Task", "parent_id": str(n)})
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.store.get_items("demo", "wbs_levels")[0]), 80)
+
+
+class TestMigrateToSQLite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_migrate_projects(self):
+        source = ProjectRepository(os.path.join(self.temp_dir, "data"))
+        os.makedirs(source.base_dir)
+        source.create_project("alpha")
+        source.create_project("empty")
+        levels = [{"id": "1", "name": "Root", "parent_id": None}]
+        source.replace_items("alpha", "wbs_levels", levels)
+        source.put_document("alpha", "project_start_date", {"start_date": "2024-02-01"})
+
+        target = SQLiteProjectRepository(os.path.join(self.temp_dir, "projects.db"))
+        try:
+            imported = migrate_projects(source, target)
+            # Running it again is harmless
+            migrate_projects(source, target)
+            self.assertEqual(imported, {"alpha": ["wbs_levels", "project_start_date"], "empty": []})
+            self.assertEqual(sorted(target.list_projects()), ["alpha", "empty"])
+            self.assertEqual(target.get_items("alpha", "wbs_levels")[0], levels)
+            self.assertEqual(target.get_document("alpha", "project_start_date")[0], {"start_date": "2024-02-01"})
+        finally:
+            target.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import json
 import os
 from backend.api_inputs import router as inputs_router
 from backend.api_setup import router as setup_router
+from backend.services.report_cache import ReportCache
 
 app = FastAPI()
 
@@ -18,32 +18,45 @@ app.add_middleware(
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'SystemInputs', 'system_generated')
 
-def load_json(filename: str):
+report_cache = ReportCache()
+
+def report_response(filename: str, request: Request) -> Response:
+    """
+    Serve a report file from the report cache: ETag/Last-Modified validators,
+    304 for conditional GETs that still match, and a pre-compressed body for
+    clients that accept one.
+    """
     path = os.path.join(DATA_DIR, filename)
-    if not os.path.exists(path):
+    try:
+        status, headers, body = report_cache.respond(
+            path,
+            if_none_match=request.headers.get('if-none-match'),
+            if_modified_since=request.headers.get('if-modified-since'),
+            accept_encoding=request.headers.get('accept-encoding'),
+        )
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"{filename} not found")
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return Response(content=body, status_code=status, headers=headers)
 
 @app.get("/api/progress_report")
-def get_progress_report():
-    return load_json('progress_report.json')
+def get_progress_report(request: Request):
+    return report_response('progress_report.json', request)
 
 @app.get("/api/priority_urgency_report")
-def get_priority_urgency_report():
-    return load_json('priority_urgency_report.json')
+def get_priority_urgency_report(request: Request):
+    return report_response('priority_urgency_report.json', request)
 
 @app.get("/api/cost_management_report")
-def get_cost_management_report():
-    return load_json('cost_management_report.json')
+def get_cost_management_report(request: Request):
+    return report_response('cost_management_report.json', request)
 
 @app.get("/api/resource_allocation_report")
-def get_resource_allocation_report():
-    return load_json('resource_allocation_report.json')
+def get_resource_allocation_report(request: Request):
+    return report_response('resource_allocation_report.json', request)
 
 @app.get("/api/risk_management_report")
-def get_risk_management_report():
-    return load_json('risk_management_report.json')
+def get_risk_management_report(request: Request):
+    return report_response('risk_management_report.json', request)
 
 app.include_router(inputs_router)
 app.include_router(setup_router)
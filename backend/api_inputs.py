@@ -1,12 +1,17 @@
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from typing import Any, Dict, List, Optional
 import os
 import json
-from backend.repositories.project_repository import ProjectRepository
+from backend.repositories.project_repository import ProjectRepository, VersionConflictError
+from backend.repositories.project_store import (
+    DEFAULT_PAGE_SIZE as DEFAULT_ITEMS_PAGE_SIZE, MAX_PAGE_SIZE as MAX_ITEMS_PAGE_SIZE
+)
+from backend.repositories.sqlite_repository import SQLiteProjectRepository
 from backend.services.project_service import ProjectService
-from project_management.modules.gantt_chart_data import GanttChartData
-from fastapi.responses import JSONResponse
+from project_management.modules.main_modules.gantt_chart_data import GanttChartData, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from fastapi.responses import JSONResponse, StreamingResponse
 from backend.models import WBSLevel, Resource, Allocation, ProjectStartDate
 
 router = APIRouter(prefix="/api/v1")
@@ -16,21 +21,28 @@ logging.basicConfig(level=logging.INFO)
 
 BASE_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'SystemInputs', 'user_inputs')
 
+# PM_STORAGE_BACKEND=sqlite keeps project inputs in one SQLite database
+# (PM_SQLITE_PATH) instead of JSON files; import existing projects with
+# python -m backend.repositories.migrate_to_sqlite
+STORAGE_BACKEND = os.environ.get('PM_STORAGE_BACKEND', 'json')
+SQLITE_PATH = os.environ.get('PM_SQLITE_PATH', os.path.join(BASE_DATA_DIR, 'projects.db'))
+
 project_repository = ProjectRepository(BASE_DATA_DIR)
-project_service = ProjectService(project_repository)
+project_store = SQLiteProjectRepository(SQLITE_PATH) if STORAGE_BACKEND == 'sqlite' else project_repository
+project_service = ProjectService(project_repository, project_store)
 
 @router.get("/projects")
-def list_projects():
+async def list_projects():
     try:
-        return project_service.list_projects()
+        return await project_service.list_projects_async()
     except Exception as e:
         logger.error(f"Error listing projects: {e}")
         raise HTTPException(status_code=500, detail="Failed to list projects")
 
 @router.post("/projects")
-def create_project(project_id: str = Query(..., description="Unique project identifier")):
+async def create_project(project_id: str = Query(..., description="Unique project identifier")):
     try:
-        created = project_service.create_project(project_id)
+        created = await project_service.create_project_async(project_id)
         if not created:
             return {"message": f"Project '{project_id}' already exists."}
         logger.info(f"Project created: {project_id}")
@@ -40,9 +52,9 @@ def create_project(project_id: str = Query(..., description="Unique project iden
         raise HTTPException(status_code=500, detail="Failed to create project")
 
 @router.delete("/projects")
-def delete_project(project_id: str = Query(..., description="Unique project identifier")):
+async def delete_project(project_id: str = Query(..., description="Unique project identifier")):
     try:
-        deleted = project_service.delete_project(project_id)
+        deleted = await project_service.delete_project_async(project_id)
         if not deleted:
             return {"message": f"Project '{project_id}' does not exist."}
         logger.info(f"Project deleted: {project_id}")
@@ -51,116 +63,329 @@ def delete_project(project_id: str = Query(..., description="Unique project iden
         logger.error(f"Error deleting project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to delete project")
 
-@router.get("/user_inputs/wbs_levels")
-def get_wbs_levels(project_id: str = Query(..., description="Project identifier")):
+# Inputs are versioned by the store: GETs return the version as the ETag, and
+# a write or delete sent with If-Match fails with 412 if the data has changed
+# since, instead of silently overwriting another client's update.
+
+def _expected_version(if_match: Optional[str]) -> Optional[str]:
+    if if_match is None:
+        return None
+    tag = if_match.strip()
+    return tag if tag == '*' else tag.strip('"')
+
+def _set_etag(response: Response, version: Optional[str]) -> None:
+    if version is not None:
+        response.headers["ETag"] = f'"{version}"'
+
+async def _list_items(response: Response, project_id: str, collection: str, filters: Optional[Dict[str, Any]],
+                      fields: Optional[str], cursor: Optional[str], limit: int, output: str, label: str):
+    """
+    One page of a collection as {"items": [...], "next_cursor": ...}, or with
+    format=ndjson the whole (filtered) collection streamed as one item per line.
+    """
+    if output not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
     try:
-        return project_service.get_wbs_levels(project_id)
+        if output == "ndjson":
+            chunks = await project_service.export_ndjson_async(project_id, collection, filters=filters,
+                                                               fields=field_list)
+            return StreamingResponse(chunks, media_type="application/x-ndjson")
+        page, version = await project_service.query_items_async(project_id, collection, filters=filters,
+                                                                fields=field_list, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error getting WBS levels for project '{project_id}': {e}")
-        raise HTTPException(status_code=500, detail="Failed to get WBS levels")
+        logger.error(f"Error getting {label} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get {label}")
+    _set_etag(response, version)
+    return page
+
+@router.get("/user_inputs/wbs_levels")
+async def get_wbs_levels(response: Response, project_id: str = Query(..., description="Project identifier"),
+                         parent_id: Optional[str] = Query(None, description="Only children of this WBS level"),
+                         fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                         cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                         limit: int = Query(DEFAULT_ITEMS_PAGE_SIZE, ge=1, le=MAX_ITEMS_PAGE_SIZE),
+                         output: str = Query("json", alias="format",
+                                             description="json (one page) or ndjson (everything)")):
+    return await _list_items(response, project_id, 'wbs_levels', {'parent_id': parent_id},
+                             fields, cursor, limit, output, "WBS levels")
 
 @router.post("/user_inputs/wbs_levels")
-def save_wbs_levels(levels: List[WBSLevel], project_id: str = Query(..., description="Project identifier")):
+async def save_wbs_levels(levels: List[WBSLevel], response: Response, project_id: str = Query(..., description="Project identifier"),
+                          if_match: Optional[str] = Header(None)):
     try:
-        project_service.save_wbs_levels(project_id, levels)
+        version = await project_service.replace_items_async(project_id, 'wbs_levels', levels, _expected_version(if_match))
+        _set_etag(response, version)
         logger.info(f"WBS levels saved for project '{project_id}'")
         return {"message": "WBS levels saved successfully"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error saving WBS levels for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to save WBS levels")
 
 @router.delete("/user_inputs/wbs_levels")
-def delete_wbs_levels(project_id: str = Query(..., description="Project identifier")):
+async def delete_wbs_levels(project_id: str = Query(..., description="Project identifier"),
+                            if_match: Optional[str] = Header(None)):
     try:
-        deleted = project_service.delete_wbs_levels(project_id)
+        deleted = await project_service.delete_items_async(project_id, 'wbs_levels', _expected_version(if_match))
         if deleted:
             logger.info(f"WBS levels deleted for project '{project_id}'")
             return {"message": "WBS levels deleted successfully"}
         return {"message": "WBS levels file not found"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error deleting WBS levels for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to delete WBS levels")
 
-@router.get("/user_inputs/resources")
-def get_resources(project_id: str = Query(..., description="Project identifier")):
+@router.put("/user_inputs/wbs_levels/{level_id}")
+async def put_wbs_level(level: WBSLevel, level_id: str, response: Response,
+                        project_id: str = Query(..., description="Project identifier")):
+    if level.id != level_id:
+        raise HTTPException(status_code=400, detail="Level id does not match the URL")
     try:
-        return project_service.get_resources(project_id)
+        version = await project_service.upsert_item_async(project_id, 'wbs_levels', level.dict())
     except Exception as e:
-        logger.error(f"Error getting resources for project '{project_id}': {e}")
-        raise HTTPException(status_code=500, detail="Failed to get resources")
+        logger.error(f"Error saving WBS level {level_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to save WBS level")
+    _set_etag(response, version)
+    return {"message": "WBS level saved successfully"}
+
+@router.patch("/user_inputs/wbs_levels/{level_id}")
+async def patch_wbs_level(level_id: str, changes: Dict[str, Any] = Body(...),
+                          project_id: str = Query(..., description="Project identifier")):
+    try:
+        item = await project_service.patch_item_async(project_id, 'wbs_levels', level_id, changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error updating WBS level {level_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to update WBS level")
+    if item is None:
+        raise HTTPException(status_code=404, detail="WBS level not found")
+    return item
+
+@router.delete("/user_inputs/wbs_levels/{level_id}")
+async def delete_wbs_level(level_id: str, project_id: str = Query(..., description="Project identifier")):
+    try:
+        deleted = await project_service.delete_item_async(project_id, 'wbs_levels', level_id)
+    except Exception as e:
+        logger.error(f"Error deleting WBS level {level_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete WBS level")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="WBS level not found")
+    return {"message": "WBS level deleted successfully"}
+
+@router.get("/user_inputs/resources")
+async def get_resources(response: Response, project_id: str = Query(..., description="Project identifier"),
+                        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                        limit: int = Query(DEFAULT_ITEMS_PAGE_SIZE, ge=1, le=MAX_ITEMS_PAGE_SIZE),
+                        output: str = Query("json", alias="format",
+                                            description="json (one page) or ndjson (everything)")):
+    return await _list_items(response, project_id, 'resources', None,
+                             fields, cursor, limit, output, "resources")
 
 @router.post("/user_inputs/resources")
-def save_resources(resources: List[Resource], project_id: str = Query(..., description="Project identifier")):
+async def save_resources(resources: List[Resource], response: Response, project_id: str = Query(..., description="Project identifier"),
+                         if_match: Optional[str] = Header(None)):
     try:
-        project_service.save_resources(project_id, resources)
+        version = await project_service.replace_items_async(project_id, 'resources', resources, _expected_version(if_match))
+        _set_etag(response, version)
         logger.info(f"Resources saved for project '{project_id}'")
         return {"message": "Resources saved successfully"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error saving resources for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to save resources")
 
 @router.delete("/user_inputs/resources")
-def delete_resources(project_id: str = Query(..., description="Project identifier")):
+async def delete_resources(project_id: str = Query(..., description="Project identifier"),
+                           if_match: Optional[str] = Header(None)):
     try:
-        deleted = project_service.delete_resources(project_id)
+        deleted = await project_service.delete_items_async(project_id, 'resources', _expected_version(if_match))
         if deleted:
             logger.info(f"Resources deleted for project '{project_id}'")
             return {"message": "Resources deleted successfully"}
         return {"message": "Resources file not found"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error deleting resources for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to delete resources")
 
-@router.get("/user_inputs/allocations")
-def get_allocations(project_id: str = Query(..., description="Project identifier")):
+@router.put("/user_inputs/resources/{resource_id}")
+async def put_resource(resource: Resource, resource_id: str, response: Response,
+                       project_id: str = Query(..., description="Project identifier")):
+    if resource.id != resource_id:
+        raise HTTPException(status_code=400, detail="Resource id does not match the URL")
+    try:
+        version = await project_service.upsert_item_async(project_id, 'resources', resource.dict())
+    except Exception as e:
+        logger.error(f"Error saving resource {resource_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to save resource")
+    _set_etag(response, version)
+    return {"message": "Resource saved successfully"}
+
+@router.patch("/user_inputs/resources/{resource_id}")
+async def patch_resource(resource_id: str, changes: Dict[str, Any] = Body(...),
+                         project_id: str = Query(..., description="Project identifier")):
     try:
-        return project_service.get_allocations(project_id)
+        item = await project_service.patch_item_async(project_id, 'resources', resource_id, changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        logger.error(f"Error getting allocations for project '{project_id}': {e}")
-        raise HTTPException(status_code=500, detail="Failed to get allocations")
+        logger.error(f"Error updating resource {resource_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to update resource")
+    if item is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return item
+
+@router.delete("/user_inputs/resources/{resource_id}")
+async def delete_resource(resource_id: str, project_id: str = Query(..., description="Project identifier")):
+    try:
+        deleted = await project_service.delete_item_async(project_id, 'resources', resource_id)
+    except Exception as e:
+        logger.error(f"Error deleting resource {resource_id} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete resource")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return {"message": "Resource deleted successfully"}
+
+@router.get("/user_inputs/allocations")
+async def get_allocations(response: Response, project_id: str = Query(..., description="Project identifier"),
+                          wbs_id: Optional[str] = Query(None, description="Only allocations to this WBS level"),
+                          resource_id: Optional[str] = Query(None, description="Only allocations of this resource"),
+                          fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                          cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                          limit: int = Query(DEFAULT_ITEMS_PAGE_SIZE, ge=1, le=MAX_ITEMS_PAGE_SIZE),
+                          output: str = Query("json", alias="format",
+                                              description="json (one page) or ndjson (everything)")):
+    return await _list_items(response, project_id, 'allocations', {'wbs_id': wbs_id, 'resource_id': resource_id},
+                             fields, cursor, limit, output, "allocations")
 
 @router.post("/user_inputs/allocations")
-def save_allocations(allocations: List[Allocation], project_id: str = Query(..., description="Project identifier")):
+async def save_allocations(allocations: List[Allocation], response: Response, project_id: str = Query(..., description="Project identifier"),
+                           if_match: Optional[str] = Header(None)):
     try:
-        project_service.save_allocations(project_id, allocations)
+        version = await project_service.replace_items_async(project_id, 'allocations', allocations, _expected_version(if_match))
+        _set_etag(response, version)
         logger.info(f"Allocations saved for project '{project_id}'")
         return {"message": "Allocations saved successfully"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error saving allocations for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to save allocations")
 
 @router.delete("/user_inputs/allocations")
-def delete_allocations(project_id: str = Query(..., description="Project identifier")):
+async def delete_allocations(project_id: str = Query(..., description="Project identifier"),
+                             if_match: Optional[str] = Header(None)):
     try:
-        deleted = project_service.delete_allocations(project_id)
+        deleted = await project_service.delete_items_async(project_id, 'allocations', _expected_version(if_match))
         if deleted:
             logger.info(f"Allocations deleted for project '{project_id}'")
             return {"message": "Allocations deleted successfully"}
         return {"message": "Allocations file not found"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error deleting allocations for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to delete allocations")
 
+@router.put("/user_inputs/allocations/{wbs_id}/{resource_id}")
+async def put_allocation(allocation: Allocation, wbs_id: str, resource_id: str, response: Response,
+                         project_id: str = Query(..., description="Project identifier")):
+    if (allocation.wbs_id, allocation.resource_id) != (wbs_id, resource_id):
+        raise HTTPException(status_code=400, detail="Allocation wbs_id/resource_id do not match the URL")
+    try:
+        version = await project_service.upsert_item_async(project_id, 'allocations', allocation.dict())
+    except Exception as e:
+        logger.error(f"Error saving allocation {(wbs_id, resource_id)} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to save allocation")
+    _set_etag(response, version)
+    return {"message": "Allocation saved successfully"}
+
+@router.patch("/user_inputs/allocations/{wbs_id}/{resource_id}")
+async def patch_allocation(wbs_id: str, resource_id: str, changes: Dict[str, Any] = Body(...),
+                           project_id: str = Query(..., description="Project identifier")):
+    try:
+        item = await project_service.patch_item_async(project_id, 'allocations', (wbs_id, resource_id), changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error updating allocation {(wbs_id, resource_id)} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to update allocation")
+    if item is None:
+        raise HTTPException(status_code=404, detail="Allocation not found")
+    return item
+
+@router.delete("/user_inputs/allocations/{wbs_id}/{resource_id}")
+async def delete_allocation(wbs_id: str, resource_id: str, project_id: str = Query(..., description="Project identifier")):
+    try:
+        deleted = await project_service.delete_item_async(project_id, 'allocations', (wbs_id, resource_id))
+    except Exception as e:
+        logger.error(f"Error deleting allocation {(wbs_id, resource_id)} for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete allocation")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Allocation not found")
+    return {"message": "Allocation deleted successfully"}
+
 @router.get("/user_inputs/project_start_date")
-def get_project_start_date(project_id: str = Query(..., description="Project identifier")):
+async def get_project_start_date(response: Response, project_id: str = Query(..., description="Project identifier")):
     try:
-        return project_service.get_project_start_date(project_id)
+        data, version = await project_service.get_project_start_date_async(project_id)
+        _set_etag(response, version)
+        return data
     except Exception as e:
         logger.error(f"Error getting project start date for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to get project start date")
 
 @router.post("/user_inputs/project_start_date")
-def save_project_start_date(start_date: ProjectStartDate, project_id: str = Query(..., description="Project identifier")):
+async def save_project_start_date(start_date: ProjectStartDate, response: Response,
+                                  project_id: str = Query(..., description="Project identifier"),
+                                  if_match: Optional[str] = Header(None)):
     try:
-        project_service.save_project_start_date(project_id, start_date)
+        version = await project_service.save_project_start_date_async(project_id, start_date,
+                                                                      _expected_version(if_match))
+        _set_etag(response, version)
         logger.info(f"Project start date saved for project '{project_id}'")
         return {"message": "Project start date saved successfully"}
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         logger.error(f"Error saving project start date for project '{project_id}': {e}")
         raise HTTPException(status_code=500, detail="Failed to save project start date")
 
+@router.get("/user_inputs/gantt")
+async def get_gantt(project_id: str = Query(..., description="Project identifier"),
+                    start: Optional[str] = Query(None, description="Window start date (YYYY-MM-DD)"),
+                    end: Optional[str] = Query(None, description="Window end date (YYYY-MM-DD)"),
+                    root_id: Optional[str] = Query(None, description="Only this task and its subtasks"),
+                    max_depth: Optional[int] = Query(None, ge=0, description="Deepest level below root_id to include"),
+                    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    try:
+        return await project_service.get_gantt_page_async(project_id, start=start, end=end, root_id=root_id,
+                                                          max_depth=max_depth, cursor=cursor, limit=limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting Gantt data for project '{project_id}': {e}")
+        raise HTTPException(status_code=500, detail="Failed to get Gantt data")
+
 @router.post("/user_inputs/aggregate_wbs")
-def aggregate_wbs(project_id: str = Query(..., description="Project identifier")):
+async def aggregate_wbs(project_id: str = Query(..., description="Project identifier")):
+    # Reading every part and rebuilding the Gantt data is blocking work; keep it off the event loop
+    return await asyncio.to_thread(_aggregate_wbs, project_id)
+
+def _aggregate_wbs(project_id: str):
     import glob
     try:
         project_path = project_repository.get_project_path(project_id)
@@ -178,10 +403,8 @@ def aggregate_wbs(project_id: str = Query(..., description="Project identifier")
                 logger.error(f"Failed to read {filepath}: {e}")
                 return {"message": f"Failed to read {filepath}: {str(e)}", "success": False}
         # Save aggregated WBS to detailed_wbs.json
-        detailed_wbs_path = os.path.join(project_path, 'detailed_wbs.json')
         try:
-            with open(detailed_wbs_path, 'w', encoding='utf-8') as f:
-                json.dump(aggregated_wbs, f, ensure_ascii=False, indent=2)
+            project_repository.write_json_file(project_id, 'detailed_wbs.json', aggregated_wbs)
         except Exception as e:
             logger.error(f"Failed to save detailed_wbs.json: {e}")
             return {"message": f"Failed to save detailed_wbs.json: {str(e)}", "success": False}
@@ -192,8 +415,7 @@ def aggregate_wbs(project_id: str = Query(..., description="Project identifier")
         gantt_data = gantt_generator.build_gantt_data()
         gantt_output_path = os.path.join(project_path, 'gantt_chart_data.json')
         try:
-            with open(gantt_output_path, 'w', encoding='utf-8') as gf:
-                json.dump(gantt_data, gf, indent=2, ensure_ascii=False)
+            project_repository.write_json_file(project_id, 'gantt_chart_data.json', gantt_data)
             logger.info(f"Gantt chart data saved to {gantt_output_path}")
         except Exception as ge:
             logger.error(f"Failed to save Gantt chart data: {ge}")
@@ -1,6 +1,8 @@
+import asyncio
 import logging
 from fastapi import APIRouter, UploadFile, File, HTTPException
 import os
+from backend.services.job_manager import JobManager
 from backend.services.setup_service import SetupService
 
 router = APIRouter(prefix="/api/v1")
@@ -12,51 +14,59 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROJECT_DIR = BASE_DIR  # Assuming project root is one level above backend/
 
 setup_service = SetupService(PROJECT_DIR)
+# git init, venv creation and pip install take seconds to minutes; they run as
+# background jobs and the client polls /setup/jobs/{job_id}
+job_manager = JobManager()
 
-@router.post("/setup/init_git")
+def start_job(name: str, func):
+    job = job_manager.submit(name, func)
+    return {
+        "message": f"{name} started",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{router.prefix}/setup/jobs/{job.id}",
+    }
+
+@router.post("/setup/init_git", status_code=202)
 def init_git_repo():
-    try:
-        message = setup_service.init_git_repo()
-        return {"message": message}
-    except Exception as e:
-        logger.error(f"Git init failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Git init failed: {str(e)}")
+    return start_job("init_git", setup_service.init_git_repo)
 
 @router.post("/setup/create_gitignore")
-def create_gitignore():
+async def create_gitignore():
     try:
-        message = setup_service.create_gitignore()
+        message = await asyncio.to_thread(setup_service.create_gitignore)
         return {"message": message}
     except Exception as e:
         logger.error(f"Create gitignore failed: {e}")
         raise HTTPException(status_code=500, detail=f"Create gitignore failed: {str(e)}")
 
 @router.post("/setup/create_requirements")
-def create_requirements():
+async def create_requirements():
     try:
-        message = setup_service.create_requirements()
+        message = await asyncio.to_thread(setup_service.create_requirements)
         return {"message": message}
     except Exception as e:
         logger.error(f"Create requirements failed: {e}")
         raise HTTPException(status_code=500, detail=f"Create requirements failed: {str(e)}")
 
-@router.post("/setup/create_virtualenv")
+@router.post("/setup/create_virtualenv", status_code=202)
 def create_virtualenv():
-    try:
-        message = setup_service.create_virtualenv()
-        return {"message": message}
-    except Exception as e:
-        logger.error(f"Create virtualenv failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Create virtualenv failed: {str(e)}")
+    return start_job("create_virtualenv", setup_service.create_virtualenv)
 
-@router.post("/setup/install_dependencies")
+@router.post("/setup/install_dependencies", status_code=202)
 def install_dependencies():
-    try:
-        message = setup_service.install_dependencies()
-        return {"message": message}
-    except Exception as e:
-        logger.error(f"Install dependencies failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Install dependencies failed: {str(e)}")
+    return start_job("install_dependencies", setup_service.install_dependencies)
+
+@router.get("/setup/jobs")
+def list_jobs():
+    return [job.to_dict() for job in job_manager.list_jobs()]
+
+@router.get("/setup/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
 
 @router.post("/upload/json_file")
 async def upload_json_file(file: UploadFile = File(...), target_dir: str = ""):
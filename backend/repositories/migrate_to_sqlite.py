@@ -0,0 +1,66 @@
+"""
+Import project inputs from the JSON project directories into an SQLite store.
+
+Usage:
+    python -m backend.repositories.migrate_to_sqlite --data-dir SystemInputs/user_inputs [--db projects.db]
+"""
+
+import os
+import argparse
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from backend.repositories.project_repository import ProjectRepository
+from backend.repositories.project_store import COLLECTIONS, START_DATE_DOCUMENT, ProjectStore
+from backend.repositories.sqlite_repository import SQLiteProjectRepository
+
+logger = logging.getLogger("backend.migrate_to_sqlite")
+
+
+def migrate_projects(source: ProjectStore, target: ProjectStore,
+                     project_ids: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    Copy projects and their inputs from one store to another.
+
+    Collections and documents present in the source replace those in the
+    target, so running the import again brings the target up to date.
+
+    Returns:
+        project_id -> names of the collections and documents imported
+    """
+    imported = {}
+    for project_id in (source.list_projects() if project_ids is None else project_ids):
+        target.create_project(project_id)
+        names = []
+        for name in COLLECTIONS:
+            items, version = source.get_items(project_id, name)
+            if version is not None:
+                target.replace_items(project_id, name, items)
+                names.append(name)
+        start_date, version = source.get_document(project_id, START_DATE_DOCUMENT)
+        if version is not None:
+            target.put_document(project_id, START_DATE_DOCUMENT, start_date)
+            names.append(START_DATE_DOCUMENT)
+        imported[project_id] = names
+        logger.info(f"Imported project '{project_id}': {', '.join(names) or 'no inputs'}")
+    return imported
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import JSON project inputs into SQLite")
+    parser.add_argument("--data-dir", required=True, help="Directory holding one directory per project")
+    parser.add_argument("--db", help="SQLite database (default: projects.db in the data directory)")
+    parser.add_argument("--project", action="append", dest="projects", help="Only this project (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    target = SQLiteProjectRepository(args.db or os.path.join(args.data_dir, 'projects.db'))
+    try:
+        imported = migrate_projects(ProjectRepository(args.data_dir), target, args.projects)
+    finally:
+        target.close()
+    print(f"Imported {len(imported)} project(s) into {target.db_path}")
+
+
+if __name__ == "__main__":
+    main()
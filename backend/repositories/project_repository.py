@@ -1,16 +1,109 @@
 import os
 import json
+import bisect
+import stat
 import shutil
-from typing import List, Optional
+import asyncio
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # no flock() on Windows; writes are then only serialized within one process
+    fcntl = None
+
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json, thaw
+from backend.repositories.project_store import (
+    DEFAULT_PAGE_SIZE, Collection, ProjectStore, VersionConflictError, check_query, get_collection, merge_changes,
+    normalize_key, parse_cursor, project_fields, validate_project_id
+)
+
+# Collections whose ItemIndex is kept; each entry also pins its parsed document,
+# so the bound keeps this cache from holding documents the JSON cache evicted
+MAX_CACHED_INDEXES = 16
+
+
+def _file_version(path: str) -> Optional[str]:
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # Every write renames a new file into place, so the inode changes along with mtime and size
+    return f"{info.st_ino:x}-{info.st_mtime_ns:x}-{info.st_size:x}"
+
+
+def _fsync_directory(directory: str) -> None:
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ItemIndex:
+    """
+    Positions of a collection's items by the value of each indexed field,
+    built once per loaded document so filtered pages do not scan the list.
+    """
+
+    def __init__(self, collection: Collection, items: List[dict]):
+        self.positions: Dict[str, Dict[str, List[int]]] = {field: {} for field in collection.indexed}
+        for position, item in enumerate(items):
+            for field, index in self.positions.items():
+                value = item.get(field)
+                if value is not None:
+                    index.setdefault(str(value), []).append(position)
+
+    def select(self, items: List[dict], filters: Dict[str, str], start: int, count: int) -> List[int]:
+        """Positions of up to count matching items from position start on."""
+        if not filters:
+            return list(range(start, min(len(items), start + count)))
+        # Walk the shortest candidate list and check the other filters on the items themselves
+        candidates = min((self.positions[field].get(value, []) for field, value in filters.items()), key=len)
+        found = []
+        for position in candidates[bisect.bisect_left(candidates, start):]:
+            item = items[position]
+            if all(str(item.get(field)) == value for field, value in filters.items()):
+                found.append(position)
+                if len(found) == count:
+                    break
+        return found
+
+
+class ProjectRepository(ProjectStore):
+    """
+    JSON files per project under base_dir.
+
+    Writes are atomic: the document goes to a temporary file in the same
+    directory, is fsynced and renamed over the target, so readers see either
+    the old or the new file, never a partial one. Writers of the same file are
+    serialized by a per-file thread lock and, where flock() is available, an
+    exclusive lock on a sidecar .lock file, which also covers several server
+    processes sharing the data directory.
+
+    Every file has an opaque version string; passing expected_version to a
+    write or delete makes it fail with VersionConflictError if the file has
+    changed since that version was read ('*' only requires that it exists).
+
+    As a ProjectStore, each collection and document is one file
+    (<name>.json), so single-item updates still rewrite the whole file.
+    """
 
-class ProjectRepository:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        # path -> (collection document, ItemIndex built from it), least recently used first
+        self._indexes = OrderedDict()
+        self._indexes_guard = threading.Lock()
 
     def get_project_path(self, project_id: str) -> str:
-        if not project_id or any(c in project_id for c in ['..', '/', '\\']):
-            raise ValueError("Invalid project_id")
-        return os.path.join(self.base_dir, project_id)
+        return os.path.join(self.base_dir, validate_project_id(project_id))
 
     def list_projects(self) -> List[str]:
         if not os.path.exists(self.base_dir):
@@ -31,21 +124,231 @@ class ProjectRepository:
         shutil.rmtree(path)
         return True
 
+    def _file_path(self, project_id: str, filename: str) -> str:
+        return os.path.join(self.get_project_path(project_id), filename)
+
+    @contextmanager
+    def lock(self, project_id: str, filename: str) -> Iterator[None]:
+        """
+        Exclusive lock on one project file, across threads and (with flock)
+        processes. It is reentrant, so a caller can hold it around a
+        read-modify-write that ends in write_json_file.
+        """
+        path = os.path.abspath(self._file_path(project_id, filename))
+        with self._locks_guard:
+            entry = self._locks.setdefault(path, [threading.RLock(), 0])
+        with entry[0]:
+            entry[1] += 1
+            try:
+                if fcntl is None or entry[1] > 1:
+                    yield
+                    return
+                directory, name = os.path.split(path)
+                with open(os.path.join(directory, f".{name}.lock"), 'a') as lock_file:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            finally:
+                entry[1] -= 1
+
+    def get_version(self, project_id: str, filename: str) -> Optional[str]:
+        """Current version of a file, or None if it does not exist."""
+        return _file_version(self._file_path(project_id, filename))
+
+    def _check_version(self, path: str, filename: str, expected_version: Optional[str]) -> None:
+        if expected_version is None:
+            return
+        current = _file_version(path)
+        if current is None or (expected_version != '*' and expected_version != current):
+            raise VersionConflictError(filename, expected_version, current)
+
     def read_json_file(self, project_id: str, filename: str) -> Optional[dict]:
-        path = os.path.join(self.get_project_path(project_id), filename)
-        if not os.path.exists(path):
-            return None
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self.read_json_file_versioned(project_id, filename)[0]
 
-    def write_json_file(self, project_id: str, filename: str, data: dict) -> None:
-        path = os.path.join(self.get_project_path(project_id), filename)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def read_json_file_versioned(self, project_id: str, filename: str) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Parsed file and the version it was read at, or (None, None) if the file
+        does not exist. The document is a read-only view shared through the
+        document cache.
+        """
+        path = self._file_path(project_id, filename)
+        version = _file_version(path)
+        while version is not None:
+            try:
+                data = load_json_cached(path)
+            except FileNotFoundError:
+                data = None
+            # Retry if a writer replaced the file between the stat and the read
+            current = _file_version(path)
+            if current == version:
+                return data, version
+            version = current
+        return None, None
 
-    def delete_file(self, project_id: str, filename: str) -> bool:
-        path = os.path.join(self.get_project_path(project_id), filename)
-        if os.path.exists(path):
+    def write_json_file(self, project_id: str, filename: str, data: Any,
+                        expected_version: Optional[str] = None) -> str:
+        """
+        Atomically replace a file with data.
+
+        Returns:
+            The file's new version
+
+        Raises:
+            VersionConflictError: If expected_version is given and does not match
+        """
+        path = self._file_path(project_id, filename)
+        directory = os.path.dirname(path)
+        with self.lock(project_id, filename):
+            self._check_version(path, filename, expected_version)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # mkstemp creates the file private to the owner; keep the permissions of the file it replaces
+                try:
+                    mode = stat.S_IMODE(os.stat(path).st_mode)
+                except FileNotFoundError:
+                    mode = 0o644
+                os.chmod(tmp_path, mode)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            _fsync_directory(directory)
+            invalidate_cached_json(path)
+            return _file_version(path)
+
+    def delete_file(self, project_id: str, filename: str, expected_version: Optional[str] = None) -> bool:
+        """
+        Delete a file; False if it did not exist.
+
+        Raises:
+            VersionConflictError: If expected_version is given and does not match
+        """
+        path = self._file_path(project_id, filename)
+        with self.lock(project_id, filename):
+            if expected_version is None and not os.path.exists(path):
+                return False
+            self._check_version(path, filename, expected_version)
             os.remove(path)
+            invalidate_cached_json(path)
             return True
-        return False
+
+    # ProjectStore interface
+
+    def get_items(self, project_id: str, collection: str) -> Tuple[List[dict], Optional[str]]:
+        data, version = self.read_json_file_versioned(project_id, get_collection(collection).filename)
+        return (data if data else []), version
+
+    def replace_items(self, project_id: str, collection: str, items: List[dict],
+                      expected_version: Optional[str] = None) -> str:
+        return self.write_json_file(project_id, get_collection(collection).filename, items, expected_version)
+
+    def delete_items(self, project_id: str, collection: str, expected_version: Optional[str] = None) -> bool:
+        return self.delete_file(project_id, get_collection(collection).filename, expected_version)
+
+    def query_items(self, project_id: str, collection: str, filters: Optional[Dict[str, Any]] = None,
+                    fields: Optional[Sequence[str]] = None, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Dict[str, Any], Optional[str]]:
+        spec = get_collection(collection)
+        filters = check_query(spec, filters, limit)
+        start = parse_cursor(cursor)
+        path = self._file_path(project_id, spec.filename)
+        items, version = self.read_json_file_versioned(project_id, spec.filename)
+        if not items:
+            with self._indexes_guard:
+                self._indexes.pop(path, None)
+            return {'items': [], 'next_cursor': None}, version
+        with self._indexes_guard:
+            cached = self._indexes.get(path)
+            if cached is not None:
+                self._indexes.move_to_end(path)
+        # The document cache hands out the same object until the file changes
+        if cached is None or cached[0] is not items:
+            cached = (items, ItemIndex(spec, items))
+            with self._indexes_guard:
+                self._indexes[path] = cached
+                self._indexes.move_to_end(path)
+                while len(self._indexes) > MAX_CACHED_INDEXES:
+                    self._indexes.popitem(last=False)
+        found = cached[1].select(items, filters, start, limit + 1)
+        next_cursor = str(found.pop()) if len(found) > limit else None
+        return {'items': [project_fields(items[position], fields) for position in found],
+                'next_cursor': next_cursor}, version
+
+    @contextmanager
+    def _editing(self, project_id: str, collection: str) -> Iterator[Tuple[List[dict], dict]]:
+        """Locked, mutable copy of a collection and the positions of its items by key."""
+        spec = get_collection(collection)
+        with self.lock(project_id, spec.filename):
+            items = thaw(self.read_json_file(project_id, spec.filename) or [])
+            yield items, {spec.key_of(item): i for i, item in enumerate(items)}
+
+    def upsert_item(self, project_id: str, collection: str, item: dict) -> str:
+        spec = get_collection(collection)
+        with self._editing(project_id, collection) as (items, positions):
+            position = positions.get(spec.key_of(item))
+            if position is None:
+                items.append(item)
+            else:
+                items[position] = item
+            return self.write_json_file(project_id, spec.filename, items)
+
+    def patch_item(self, project_id: str, collection: str, key, changes: dict,
+                   validate: Optional[Callable[[dict], dict]] = None) -> Optional[dict]:
+        spec = get_collection(collection)
+        with self._editing(project_id, collection) as (items, positions):
+            position = positions.get(normalize_key(spec, key))
+            if position is None:
+                return None
+            items[position] = merge_changes(spec, items[position], changes, validate)
+            self.write_json_file(project_id, spec.filename, items)
+            return items[position]
+
+    def delete_item(self, project_id: str, collection: str, key) -> bool:
+        spec = get_collection(collection)
+        with self._editing(project_id, collection) as (items, positions):
+            position = positions.get(normalize_key(spec, key))
+            if position is None:
+                return False
+            del items[position]
+            self.write_json_file(project_id, spec.filename, items)
+            return True
+
+    def get_document(self, project_id: str, name: str) -> Tuple[Optional[Any], Optional[str]]:
+        return self.read_json_file_versioned(project_id, f"{name}.json")
+
+    def put_document(self, project_id: str, name: str, data: Any, expected_version: Optional[str] = None) -> str:
+        return self.write_json_file(project_id, f"{name}.json", data, expected_version)
+
+    # Async variants for the FastAPI handlers: the blocking file work runs on a
+    # worker thread so the event loop keeps serving other requests meanwhile.
+
+    async def list_projects_async(self) -> List[str]:
+        return await asyncio.to_thread(self.list_projects)
+
+    async def create_project_async(self, project_id: str) -> bool:
+        return await asyncio.to_thread(self.create_project, project_id)
+
+    async def delete_project_async(self, project_id: str) -> bool:
+        return await asyncio.to_thread(self.delete_project, project_id)
+
+    async def read_json_file_async(self, project_id: str, filename: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.read_json_file, project_id, filename)
+
+    async def read_json_file_versioned_async(self, project_id: str,
+                                             filename: str) -> Tuple[Optional[Any], Optional[str]]:
+        return await asyncio.to_thread(self.read_json_file_versioned, project_id, filename)
+
+    async def write_json_file_async(self, project_id: str, filename: str, data: Any,
+                                    expected_version: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.write_json_file, project_id, filename, data, expected_version)
+
+    async def delete_file_async(self, project_id: str, filename: str,
+                                expected_version: Optional[str] = None) -> bool:
+        return await asyncio.to_thread(self.delete_file, project_id, filename, expected_version)
@@ -0,0 +1,189 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Collection:
+    """
+    A list-valued project input (WBS levels, resources, allocations): the
+    fields that identify an item and the fields stores index for filtering
+    (the only fields query_items accepts as filters).
+    """
+
+    def __init__(self, name: str, key: Sequence[str], indexed: Sequence[str] = ()):
+        self.name = name
+        self.filename = f"{name}.json"
+        self.key = tuple(key)
+        self.indexed = tuple(indexed)
+
+    def key_of(self, item: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(item.get(field)) for field in self.key)
+
+
+COLLECTIONS = {
+    'wbs_levels': Collection('wbs_levels', key=('id',), indexed=('parent_id',)),
+    'resources': Collection('resources', key=('id',)),
+    'allocations': Collection('allocations', key=('wbs_id', 'resource_id'), indexed=('wbs_id', 'resource_id')),
+}
+
+START_DATE_DOCUMENT = 'project_start_date'
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class VersionConflictError(Exception):
+    """A write's expected version no longer matches the stored data (another writer got there first)."""
+
+    def __init__(self, name: str, expected: Optional[str], current: Optional[str]):
+        super().__init__(f"{name} was modified: expected version {expected}, found {current}")
+        self.name = name
+        self.expected = expected
+        self.current = current
+
+
+def get_collection(name: str) -> Collection:
+    try:
+        return COLLECTIONS[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection: {name}")
+
+
+def validate_project_id(project_id: str) -> str:
+    if not project_id or any(c in project_id for c in ['..', '/', '\\']):
+        raise ValueError("Invalid project_id")
+    return project_id
+
+
+def check_query(collection: Collection, filters: Optional[Dict[str, Any]], limit: int) -> Dict[str, str]:
+    """Validated filters of a query_items call, with values as strings."""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    filters = {field: str(value) for field, value in (filters or {}).items() if value is not None}
+    unknown = sorted(set(filters) - set(collection.indexed))
+    if unknown:
+        raise ValueError(f"{collection.name} cannot be filtered by {', '.join(unknown)}")
+    return filters
+
+
+def parse_cursor(cursor: Optional[str]) -> int:
+    """Position a page starts at; cursors are the next_cursor of the previous page."""
+    if not cursor:
+        return 0
+    try:
+        position = int(cursor)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if position < 0:
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def project_fields(item: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if not fields:
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def normalize_key(collection: Collection, key) -> Tuple[str, ...]:
+    """Item key as a tuple of strings; a single-field key may be passed as a plain value."""
+    if not isinstance(key, (tuple, list)):
+        key = (key,)
+    if len(key) != len(collection.key):
+        raise ValueError(f"{collection.name} items are identified by {', '.join(collection.key)}")
+    return tuple(str(part) for part in key)
+
+
+class ProjectStore:
+    """
+    Storage interface for project inputs, implemented by ProjectRepository
+    (JSON files per project) and SQLiteProjectRepository.
+
+    Collections are ordered lists of items (see COLLECTIONS); documents are
+    single JSON values such as the project start date. Every collection and
+    document has an opaque version string that changes with each write;
+    passing expected_version makes a write fail with VersionConflictError
+    when the data has changed since that version was read ('*' only
+    requires that it exists).
+
+    Single-item methods (upsert_item, patch_item, delete_item) let a store
+    change one row without rewriting the collection; the JSON store still
+    rewrites the file, the SQLite store updates one indexed row.
+    """
+
+    def list_projects(self) -> List[str]:
+        raise NotImplementedError
+
+    def create_project(self, project_id: str) -> bool:
+        raise NotImplementedError
+
+    def delete_project(self, project_id: str) -> bool:
+        raise NotImplementedError
+
+    def get_items(self, project_id: str, collection: str) -> Tuple[List[dict], Optional[str]]:
+        """All items of a collection in order and its version ([] and None if it was never saved)."""
+        raise NotImplementedError
+
+    def replace_items(self, project_id: str, collection: str, items: List[dict],
+                      expected_version: Optional[str] = None) -> str:
+        """Replace a whole collection; returns the new version."""
+        raise NotImplementedError
+
+    def delete_items(self, project_id: str, collection: str, expected_version: Optional[str] = None) -> bool:
+        """Delete a whole collection; False if it did not exist."""
+        raise NotImplementedError
+
+    def upsert_item(self, project_id: str, collection: str, item: dict) -> str:
+        """Insert an item, or replace the item with the same key in place; returns the new version."""
+        raise NotImplementedError
+
+    def patch_item(self, project_id: str, collection: str, key, changes: dict,
+                   validate: Optional[Callable[[dict], dict]] = None) -> Optional[dict]:
+        """
+        Merge changes into one item. validate, if given, receives the merged
+        item and returns the item to store (or raises ValueError). Key fields
+        cannot be changed.
+
+        Returns:
+            The stored item, or None if there is no item with that key
+        """
+        raise NotImplementedError
+
+    def delete_item(self, project_id: str, collection: str, key) -> bool:
+        raise NotImplementedError
+
+    def query_items(self, project_id: str, collection: str, filters: Optional[Dict[str, Any]] = None,
+                    fields: Optional[Sequence[str]] = None, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        One page of a collection in order, and the collection's version.
+
+        Args:
+            filters: Field -> value; items match when the field equals the value
+                (compared as strings). Only the collection's indexed fields are allowed.
+            fields: Fields to return for each item (all fields if empty)
+            cursor: next_cursor of the previous page
+            limit: Page size, 1 to MAX_PAGE_SIZE
+
+        Returns:
+            ({'items': [...], 'next_cursor': str or None}, version)
+
+        Raises:
+            ValueError: On an unknown filter field, an invalid cursor or limit
+        """
+        raise NotImplementedError
+
+    def get_document(self, project_id: str, name: str) -> Tuple[Optional[Any], Optional[str]]:
+        raise NotImplementedError
+
+    def put_document(self, project_id: str, name: str, data: Any, expected_version: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+
+def merge_changes(collection: Collection, item: dict, changes: dict,
+                  validate: Optional[Callable[[dict], dict]]) -> dict:
+    """Item with changes applied, for patch_item implementations."""
+    for field in collection.key:
+        if field in changes and str(changes[field]) != str(item.get(field)):
+            raise ValueError(f"{field} cannot be changed")
+    merged = dict(item)
+    merged.update(changes)
+    return validate(merged) if validate is not None else merged
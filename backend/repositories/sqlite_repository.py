@@ -0,0 +1,272 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.repositories.project_store import (
+    COLLECTIONS, DEFAULT_PAGE_SIZE, Collection, ProjectStore, VersionConflictError, check_query, get_collection,
+    merge_changes, normalize_key, parse_cursor, project_fields, validate_project_id
+)
+
+logger = logging.getLogger("backend.sqlite_repository")
+
+
+def _columns(collection: Collection) -> List[str]:
+    """Key columns followed by the indexed columns that are not part of the key."""
+    return list(collection.key) + [field for field in collection.indexed if field not in collection.key]
+
+
+def _schema() -> List[str]:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS projects (project_id TEXT PRIMARY KEY, created_at REAL NOT NULL)",
+        # One counter for the whole database, so a version is never reused, not even after a delete
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)",
+        "CREATE TABLE IF NOT EXISTS versions (project_id TEXT NOT NULL, name TEXT NOT NULL, "
+        "version INTEGER NOT NULL, PRIMARY KEY (project_id, name))",
+        "CREATE TABLE IF NOT EXISTS documents (project_id TEXT NOT NULL, name TEXT NOT NULL, "
+        "data TEXT NOT NULL, PRIMARY KEY (project_id, name))",
+    ]
+    for collection in COLLECTIONS.values():
+        name = collection.name
+        columns = ", ".join(f"{column} TEXT{' NOT NULL' if column in collection.key else ''}"
+                            for column in _columns(collection))
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {name} (project_id TEXT NOT NULL, {columns}, position INTEGER NOT NULL, "
+            f"data TEXT NOT NULL, PRIMARY KEY (project_id, {', '.join(collection.key)}))")
+        statements.append(f"CREATE UNIQUE INDEX IF NOT EXISTS {name}_position ON {name} (project_id, position)")
+        for field in collection.indexed:
+            # Filtered pages are read in position order straight from the index
+            statements.append(f"CREATE INDEX IF NOT EXISTS {name}_{field}_position "
+                              f"ON {name} (project_id, {field}, position)")
+    return statements
+
+
+def _column_value(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class SQLiteProjectRepository(ProjectStore):
+    """
+    ProjectStore in a single SQLite database.
+
+    Each collection is a table keyed by (project_id, item key) with an index on
+    the item's position and on the collection's filter fields; the item itself
+    is kept as JSON text, so fields the table has no column for round-trip
+    unchanged. Upserting, patching or deleting one item touches one row
+    (O(log n)) instead of rewriting the collection.
+
+    The database runs in WAL mode, so readers do not block the writer and
+    several server processes can share it; writes take the write lock up
+    front (BEGIN IMMEDIATE) and check expected versions inside the same
+    transaction. Each thread uses its own connection.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        with self._transaction() as conn:
+            for statement in _schema():
+                conn.execute(statement)
+        logger.info(f"Opened SQLite project store {db_path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            # Transactions are managed explicitly, hence isolation_level=None
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _current_version(self, conn: sqlite3.Connection, project_id: str, name: str) -> Optional[str]:
+        row = conn.execute("SELECT version FROM versions WHERE project_id = ? AND name = ?",
+                           (project_id, name)).fetchone()
+        return None if row is None else str(row[0])
+
+    def _check_version(self, conn: sqlite3.Connection, project_id: str, name: str,
+                       expected_version: Optional[str]) -> None:
+        if expected_version is None:
+            return
+        current = self._current_version(conn, project_id, name)
+        if current is None or (expected_version != '*' and expected_version != current):
+            raise VersionConflictError(name, expected_version, current)
+
+    def _bump_version(self, conn: sqlite3.Connection, project_id: str, name: str) -> str:
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        conn.execute("INSERT INTO versions (project_id, name, version) VALUES (?, ?, ?) "
+                     "ON CONFLICT (project_id, name) DO UPDATE SET version = excluded.version",
+                     (project_id, name, version))
+        # Writing to a project registers it, as writing a file creates it for the JSON store
+        conn.execute("INSERT OR IGNORE INTO projects (project_id, created_at) VALUES (?, ?)",
+                     (project_id, time.time()))
+        return str(version)
+
+    def list_projects(self) -> List[str]:
+        with self._transaction(write=False) as conn:
+            return [row[0] for row in conn.execute("SELECT project_id FROM projects ORDER BY project_id")]
+
+    def create_project(self, project_id: str) -> bool:
+        validate_project_id(project_id)
+        with self._transaction() as conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO projects (project_id, created_at) VALUES (?, ?)",
+                                  (project_id, time.time()))
+            return cursor.rowcount > 0
+
+    def delete_project(self, project_id: str) -> bool:
+        validate_project_id(project_id)
+        with self._transaction() as conn:
+            for table in ['versions', 'documents'] + list(COLLECTIONS):
+                conn.execute(f"DELETE FROM {table} WHERE project_id = ?", (project_id,))
+            return conn.execute("DELETE FROM projects WHERE project_id = ?", (project_id,)).rowcount > 0
+
+    def _row(self, collection: Collection, project_id: str, item: dict, position: int) -> tuple:
+        return ((project_id,) + collection.key_of(item)
+                + tuple(_column_value(item.get(field)) for field in _columns(collection)[len(collection.key):])
+                + (position, json.dumps(item, ensure_ascii=False)))
+
+    def _upsert_sql(self, collection: Collection) -> str:
+        columns = _columns(collection)
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[len(collection.key):])
+        updates = (updates + ", " if updates else "") + "data = excluded.data"
+        # On conflict the item keeps its position, so an update does not move it
+        return (f"INSERT INTO {collection.name} (project_id, {', '.join(columns)}, position, data) "
+                f"VALUES ({placeholders}) ON CONFLICT (project_id, {', '.join(collection.key)}) "
+                f"DO UPDATE SET {updates}")
+
+    def _key_clause(self, collection: Collection) -> str:
+        return " AND ".join(["project_id = ?"] + [f"{field} = ?" for field in collection.key])
+
+    def get_items(self, project_id: str, collection: str) -> Tuple[List[dict], Optional[str]]:
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        with self._transaction(write=False) as conn:
+            version = self._current_version(conn, project_id, spec.name)
+            rows = conn.execute(f"SELECT data FROM {spec.name} WHERE project_id = ? ORDER BY position",
+                                (project_id,)).fetchall()
+        # One parse of the joined rows is much cheaper than a json.loads per row
+        return json.loads("[" + ",".join(row[0] for row in rows) + "]"), version
+
+    def query_items(self, project_id: str, collection: str, filters: Optional[Dict[str, Any]] = None,
+                    fields: Optional[Sequence[str]] = None, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Dict[str, Any], Optional[str]]:
+        spec = get_collection(collection)
+        filters = check_query(spec, filters, limit)
+        start = parse_cursor(cursor)
+        validate_project_id(project_id)
+        conditions = "".join(f" AND {field} = ?" for field in filters)
+        with self._transaction(write=False) as conn:
+            version = self._current_version(conn, project_id, spec.name)
+            rows = conn.execute(f"SELECT position, data FROM {spec.name} WHERE project_id = ?{conditions} "
+                                f"AND position >= ? ORDER BY position LIMIT ?",
+                                (project_id, *filters.values(), start, limit + 1)).fetchall()
+        next_cursor = str(rows.pop()[0]) if len(rows) > limit else None
+        items = json.loads("[" + ",".join(row[1] for row in rows) + "]")
+        return {'items': [project_fields(item, fields) for item in items], 'next_cursor': next_cursor}, version
+
+    def replace_items(self, project_id: str, collection: str, items: List[dict],
+                      expected_version: Optional[str] = None) -> str:
+        """Replace a whole collection; of several items with the same key the last one wins."""
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        with self._transaction() as conn:
+            self._check_version(conn, project_id, spec.name, expected_version)
+            conn.execute(f"DELETE FROM {spec.name} WHERE project_id = ?", (project_id,))
+            conn.executemany(self._upsert_sql(spec),
+                             (self._row(spec, project_id, item, position) for position, item in enumerate(items)))
+            return self._bump_version(conn, project_id, spec.name)
+
+    def delete_items(self, project_id: str, collection: str, expected_version: Optional[str] = None) -> bool:
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        with self._transaction() as conn:
+            if expected_version is None and self._current_version(conn, project_id, spec.name) is None:
+                return False
+            self._check_version(conn, project_id, spec.name, expected_version)
+            conn.execute(f"DELETE FROM {spec.name} WHERE project_id = ?", (project_id,))
+            conn.execute("DELETE FROM versions WHERE project_id = ? AND name = ?", (project_id, spec.name))
+            return True
+
+    def upsert_item(self, project_id: str, collection: str, item: dict) -> str:
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        with self._transaction() as conn:
+            last = conn.execute(f"SELECT MAX(position) FROM {spec.name} WHERE project_id = ?",
+                                (project_id,)).fetchone()[0]
+            conn.execute(self._upsert_sql(spec), self._row(spec, project_id, item, 0 if last is None else last + 1))
+            return self._bump_version(conn, project_id, spec.name)
+
+    def patch_item(self, project_id: str, collection: str, key, changes: dict,
+                   validate: Optional[Callable[[dict], dict]] = None) -> Optional[dict]:
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        params = (project_id,) + normalize_key(spec, key)
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT position, data FROM {spec.name} WHERE {self._key_clause(spec)}",
+                               params).fetchone()
+            if row is None:
+                return None
+            item = merge_changes(spec, json.loads(row[1]), changes, validate)
+            conn.execute(self._upsert_sql(spec), self._row(spec, project_id, item, row[0]))
+            self._bump_version(conn, project_id, spec.name)
+            return item
+
+    def delete_item(self, project_id: str, collection: str, key) -> bool:
+        spec = get_collection(collection)
+        validate_project_id(project_id)
+        params = (project_id,) + normalize_key(spec, key)
+        with self._transaction() as conn:
+            if conn.execute(f"DELETE FROM {spec.name} WHERE {self._key_clause(spec)}", params).rowcount == 0:
+                return False
+            self._bump_version(conn, project_id, spec.name)
+            return True
+
+    def get_document(self, project_id: str, name: str) -> Tuple[Optional[Any], Optional[str]]:
+        validate_project_id(project_id)
+        with self._transaction(write=False) as conn:
+            row = conn.execute("SELECT data FROM documents WHERE project_id = ? AND name = ?",
+                               (project_id, name)).fetchone()
+            version = self._current_version(conn, project_id, name)
+        return (None, None) if row is None else (json.loads(row[0]), version)
+
+    def put_document(self, project_id: str, name: str, data: Any, expected_version: Optional[str] = None) -> str:
+        validate_project_id(project_id)
+        if name in COLLECTIONS:
+            raise ValueError(f"{name} is a collection, not a document")
+        with self._transaction() as conn:
+            self._check_version(conn, project_id, name, expected_version)
+            conn.execute("INSERT INTO documents (project_id, name, data) VALUES (?, ?, ?) "
+                         "ON CONFLICT (project_id, name) DO UPDATE SET data = excluded.data",
+                         (project_id, name, json.dumps(data, ensure_ascii=False)))
+            return self._bump_version(conn, project_id, name)
@@ -0,0 +1,111 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("backend.job_manager")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Job:
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Runs long operations (git init, venv creation, pip install) on a small
+    thread pool so the request that starts one returns at once; clients poll
+    the job's status instead of holding the connection open.
+
+    Submitting a job while one with the same name is still queued or running
+    returns the existing job rather than starting a duplicate. Only the most
+    recent max_jobs finished jobs are kept.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="setup-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.name == name and not job.done:
+                    return job
+            job = Job(name)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Job {job.id} ({name}) queued")
+        return job
+
+    def _run(self, job: Job, func: Callable[..., Any], args, kwargs) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = func(*args, **kwargs)
+            job.status = SUCCEEDED
+            logger.info(f"Job {job.id} ({job.name}) succeeded")
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            logger.error(f"Job {job.id} ({job.name}) failed: {e}")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until a job finishes (for scripts and tests); returns None for an unknown id."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        job = self.get(job_id)
+        while job is not None and not job.done:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
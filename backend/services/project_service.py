@@ -1,56 +1,211 @@
-from typing import List, Optional
+import json
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from backend.repositories.project_repository import ProjectRepository
-from backend.api_inputs import WBSLevel, Resource, Allocation, ProjectStartDate
+from backend.repositories.project_store import MAX_PAGE_SIZE, ProjectStore, START_DATE_DOCUMENT
+from backend.models import WBSLevel, Resource, Allocation, ProjectStartDate
+from project_management.modules.main_modules.gantt_chart_data import GanttChartData, GanttIndex
+
+# Projects whose GanttIndex is kept between requests
+MAX_CACHED_GANTT_INDEXES = 8
+
+# Model each collection's items are validated against
+MODELS = {
+    'wbs_levels': WBSLevel,
+    'resources': Resource,
+    'allocations': Allocation,
+}
 
 class ProjectService:
-    def __init__(self, repository: ProjectRepository):
+    """
+    Project inputs (WBS levels, resources, allocations, start date) live in
+    store, which defaults to the JSON file repository and can be an
+    SQLiteProjectRepository instead. Files produced from the project directory
+    (wbs_parts, detailed_wbs.json, Gantt data) always go through repository.
+    """
+
+    def __init__(self, repository: ProjectRepository, store: Optional[ProjectStore] = None):
         self.repository = repository
+        self.store = store if store is not None else repository
+        # project_id -> (detailed_wbs document, GanttIndex built from it), least recently used first
+        self._gantt_indexes = OrderedDict()
+        self._gantt_guard = threading.Lock()
 
     def list_projects(self) -> List[str]:
-        return self.repository.list_projects()
+        return self.store.list_projects()
 
     def create_project(self, project_id: str) -> bool:
-        return self.repository.create_project(project_id)
+        created = self.store.create_project(project_id)
+        if self.store is not self.repository:
+            # The project directory still holds the WBS parts and generated files
+            self.repository.create_project(project_id)
+        return created
 
     def delete_project(self, project_id: str) -> bool:
-        return self.repository.delete_project(project_id)
+        with self._gantt_guard:
+            self._gantt_indexes.pop(project_id, None)
+        deleted = self.store.delete_project(project_id)
+        if self.store is not self.repository:
+            deleted = self.repository.delete_project(project_id) or deleted
+        return deleted
 
     def get_wbs_levels(self, project_id: str) -> List[dict]:
-        data = self.repository.read_json_file(project_id, 'wbs_levels.json')
-        return data if data else []
+        return self.store.get_items(project_id, 'wbs_levels')[0]
 
     def save_wbs_levels(self, project_id: str, levels: List[WBSLevel]) -> None:
-        data = [level.dict() for level in levels]
-        self.repository.write_json_file(project_id, 'wbs_levels.json', data)
+        self.store.replace_items(project_id, 'wbs_levels', [level.dict() for level in levels])
 
     def delete_wbs_levels(self, project_id: str) -> bool:
-        return self.repository.delete_file(project_id, 'wbs_levels.json')
+        return self.store.delete_items(project_id, 'wbs_levels')
 
     def get_resources(self, project_id: str) -> List[dict]:
-        data = self.repository.read_json_file(project_id, 'resources.json')
-        return data if data else []
+        return self.store.get_items(project_id, 'resources')[0]
 
     def save_resources(self, project_id: str, resources: List[Resource]) -> None:
-        data = [resource.dict() for resource in resources]
-        self.repository.write_json_file(project_id, 'resources.json', data)
+        self.store.replace_items(project_id, 'resources', [resource.dict() for resource in resources])
 
     def delete_resources(self, project_id: str) -> bool:
-        return self.repository.delete_file(project_id, 'resources.json')
+        return self.store.delete_items(project_id, 'resources')
 
     def get_allocations(self, project_id: str) -> List[dict]:
-        data = self.repository.read_json_file(project_id, 'allocations.json')
-        return data if data else []
+        return self.store.get_items(project_id, 'allocations')[0]
 
     def save_allocations(self, project_id: str, allocations: List[Allocation]) -> None:
-        data = [allocation.dict() for allocation in allocations]
-        self.repository.write_json_file(project_id, 'allocations.json', data)
+        self.store.replace_items(project_id, 'allocations', [allocation.dict() for allocation in allocations])
 
     def delete_allocations(self, project_id: str) -> bool:
-        return self.repository.delete_file(project_id, 'allocations.json')
+        return self.store.delete_items(project_id, 'allocations')
 
     def get_project_start_date(self, project_id: str) -> dict:
-        data = self.repository.read_json_file(project_id, 'project_start_date.json')
+        data = self.store.get_document(project_id, START_DATE_DOCUMENT)[0]
         return data if data else {}
 
     def save_project_start_date(self, project_id: str, start_date: ProjectStartDate) -> None:
-        self.repository.write_json_file(project_id, 'project_start_date.json', start_date.dict())
+        self.store.put_document(project_id, START_DATE_DOCUMENT, start_date.dict())
+
+    def _validator(self, collection: str) -> Callable[[dict], dict]:
+        model = MODELS[collection]
+        return lambda item: model(**item).dict()
+
+    def upsert_item(self, project_id: str, collection: str, item: dict) -> str:
+        """Insert or replace one item of a collection; returns the collection's new version."""
+        return self.store.upsert_item(project_id, collection, self._validator(collection)(item))
+
+    def patch_item(self, project_id: str, collection: str, key, changes: dict) -> Optional[dict]:
+        """
+        Apply a partial update to one item. The merged item is validated
+        against the collection's model.
+
+        Returns:
+            The updated item, or None if there is no item with that key
+
+        Raises:
+            ValueError: If the merged item is invalid or changes a key field
+        """
+        return self.store.patch_item(project_id, collection, key, changes, self._validator(collection))
+
+    def delete_item(self, project_id: str, collection: str, key) -> bool:
+        return self.store.delete_item(project_id, collection, key)
+
+    def export_ndjson(self, project_id: str, collection: str, filters: Optional[Dict[str, Any]] = None,
+                      fields: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+        """
+        A whole (filtered) collection as newline-delimited JSON, one chunk per
+        page of MAX_PAGE_SIZE items, so a large export is never held in memory
+        at once. The first page is read before returning, so invalid arguments
+        raise here rather than halfway through a streamed response.
+        """
+        page, _ = self.store.query_items(project_id, collection, filters, fields, None, MAX_PAGE_SIZE)
+        return self._ndjson_pages(project_id, collection, filters, fields, page)
+
+    def _ndjson_pages(self, project_id: str, collection: str, filters, fields, page: dict) -> Iterator[bytes]:
+        while True:
+            if page['items']:
+                yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in page['items']).encode('utf-8')
+            if page['next_cursor'] is None:
+                return
+            page, _ = self.store.query_items(project_id, collection, filters, fields, page['next_cursor'],
+                                             MAX_PAGE_SIZE)
+
+    def get_gantt_index(self, project_id: str) -> Optional[GanttIndex]:
+        """GanttIndex of the project's detailed_wbs.json, rebuilt only when the file changes."""
+        wbs = self.repository.read_json_file(project_id, 'detailed_wbs.json')
+        if wbs is None:
+            with self._gantt_guard:
+                self._gantt_indexes.pop(project_id, None)
+            return None
+        with self._gantt_guard:
+            cached = self._gantt_indexes.get(project_id)
+            if cached is not None:
+                self._gantt_indexes.move_to_end(project_id)
+        # The repository hands out the same cached document until the file changes
+        if cached is None or cached[0] is not wbs:
+            generator = GanttChartData()
+            generator.tasks = wbs
+            cached = (wbs, generator.get_index())
+            with self._gantt_guard:
+                self._gantt_indexes[project_id] = cached
+                self._gantt_indexes.move_to_end(project_id)
+                while len(self._gantt_indexes) > MAX_CACHED_GANTT_INDEXES:
+                    self._gantt_indexes.popitem(last=False)
+        return cached[1]
+
+    def get_gantt_page(self, project_id: str, **query) -> dict:
+        index = self.get_gantt_index(project_id)
+        if index is None:
+            return {'tasks': [], 'next_cursor': None}
+        return index.query(**query)
+
+    # Async API used by the FastAPI handlers; storage calls run on a worker
+    # thread so the event loop keeps serving other requests. Reads return
+    # (data, version) and writes the new version, for the handlers' ETag /
+    # If-Match support; expected_version is checked by the store.
+
+    async def list_projects_async(self) -> List[str]:
+        return await asyncio.to_thread(self.list_projects)
+
+    async def create_project_async(self, project_id: str) -> bool:
+        return await asyncio.to_thread(self.create_project, project_id)
+
+    async def delete_project_async(self, project_id: str) -> bool:
+        return await asyncio.to_thread(self.delete_project, project_id)
+
+    async def query_items_async(self, project_id: str, collection: str,
+                                **query) -> Tuple[Dict[str, Any], Optional[str]]:
+        return await asyncio.to_thread(self.store.query_items, project_id, collection, **query)
+
+    async def export_ndjson_async(self, project_id: str, collection: str, **query) -> Iterator[bytes]:
+        return await asyncio.to_thread(self.export_ndjson, project_id, collection, **query)
+
+    async def replace_items_async(self, project_id: str, collection: str, items: List[Any],
+                                  expected_version: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.store.replace_items, project_id, collection,
+                                       [item.dict() for item in items], expected_version)
+
+    async def delete_items_async(self, project_id: str, collection: str,
+                                 expected_version: Optional[str] = None) -> bool:
+        return await asyncio.to_thread(self.store.delete_items, project_id, collection, expected_version)
+
+    async def upsert_item_async(self, project_id: str, collection: str, item: dict) -> str:
+        return await asyncio.to_thread(self.upsert_item, project_id, collection, item)
+
+    async def patch_item_async(self, project_id: str, collection: str, key, changes: dict) -> Optional[dict]:
+        return await asyncio.to_thread(self.patch_item, project_id, collection, key, changes)
+
+    async def delete_item_async(self, project_id: str, collection: str, key) -> bool:
+        return await asyncio.to_thread(self.delete_item, project_id, collection, key)
+
+    async def get_project_start_date_async(self, project_id: str) -> Tuple[dict, Optional[str]]:
+        data, version = await asyncio.to_thread(self.store.get_document, project_id, START_DATE_DOCUMENT)
+        return (data if data else {}), version
+
+    async def save_project_start_date_async(self, project_id: str, start_date: ProjectStartDate,
+                                            expected_version: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.store.put_document, project_id, START_DATE_DOCUMENT,
+                                       start_date.dict(), expected_version)
+
+    async def get_gantt_page_async(self, project_id: str, **query) -> dict:
+        # Building the index is CPU work as well as I/O, so the whole call moves to a thread
+        return await asyncio.to_thread(self.get_gantt_page, project_id, **query)
@@ -0,0 +1,193 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+from project_management.modules.main_modules.json_cache import load_json_cached
+
+logger = logging.getLogger("backend.report_cache")
+
+# Bodies smaller than this are cheaper to send as they are than to compress
+MIN_COMPRESS_BYTES = 1024
+
+
+class CachedReport:
+    """
+    One report file as served over HTTP: the parsed document, its serialized
+    JSON body, validators and, on demand, compressed copies of the body.
+    All of it is built once per file version (mtime and size).
+
+    Each encoding of the body is a different representation, so it gets its
+    own strong ETag: the body hash, suffixed with the content coding.
+    """
+
+    def __init__(self, signature: Tuple[int, int], data, body: bytes, mtime: float):
+        self.signature = signature
+        self.data = data
+        self.body = body
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = self.etag_for(None)
+        self.last_modified = formatdate(int(mtime), usegmt=True)
+        self.modified_seconds = int(mtime)
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """ETag of the body sent with a content coding (None for identity)."""
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def matches(self, etag: str) -> bool:
+        """Whether an ETag (weak or strong) names any encoding of this version of the report."""
+        if etag.startswith('W/'):
+            etag = etag[2:]
+        if not (len(etag) >= 2 and etag[0] == etag[-1] == '"'):
+            return False
+        digest, _, encoding = etag[1:-1].partition('-')
+        return digest == self.digest and encoding in ('', 'gzip', 'br')
+
+    def encoded(self, encoding: str) -> bytes:
+        """Body compressed with 'gzip' or 'br', compressed once and kept."""
+        body = self._encoded.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._encoded.get(encoding)
+                if body is None:
+                    if encoding == 'br':
+                        body = brotli.compress(self.body)
+                    else:
+                        body = gzip.compress(self.body, mtime=0)
+                    self._encoded[encoding] = body
+        return body
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    encodings = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts: 'br', 'gzip' or None for identity."""
+    encodings = _accepted_encodings(accept_encoding)
+    wildcard = encodings.get('*', 0.0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = encodings.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _etag_matches(if_none_match: str, report: CachedReport) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison, as required for If-None-Match; a client holding another
+    # encoding of the same body still has current content
+    return any(report.matches(tag.strip()) for tag in if_none_match.split(','))
+
+
+class ReportCache:
+    """
+    mtime-invalidated cache of report files for the report endpoints.
+
+    respond() stats the file and reuses the cached body, ETag and compressed
+    copies while the file's mtime and size are unchanged, so a repeated poll
+    costs one stat() and, when the client sends its validators back, a 304
+    without a body.
+    """
+
+    def __init__(self):
+        self._reports: Dict[str, CachedReport] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> CachedReport:
+        """
+        Cached report for a JSON file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = os.path.abspath(path)
+        report = self._reports.get(key)
+        if report is not None and report.signature == signature:
+            return report
+        data = load_json_cached(path)
+        body = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+        report = CachedReport(signature, data, body, stat.st_mtime)
+        with self._lock:
+            self._reports[key] = report
+        logger.info(f"Cached report {path} ({len(body)} bytes)")
+        return report
+
+    def respond(self, path: str, if_none_match: Optional[str] = None, if_modified_since: Optional[str] = None,
+                accept_encoding: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        HTTP response for a report file.
+
+        Args:
+            path: Report JSON file
+            if_none_match: If-None-Match request header
+            if_modified_since: If-Modified-Since request header (ignored when If-None-Match is sent)
+            accept_encoding: Accept-Encoding request header
+
+        Returns:
+            (status code, headers, body): 200 with the (possibly compressed) JSON
+            body, or 304 with an empty body
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        report = self.get(path)
+        encoding = choose_encoding(accept_encoding) if len(report.body) >= MIN_COMPRESS_BYTES else None
+        headers = {
+            'ETag': report.etag_for(encoding),
+            'Last-Modified': report.last_modified,
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if if_none_match is not None:
+            if _etag_matches(if_none_match, report):
+                return 304, headers, b''
+        elif if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                since = None
+            if since is not None and report.modified_seconds <= since:
+                return 304, headers, b''
+
+        headers['Content-Type'] = 'application/json'
+        if encoding is None:
+            return 200, headers, report.body
+        headers['Content-Encoding'] = encoding
+        return 200, headers, report.encoded(encoding)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._reports.clear()
+            else:
+                self._reports.pop(os.path.abspath(path), None)
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import subprocess
 import logging
 from fastapi import UploadFile
@@ -90,18 +91,22 @@ class SetupService:
             raise ValueError("Only JSON files are allowed.")
         base_dir = os.path.join(self.project_dir, "project_inputs", "PM_JSON", "user_inputs")
         save_dir = os.path.join(base_dir, target_dir)
-        os.makedirs(save_dir, exist_ok=True)
         file_path = os.path.join(save_dir, file.filename)
         try:
             contents = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(contents)
+            await asyncio.to_thread(self._write_file, file_path, contents)
             logger.info(f"File {file.filename} uploaded successfully to {target_dir}.")
             return f"File {file.filename} uploaded successfully to {target_dir}."
         except Exception as e:
             logger.error(f"File upload failed: {e}")
             raise RuntimeError(f"File upload failed: {str(e)}")
 
+    @staticmethod
+    def _write_file(file_path: str, contents: bytes) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(contents)
+
     def get_expected_files(self):
         # This could be enhanced to dynamically read expected files from config or docs
         expected_files = [
@@ -22,7 +22,17 @@ function SetupWizard({ onComplete, projectId, onCancel, onError }) {
     onError(null);
     try {
       const response = await axios.post(step.api, null, { params: { project_id: projectId } });
-      setStatus(response.data.message);
+      let result = response.data;
+      // Long steps run as background jobs; poll until the job finishes
+      while (result.job_id && !['succeeded', 'failed'].includes(result.status)) {
+        setStatus(`Running: ${step.title} (${result.status})...`);
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        result = (await axios.get(`/setup/jobs/${result.job_id}`)).data;
+      }
+      if (result.status === 'failed') {
+        throw new Error(result.error);
+      }
+      setStatus(result.job_id ? result.result : result.message);
       setTimeout(() => {
         if (currentStep + 1 < steps.length) {
           setCurrentStep(currentStep + 1);
@@ -2,17 +2,55 @@ import json
 import os
 from datetime import datetime
 
+from project_management.modules.main_modules.commit_task_log import CommitTaskLog, log_path_for
+
 class CommitProgressManager:
     def __init__(self, commit_task_db_path='JSonDataBase/OutPuts/commit_task_database.json',
-                 commit_progress_path='JSonDataBase/OutPuts/commit_progress.json'):
+                 commit_progress_path='JSonDataBase/OutPuts/commit_progress.json',
+                 cursor_path=None):
         self.commit_task_db_path = commit_task_db_path
         self.commit_progress_path = commit_progress_path
         self.commit_task_db = {}
         self.commit_progress = {}
+        self.commit_task_log = CommitTaskLog(log_path_for(commit_task_db_path))
+        self.cursor_path = cursor_path or os.path.splitext(commit_progress_path)[0] + '_cursor.json'
+        self._cursor = None
 
+    def _load_cursor(self):
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load_new_commit_records(self):
+        """
+        Load only the commit-task log records added since the last run into
+        commit_task_db, and the progress computed from the earlier records into
+        commit_progress. If the log was compacted or replaced since the stored
+        cursor, everything is read again.
+        """
+        log = self.commit_task_log
+        log.ensure_index()
+        cursor = self._load_cursor()
+        offset = cursor.get('offset', 0)
+        if cursor.get('generation') != log.generation or offset > log.size():
+            offset = 0
+            cursor = {}
+
+        records, end_offset = log.read_since(offset)
+        self.commit_task_db = {}
+        for record_offset, record in records:
+            # Superseded records for an already counted commit are not counted again
+            if log.is_first_record(record_offset, record):
+                self.commit_task_db[record['commit_hash']] = record
+        self.commit_progress = cursor.get('progress', {})
+        self._cursor = {'generation': log.generation, 'offset': end_offset}
 
     def load_commit_task_db(self):
-        if os.path.exists(self.commit_task_db_path):
+        if self.commit_task_log.exists():
+            self.load_new_commit_records()
+        elif os.path.exists(self.commit_task_db_path):
             with open(self.commit_task_db_path, 'r', encoding='utf-8') as f:
                 self.commit_task_db = json.load(f)
         else:
@@ -22,8 +60,14 @@ class CommitProgressManager:
         """
         Generate commit progress per task based on commit_task_database.
         For each task, calculate number of commits, last commit date, and progress percentage.
+        Records in commit_task_db are added to any progress already in commit_progress.
         """
         task_commits = {}
+        for task_id, data in self.commit_progress.items():
+            task_commits[task_id] = {
+                'commit_count': data['commit_count'],
+                'last_commit_date': datetime.fromisoformat(data['last_commit_date']),
+            }
         for commit_hash, task_info in self.commit_task_db.items():
             task_id = task_info.get('task_id')
             commit_date_str = task_info.get('commit_date')
@@ -52,11 +96,32 @@ class CommitProgressManager:
     def save_commit_progress(self):
         with open(self.commit_progress_path, 'w', encoding='utf-8') as f:
             json.dump(self.commit_progress, f, indent=2, ensure_ascii=False)
+        if self._cursor is not None:
+            self._save_cursor()
+
+    def _save_cursor(self):
+        cursor = dict(self._cursor, progress=self.commit_progress)
+        with open(self.cursor_path, 'w', encoding='utf-8') as f:
+            json.dump(cursor, f, ensure_ascii=False)
+
+    def compact_commit_task_log(self):
+        """Compact the commit-task log when superseded records have piled up."""
+        if self._cursor is None or not self.commit_task_log.needs_compaction():
+            return False
+        # Compaction only drops superseded records, so the saved progress stays valid;
+        # records appended after this run's read are kept after the cursor
+        offset = self.commit_task_log.compact(keep_from=self._cursor['offset'])
+        self._cursor = {'generation': self.commit_task_log.generation, 'offset': offset}
+        self._save_cursor()
+        return True
 
     def run(self):
         self.load_commit_task_db()
         self.generate_commit_progress()
         self.save_commit_progress()
+        if self._cursor is not None:
+            self.commit_task_log.save_index()
+            self.compact_commit_task_log()
         print(f"Commit progress saved to {self.commit_progress_path}")
 
 if __name__ == "__main__":
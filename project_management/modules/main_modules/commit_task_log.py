@@ -0,0 +1,238 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # no flock() on Windows; appends and compaction are then not serialized
+    fcntl = None
+
+
+def log_path_for(db_path):
+    """JSON-lines log path that sits next to a legacy commit_task_database.json."""
+    return os.path.splitext(db_path)[0] + '.jsonl'
+
+
+class CommitTaskLog:
+    """
+    Append-only JSON-lines store for the commit-task database.
+
+    Each line is one commit entry with its "commit_hash". Appending writes only the
+    new lines, so the cost per commit does not grow with the size of the log. A
+    later record for the same commit hash supersedes the earlier one.
+
+    A sidecar index file maps task_id -> byte offsets of that task's records and
+    commit_hash -> offset of the first record for the hash. The index remembers
+    how far into the log it has scanned, so loading it only reads records added
+    since it was last saved. compact() rewrites the log without superseded
+    records; it changes the log generation, which tells incremental readers that
+    their stored offsets are no longer valid. append() and compact() hold an
+    exclusive lock on a sidecar lock file, so no append is lost to a compaction.
+    """
+
+    def __init__(self, log_path='JSonDataBase/OutPuts/commit_task_database.jsonl', index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + '.idx'
+        self.lock_path = log_path + '.lock'
+        self.generation = None
+        self.scanned_offset = 0
+        self.record_count = 0
+        self.task_index = {}
+        self.commit_index = {}
+        self._index_loaded = False
+
+    def exists(self):
+        return os.path.isfile(self.log_path)
+
+    def size(self):
+        return os.path.getsize(self.log_path) if self.exists() else 0
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the log across processes (a no-op without flock)."""
+        dir_path = os.path.dirname(self.log_path)
+        if dir_path and not os.path.exists(dir_path):
+            os.makedirs(dir_path, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, records):
+        """Append commit entries (dicts with a "commit_hash" key) to the log."""
+        if not records:
+            return
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        with self._locked():
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def read_since(self, start_offset=0):
+        """
+        Records added after start_offset as [(offset, record)], and the offset to
+        resume from next time. A trailing line without a newline is a record still
+        being written and is left for the next read.
+        """
+        records = []
+        end_offset = start_offset
+        if not self.exists():
+            return records, end_offset
+        with open(self.log_path, 'rb') as f:
+            f.seek(start_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if line.strip():
+                    records.append((end_offset, json.loads(line)))
+                end_offset += len(line)
+        return records, end_offset
+
+    def iter_records(self, start_offset=0):
+        records, _ = self.read_since(start_offset)
+        return iter(records)
+
+    def _reset_index(self):
+        self.generation = uuid.uuid4().hex
+        self.scanned_offset = 0
+        self.record_count = 0
+        self.task_index = {}
+        self.commit_index = {}
+
+    def _index_record(self, offset, record):
+        self.record_count += 1
+        commit_hash = record.get('commit_hash')
+        if commit_hash is not None:
+            self.commit_index.setdefault(commit_hash, offset)
+        task_id = record.get('task_id')
+        if task_id is not None:
+            self.task_index.setdefault(str(task_id), []).append(offset)
+
+    def load_index(self):
+        """Load the sidecar index and index any records appended since it was saved."""
+        self._reset_index()
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('offset', 0) <= self.size():
+                    self.generation = data['generation']
+                    self.scanned_offset = data['offset']
+                    self.record_count = data.get('record_count', 0)
+                    self.task_index = data.get('tasks', {})
+                    self.commit_index = data.get('commits', {})
+            except (json.JSONDecodeError, KeyError):
+                self._reset_index()
+        records, self.scanned_offset = self.read_since(self.scanned_offset)
+        for offset, record in records:
+            self._index_record(offset, record)
+        self._index_loaded = True
+
+    def ensure_index(self):
+        if not self._index_loaded:
+            self.load_index()
+        else:
+            records, self.scanned_offset = self.read_since(self.scanned_offset)
+            for offset, record in records:
+                self._index_record(offset, record)
+
+    def save_index(self):
+        data = {
+            'generation': self.generation,
+            'offset': self.scanned_offset,
+            'record_count': self.record_count,
+            'tasks': self.task_index,
+            'commits': self.commit_index,
+        }
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def records_for_task(self, task_id):
+        """All records for a task, read through the task_id index."""
+        self.ensure_index()
+        offsets = self.task_index.get(str(task_id), [])
+        if not offsets:
+            return []
+        records = []
+        with open(self.log_path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def is_first_record(self, offset, record):
+        """True unless an earlier record in the log has the same commit hash."""
+        return self.commit_index.get(record.get('commit_hash'), offset) == offset
+
+    def load_all(self):
+        """The full database as {commit_hash: entry}, later records winning."""
+        db = {}
+        for _, record in self.iter_records():
+            record = dict(record)
+            db[record.pop('commit_hash', None)] = record
+        db.pop(None, None)
+        return db
+
+    def needs_compaction(self, min_records=1000, max_ratio=2.0):
+        self.ensure_index()
+        unique = len(self.commit_index)
+        return self.record_count >= min_records and self.record_count > unique * max_ratio
+
+    def compact(self, keep_from=None):
+        """
+        Rewrite the log keeping only the latest record per commit hash.
+
+        Args:
+            keep_from: Offset a reader has consumed the log up to. Only records
+                before it are compacted; everything from it on is copied as is
+                after them, so the reader can resume from the returned offset.
+
+        Returns:
+            The offset in the compacted log that corresponds to keep_from (the
+            end of the log when keep_from is None)
+        """
+        with self._locked():
+            records, end_offset = self.read_since(0)
+            if keep_from is None:
+                keep_from = end_offset
+            db = {}
+            for offset, record in records:
+                if offset >= keep_from:
+                    break
+                record = dict(record)
+                db[record.pop('commit_hash', None)] = record
+            db.pop(None, None)
+            tmp_path = self.log_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                for commit_hash, entry in db.items():
+                    f.write((json.dumps(dict(entry, commit_hash=commit_hash), ensure_ascii=False) + '\n').encode('utf-8'))
+                new_offset = f.tell()
+                # Records not yet consumed, and any partly written line, are carried over unchanged
+                with open(self.log_path, 'rb') as log_file:
+                    log_file.seek(keep_from)
+                    f.write(log_file.read())
+            os.replace(tmp_path, self.log_path)
+            self._reset_index()
+            self._index_loaded = True
+            self.ensure_index()
+            self.save_index()
+        return new_offset
+
+    def import_json_database(self, db_path):
+        """Seed the log from a legacy {commit_hash: entry} JSON file."""
+        if self.exists() or not os.path.isfile(db_path):
+            return 0
+        try:
+            with open(db_path, 'r', encoding='utf-8') as f:
+                db = json.load(f)
+        except json.JSONDecodeError:
+            return 0
+        self.append([dict(entry, commit_hash=commit_hash) for commit_hash, entry in db.items()])
+        return len(db)
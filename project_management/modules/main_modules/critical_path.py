@@ -0,0 +1,479 @@
+"""
+Critical Path Module - Critical path method (CPM) scheduling over task dependencies
+"""
+
+import heapq
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def strongly_connected_components(nodes: Iterable[int], successors: List[List[int]]) -> List[List[int]]:
+    """
+    Strongly connected components of the subgraph induced by nodes, in
+    topological order of the condensation (iterative Tarjan, O(V + E)).
+
+    Nodes are integer indexes into successors; edges to nodes outside the
+    subgraph are ignored. Each component is sorted.
+    """
+    nodes = list(nodes)
+    n = len(successors)
+    members = bytearray(n)
+    for v in nodes:
+        members[v] = 1
+    # Flat arrays indexed by node keep the inner loop free of hashing
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack, components = [], []
+    counter = 0
+    for root in nodes:
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(successors[root]))]
+        while work:
+            v, edges = work[-1]
+            for w in edges:
+                if not members[w]:
+                    continue
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, iter(successors[w])))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(sorted(component))
+    components.reverse()
+    return components
+
+
+class CriticalPathEngine:
+    """
+    CPM schedule over activities with finish-to-start dependencies.
+
+    Activities are stored by integer index in parallel lists (durations,
+    predecessor and successor index lists, early/late start and finish), so a
+    full compute() - topological sort, forward pass, backward pass - is
+    O(V + E) and holds 100k+ activities comfortably.
+
+    After compute(), set_duration(), add_dependency() and remove_dependency()
+    update the schedule incrementally: early dates are re-propagated through
+    the changed activity's downstream cone and late dates through its upstream
+    cone, stopping wherever a value does not change. Two cases fall back to a
+    full pass: a change of project finish (every late date moves) and a new
+    dependency that contradicts the current topological order.
+
+    Times are offsets from the project start in the unit of the durations.
+    """
+
+    def __init__(self, activities: Iterable[Tuple[Hashable, float, Iterable[Hashable]]] = (),
+                 epsilon: float = 1e-9):
+        """
+        Args:
+            activities: (activity_id, duration, predecessor_ids) tuples
+            epsilon: Slack at or below which an activity is critical
+        """
+        self.epsilon = epsilon
+        self.ids = []
+        self.index = {}
+        self.durations = []
+        self.predecessors = []
+        self.successors = []
+        self.order = []
+        self.position = []
+        self.early_start = []
+        self.early_finish = []
+        self.late_start = []
+        self.late_finish = []
+        self.project_finish = 0.0
+        self.computed = False
+        pending = []
+        for activity_id, duration, predecessors in activities:
+            self.add_activity(activity_id, duration)
+            pending.append((activity_id, predecessors))
+        for activity_id, predecessors in pending:
+            for predecessor_id in predecessors:
+                self._link(self.index[predecessor_id], self.index[activity_id])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, activity_id):
+        return activity_id in self.index
+
+    @staticmethod
+    def _check_duration(activity_id, duration):
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+            raise ValueError(f"Duration of activity {activity_id} must be a non-negative number")
+        return float(duration)
+
+    def add_activity(self, activity_id: Hashable, duration: float) -> None:
+        """Add an activity without dependencies. The schedule is recomputed on the next compute()."""
+        if activity_id in self.index:
+            raise ValueError(f"Duplicate activity id: {activity_id}")
+        self.index[activity_id] = len(self.ids)
+        self.ids.append(activity_id)
+        self.durations.append(self._check_duration(activity_id, duration))
+        self.predecessors.append([])
+        self.successors.append([])
+        self.computed = False
+
+    def _link(self, u: int, v: int) -> None:
+        if u == v:
+            raise ValueError(f"Activity {self.ids[u]} cannot depend on itself")
+        if v not in self.successors[u]:
+            self.successors[u].append(v)
+            self.predecessors[v].append(u)
+
+    def _topological_order(self) -> List[int]:
+        in_degree = [len(preds) for preds in self.predecessors]
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for s in self.successors[i]:
+                in_degree[s] -= 1
+                if in_degree[s] == 0:
+                    queue.append(s)
+        if len(order) < len(self.ids):
+            # Name the activities on a cycle, not everything downstream of it
+            raise ValueError(f"Dependency cycle between activities: {self.find_cycles()[0][:10]}")
+        return order
+
+    def find_cycles(self) -> List[List[Hashable]]:
+        """Groups of activities that depend on each other in a cycle (empty if the graph is acyclic)."""
+        in_degree = [len(preds) for preds in self.predecessors]
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        while queue:
+            i = queue.popleft()
+            for s in self.successors[i]:
+                in_degree[s] -= 1
+                if in_degree[s] == 0:
+                    queue.append(s)
+        remaining = [i for i, degree in enumerate(in_degree) if degree > 0]
+        # Activities downstream of a cycle are left over too, but form components of their own
+        return [[self.ids[i] for i in component]
+                for component in strongly_connected_components(remaining, self.successors) if len(component) > 1]
+
+    def break_cycles(self) -> List[List[Hashable]]:
+        """
+        Remove the dependencies that close a cycle: within each cycle, edges
+        pointing back to an activity added earlier are dropped. Each cycle is
+        logged as a warning.
+
+        Returns:
+            The cycles found, as lists of activity ids
+        """
+        cycles = self.find_cycles()
+        for cycle in cycles:
+            members = {self.index[activity_id] for activity_id in cycle}
+            for u in members:
+                for v in [v for v in self.successors[u] if v in members and v < u]:
+                    self.successors[u].remove(v)
+                    self.predecessors[v].remove(u)
+            logger.warning(f"Ignoring dependencies closing a cycle between activities: {cycle[:10]}")
+        if cycles:
+            self.computed = False
+        return cycles
+
+    def compute(self) -> 'CriticalPathEngine':
+        """Full topological sort, forward pass and backward pass."""
+        self.order = self._topological_order()
+        n = len(self.ids)
+        self.position = [0] * n
+        for position, i in enumerate(self.order):
+            self.position[i] = position
+        self.early_start = [0.0] * n
+        self.early_finish = [0.0] * n
+        self.late_start = [0.0] * n
+        self.late_finish = [0.0] * n
+        es, ef, durations, predecessors = self.early_start, self.early_finish, self.durations, self.predecessors
+        for i in self.order:
+            start = max([ef[p] for p in predecessors[i]], default=0.0)
+            es[i] = start
+            ef[i] = start + durations[i]
+        self.project_finish = max(ef, default=0.0)
+        self._backward_pass()
+        self.computed = True
+        return self
+
+    def _backward_pass(self) -> None:
+        ls, lf, durations, successors = self.late_start, self.late_finish, self.durations, self.successors
+        finish = self.project_finish
+        for i in reversed(self.order):
+            late = min([ls[s] for s in successors[i]], default=finish)
+            lf[i] = late
+            ls[i] = late - durations[i]
+
+    def _propagate_forward(self, start: Iterable[int]) -> Tuple[float, bool]:
+        """
+        Re-propagate early dates from start through the downstream cone.
+
+        Returns:
+            (latest changed early finish, whether an early finish equal to the old project finish dropped)
+        """
+        es, ef, durations = self.early_start, self.early_finish, self.durations
+        predecessors, successors, position, order = self.predecessors, self.successors, self.position, self.order
+        old_finish = self.project_finish
+        latest = 0.0
+        lowered = False
+        heap = sorted({position[i] for i in start})
+        queued = set(heap)
+        while heap:
+            p = heapq.heappop(heap)
+            queued.discard(p)
+            i = order[p]
+            early = max([ef[q] for q in predecessors[i]], default=0.0)
+            finish = early + durations[i]
+            if early == es[i] and finish == ef[i]:
+                continue
+            if finish < ef[i] == old_finish:
+                lowered = True
+            latest = max(latest, finish)
+            es[i] = early
+            ef[i] = finish
+            for s in successors[i]:
+                if position[s] not in queued:
+                    queued.add(position[s])
+                    heapq.heappush(heap, position[s])
+        return latest, lowered
+
+    def _propagate_backward(self, start: Iterable[int]) -> None:
+        ls, lf, durations = self.late_start, self.late_finish, self.durations
+        predecessors, successors, position, order = self.predecessors, self.successors, self.position, self.order
+        finish_default = self.project_finish
+        # Max-heap on topological position, so successors are settled before their predecessors
+        heap = [-p for p in sorted({position[i] for i in start}, reverse=True)]
+        queued = {-p for p in heap}
+        while heap:
+            p = -heapq.heappop(heap)
+            queued.discard(p)
+            i = order[p]
+            late = min([ls[s] for s in successors[i]], default=finish_default)
+            start_time = late - durations[i]
+            if late == lf[i] and start_time == ls[i]:
+                continue
+            lf[i] = late
+            ls[i] = start_time
+            for q in predecessors[i]:
+                if position[q] not in queued:
+                    queued.add(position[q])
+                    heapq.heappush(heap, -position[q])
+
+    def _update(self, forward: Iterable[int], backward: Iterable[int]) -> None:
+        backward = list(backward)
+        previous_finish = self.project_finish
+        latest, lowered = self._propagate_forward(forward)
+        if lowered:
+            # An activity that set the project finish got earlier; the new maximum may be anywhere
+            self.project_finish = max(self.early_finish, default=0.0)
+        else:
+            self.project_finish = max(previous_finish, latest)
+        if self.project_finish != previous_finish:
+            self._backward_pass()
+        else:
+            self._propagate_backward(backward)
+
+    def set_duration(self, activity_id: Hashable, duration: float) -> None:
+        """Change one activity's duration and update the schedule."""
+        i = self.index[activity_id]
+        self.durations[i] = self._check_duration(activity_id, duration)
+        if not self.computed:
+            return
+        self._update([i], [i])
+
+    def _reaches(self, source: int, target: int) -> bool:
+        """True if target is reachable from source through successors."""
+        limit = self.position[target]
+        stack = [source]
+        seen = {source}
+        while stack:
+            i = stack.pop()
+            if i == target:
+                return True
+            for s in self.successors[i]:
+                # Nothing after target in topological order can lead back to it
+                if s not in seen and self.position[s] <= limit:
+                    seen.add(s)
+                    stack.append(s)
+        return False
+
+    def add_dependency(self, predecessor_id: Hashable, successor_id: Hashable) -> None:
+        """Make successor_id start after predecessor_id finishes. Raises ValueError if that creates a cycle."""
+        u = self.index[predecessor_id]
+        v = self.index[successor_id]
+        if v in self.successors[u]:
+            return
+        if not self.computed:
+            self._link(u, v)
+            return
+        if self.position[u] < self.position[v]:
+            self._link(u, v)
+            self._update([v], [u])
+            return
+        if u == v or self._reaches(v, u):
+            raise ValueError(f"Dependency {predecessor_id} -> {successor_id} would create a cycle")
+        # The topological order no longer holds; rebuild it
+        self._link(u, v)
+        self.compute()
+
+    def remove_dependency(self, predecessor_id: Hashable, successor_id: Hashable) -> bool:
+        """Remove a dependency and update the schedule. Returns False if there was none."""
+        u = self.index[predecessor_id]
+        v = self.index[successor_id]
+        if v not in self.successors[u]:
+            return False
+        self.successors[u].remove(v)
+        self.predecessors[v].remove(u)
+        if self.computed:
+            # Removing an edge keeps the topological order valid
+            self._update([v], [u])
+        return True
+
+    def total_slack(self, activity_id: Hashable) -> float:
+        i = self.index[activity_id]
+        return self.late_start[i] - self.early_start[i]
+
+    def free_slack(self, activity_id: Hashable) -> float:
+        i = self.index[activity_id]
+        successor_start = min([self.early_start[s] for s in self.successors[i]], default=self.project_finish)
+        return successor_start - self.early_finish[i]
+
+    def is_critical(self, activity_id: Hashable) -> bool:
+        i = self.index[activity_id]
+        return self.late_start[i] - self.early_start[i] <= self.epsilon
+
+    def critical_activities(self) -> List[Hashable]:
+        """All zero-slack activities, in topological order."""
+        ls, es, eps = self.late_start, self.early_start, self.epsilon
+        return [self.ids[i] for i in self.order if ls[i] - es[i] <= eps]
+
+    def critical_path(self) -> List[Hashable]:
+        """One chain of critical activities from the project start to the project finish."""
+        ls, es, ef, eps = self.late_start, self.early_start, self.early_finish, self.epsilon
+        current = next((i for i in self.order if ls[i] - es[i] <= eps and es[i] <= eps), None)
+        path = []
+        while current is not None:
+            path.append(self.ids[current])
+            finish = ef[current]
+            current = next((s for s in self.successors[current]
+                            if ls[s] - es[s] <= eps and abs(es[s] - finish) <= eps), None)
+        return path
+
+    def schedule(self, activity_id: Hashable) -> Dict[str, Any]:
+        i = self.index[activity_id]
+        slack = self.late_start[i] - self.early_start[i]
+        return {
+            'duration': self.durations[i],
+            'early_start': self.early_start[i],
+            'early_finish': self.early_finish[i],
+            'late_start': self.late_start[i],
+            'late_finish': self.late_finish[i],
+            'total_slack': slack,
+            'critical': slack <= self.epsilon,
+        }
+
+
+def explicit_duration(task: Dict[str, Any]) -> Optional[float]:
+    """A task's duration_days or duration field, if it holds a number."""
+    for key in ('duration_days', 'duration'):
+        value = task.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+            return value
+    return None
+
+
+def build_engine_from_wbs(wbs: Any, duration_of: Optional[Callable[[Dict[str, Any]], float]] = None
+                          ) -> Tuple[CriticalPathEngine, Dict[Hashable, List[Hashable]]]:
+    """
+    CPM engine over the leaf tasks of a WBS (a root node or a list of top-level nodes).
+
+    Leaf tasks are the activities. A leaf depends on the tasks listed in its own
+    'dependencies' and in those of its ancestors; a dependency on a summary task
+    means a dependency on every leaf under it. Unknown ids are ignored with a
+    warning.
+
+    Args:
+        wbs: WBS root dict or list of top-level task dicts
+        duration_of: Duration of a leaf task; defaults to duration_days/duration, else 1
+
+    Returns:
+        (engine, summary_leaves) where summary_leaves maps each summary task id
+        to the ids of the leaves under it
+    """
+    if duration_of is None:
+        duration_of = lambda task: explicit_duration(task) if explicit_duration(task) is not None else 1
+    roots = wbs if isinstance(wbs, list) else ([wbs] if wbs else [])
+    engine = CriticalPathEngine()
+    leaf_dependencies = []
+    summary_leaves = {}
+    # (node, inherited dependency ids, ids of enclosing summaries)
+    stack = [(node, (), ()) for node in reversed(roots)]
+    while stack:
+        node, inherited, ancestors = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        task_id = node.get('id')
+        own = node.get('dependencies') or []
+        dependencies = inherited + tuple(own) if isinstance(own, list) else inherited
+        subtasks = node.get('subtasks')
+        if subtasks:
+            summary_leaves.setdefault(task_id, [])
+            for child in reversed(subtasks):
+                stack.append((child, dependencies, ancestors + (task_id,)))
+            continue
+        if task_id is None or task_id in engine:
+            logger.warning(f"Skipping task without a unique id in CPM schedule: {task_id}")
+            continue
+        engine.add_activity(task_id, duration_of(node))
+        for ancestor in ancestors:
+            summary_leaves[ancestor].append(task_id)
+        leaf_dependencies.append((task_id, dependencies, set(ancestors)))
+
+    for task_id, dependencies, ancestors in leaf_dependencies:
+        for dependency in dependencies:
+            if dependency in ancestors:
+                continue
+            if dependency in summary_leaves:
+                predecessors = summary_leaves[dependency]
+            elif dependency in engine:
+                predecessors = [dependency]
+            else:
+                logger.warning(f"Task {task_id} depends on unknown task {dependency}")
+                continue
+            for predecessor in predecessors:
+                if predecessor != task_id:
+                    engine.add_dependency(predecessor, task_id)
+    return engine.compute(), summary_leaves
+
+
+def critical_task_ids(engine: CriticalPathEngine, summary_leaves: Dict[Hashable, List[Hashable]]) -> set:
+    """Ids of critical leaf tasks and of the summary tasks containing one."""
+    critical = set(engine.critical_activities())
+    critical.update(summary for summary, leaves in summary_leaves.items()
+                    if any(leaf in critical for leaf in leaves))
+    return critical
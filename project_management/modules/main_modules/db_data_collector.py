@@ -14,7 +14,8 @@ class DBDataCollector:
         """
         Collect task data including progress, resource allocation, and store in JSON file.
         """
-        tasks_data = [task.__dict__ for task in tasks]
+        # Slotted tasks (task_management.Task) have no __dict__ and provide to_dict()
+        tasks_data = [task.__dict__ if hasattr(task, '__dict__') else task.to_dict() for task in tasks]
         with open(self.tasks_file, 'w', encoding='utf-8') as f:
             json.dump(tasks_data, f, indent=4)
 
@@ -1,12 +1,211 @@
 import os
 import json
+import heapq
+import logging
 import datetime
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from project_management.modules.main_modules.critical_path import explicit_duration, strongly_connected_components
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _to_date(value, name: str) -> Optional[datetime.date]:
+    if value is None or isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an ISO date (YYYY-MM-DD)")
+
+
+class GanttIndex:
+    """
+    Gantt rows of a WBS, flattened once in display (pre-order) order.
+
+    A segment tree over row positions keeps the earliest start, the latest end
+    and the smallest depth of every block of rows. A windowed query walks the
+    tree from the cursor position and skips whole blocks that cannot hold a
+    visible row, so a page of a 100k-task chart costs roughly
+    O(limit * log n) instead of a pass over every task. A subtree is the
+    contiguous range of positions from its root to its last descendant.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Dict[str, Any], int, Any]]):
+        self.rows = []
+        self.starts = []
+        self.ends = []
+        self.depths = []
+        self.subtree_end = []
+        self.positions = {}
+        open_rows = []
+        for position, (row, depth, parent_id) in enumerate(rows):
+            row = dict(row, parent_id=parent_id, depth=depth)
+            self.rows.append(row)
+            self.starts.append(datetime.date.fromisoformat(row['start_date']).toordinal())
+            self.ends.append(datetime.date.fromisoformat(row['end_date']).toordinal())
+            self.depths.append(depth)
+            self.subtree_end.append(position + 1)
+            self.positions.setdefault(str(row['id']), position)
+            # Rows at this depth or deeper end the subtrees still open on the stack
+            while open_rows and self.depths[open_rows[-1]] >= depth:
+                self.subtree_end[open_rows.pop()] = position
+            open_rows.append(position)
+        for position in open_rows:
+            self.subtree_end[position] = len(self.rows)
+        self._build_tree()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _build_tree(self) -> None:
+        size = 1
+        while size < len(self.rows):
+            size *= 2
+        self.size = size
+        inf = float('inf')
+        self.min_start = [inf] * (2 * size)
+        self.max_end = [-inf] * (2 * size)
+        self.min_depth = [inf] * (2 * size)
+        self.min_start[size:size + len(self.rows)] = self.starts
+        self.max_end[size:size + len(self.rows)] = self.ends
+        self.min_depth[size:size + len(self.rows)] = self.depths
+        for node in range(size - 1, 0, -1):
+            left, right = 2 * node, 2 * node + 1
+            self.min_start[node] = min(self.min_start[left], self.min_start[right])
+            self.max_end[node] = max(self.max_end[left], self.max_end[right])
+            self.min_depth[node] = min(self.min_depth[left], self.min_depth[right])
+
+    def update_dates(self, position: int, start_date: datetime.date, end_date: datetime.date) -> None:
+        """Move the row at position and refresh the tree above it."""
+        self.rows[position]['start_date'] = start_date.isoformat()
+        self.rows[position]['end_date'] = end_date.isoformat()
+        self.starts[position] = start_date.toordinal()
+        self.ends[position] = end_date.toordinal()
+        node = self.size + position
+        self.min_start[node], self.max_end[node] = self.starts[position], self.ends[position]
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            self.min_start[node] = min(self.min_start[left], self.min_start[right])
+            self.max_end[node] = max(self.max_end[left], self.max_end[right])
+            node //= 2
+
+    def _matches(self, lo: int, hi: int, window_start: float, window_end: float, max_depth: float, count: int):
+        """Positions in [lo, hi), in order, of up to count rows inside the window and depth limit."""
+        found = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if (node_hi <= lo or node_lo >= hi or self.min_start[node] > window_end
+                    or self.max_end[node] < window_start or self.min_depth[node] > max_depth):
+                continue
+            if node >= self.size:
+                found.append(node_lo)
+                if len(found) == count:
+                    break
+                continue
+            middle = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, middle, node_hi))
+            stack.append((2 * node, node_lo, middle))
+        return found
+
+    def query(self, start=None, end=None, root_id=None, max_depth: Optional[int] = None,
+              cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        One page of Gantt rows in display order.
+
+        Args:
+            start: Window start (date or ISO string); rows ending before it are skipped
+            end: Window end (date or ISO string); rows starting after it are skipped
+            root_id: Only return this task and its descendants
+            max_depth: Deepest level to return, counted from root_id (or from the top level)
+            cursor: next_cursor of the previous page
+            limit: Page size, 1 to MAX_PAGE_SIZE
+
+        Returns:
+            {'tasks': [...], 'next_cursor': str or None}
+
+        Raises:
+            ValueError: On an invalid date, cursor or limit
+            KeyError: If root_id is not in the WBS
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        start_date, end_date = _to_date(start, 'start'), _to_date(end, 'end')
+        window_start = start_date.toordinal() if start_date else float('-inf')
+        window_end = end_date.toordinal() if end_date else float('inf')
+        lo, hi, base_depth = 0, len(self.rows), 0
+        if root_id is not None:
+            if str(root_id) not in self.positions:
+                raise KeyError(f"Task {root_id} not found")
+            lo = self.positions[str(root_id)]
+            hi, base_depth = self.subtree_end[lo], self.depths[lo]
+        depth_limit = base_depth + max_depth if max_depth is not None else float('inf')
+        if cursor:
+            try:
+                position = int(cursor)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+            if position < lo:
+                raise ValueError("Invalid cursor")
+            lo = position
+
+        found = self._matches(lo, hi, window_start, window_end, depth_limit, limit + 1)
+        next_cursor = str(found.pop()) if len(found) > limit else None
+        return {'tasks': [dict(self.rows[position]) for position in found], 'next_cursor': next_cursor}
+
+
+def _dependency(entry) -> Tuple[Any, float]:
+    """(task id, lag in days) of a dependency given as an id or as {'id'/'task_id', 'lag'/'lag_days'}."""
+    if isinstance(entry, dict):
+        task_id = entry.get('id', entry.get('task_id'))
+        lag = entry.get('lag', entry.get('lag_days', 0))
+    else:
+        task_id, lag = entry, 0
+    if not isinstance(lag, (int, float)) or isinstance(lag, bool):
+        lag = 0
+    return task_id, lag
+
 
 class GanttChartData:
+    """
+    Gantt rows of a WBS with dependency-driven dates.
+
+    A task starts at the latest of its own start_date (or, without one, its
+    parent's start, or today) and the end of every task it depends on plus
+    that dependency's lag (finish-to-start). Dates are computed once per
+    schedule() in topological order over dependency and parent-child edges,
+    each task's earliest start memoized for its dependents and subtasks.
+    Dependency cycles are reported in dependency_cycles and their internal
+    edges are ignored. update_task() then moves a task and re-propagates only
+    through the tasks downstream of it.
+
+    A summary task's bar ends when its own duration and all of its subtasks
+    have finished, and tasks outside it that depend on it wait for that end,
+    as in build_engine_from_wbs. Each summary has an extra finish node in the
+    graph (positions after the rows) that rolls up its subtasks' ends.
+    """
+
     def __init__(self, input_dir: str = 'project_inputs/PM_JSON/user_inputs'):
         self.input_dir = input_dir
         self.tasks = []
+        self.dependency_cycles = []
+
+    @property
+    def tasks(self):
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        # New tasks invalidate the computed rows and the index over them
+        self._tasks = tasks
+        self._rows = None
+        self._index = None
 
     def load_tasks(self):
         path = os.path.join(self.input_dir, 'detailed_wbs.json')
@@ -25,6 +224,226 @@ class GanttChartData:
         except Exception:
             return None
 
+    def _flatten(self) -> None:
+        """Flatten tasks in pre-order into rows and the dependency graph between their positions."""
+        roots = [self.tasks] if isinstance(self.tasks, dict) else self.tasks
+        self._rows, self._depths, self._parents = [], [], []
+        self._fixed_start, self._durations, self._dependencies = [], [], []
+        self.positions = {}
+        stack = [(task, 0, None) for task in reversed(roots)]
+        while stack:
+            task, depth, parent = stack.pop()
+            position = len(self._rows)
+            task_id = task.get('id')
+            dependencies = task.get('dependencies', [])
+            progress = task.get('progress', 0) * 100 if isinstance(task.get('progress'), float) else task.get('progress', 0)
+            self._rows.append({
+                'id': task_id,
+                'name': task.get('name') or task.get('title') or f"Task {task_id}",
+                'start_date': None,
+                'end_date': None,
+                'dependencies': dependencies,
+                'progress': progress,
+            })
+            self._depths.append(depth)
+            self._parents.append(parent)
+            self._fixed_start.append(self.parse_date(task.get('start_date')))
+            duration = explicit_duration(task)
+            self._durations.append(duration if duration is not None else 1)
+            self._dependencies.append(dependencies if isinstance(dependencies, list) else [])
+            self.positions.setdefault(str(task_id), position)
+            for subtask in reversed(task.get('subtasks') or []):
+                stack.append((subtask, depth + 1, position))
+
+        n = len(self._rows)
+        children = [[] for _ in range(n)]
+        for position in range(n):
+            if self._parents[position] is not None:
+                children[self._parents[position]].append(position)
+        # Rows are in pre-order, so a subtree is the positions from its root to subtree_end
+        subtree_end = list(range(1, n + 1))
+        for position in range(n - 1, -1, -1):
+            if children[position]:
+                subtree_end[position] = subtree_end[children[position][-1]]
+        # finish[p]: graph node holding the rolled-up end of summary row p (p itself for leaves)
+        self._finish = list(range(n))
+        self._summary_of = []
+        for position in range(n):
+            if children[position]:
+                self._finish[position] = n + len(self._summary_of)
+                self._summary_of.append(position)
+
+        total = n + len(self._summary_of)
+        # predecessors[v]: (node, lag) pairs v finishes-to-starts after; successors: dependents,
+        # subtasks and finish nodes
+        self._predecessors = [[] for _ in range(total)]
+        self._successors = [[] for _ in range(total)]
+
+        def link(predecessor, successor, lag=0):
+            self._predecessors[successor].append((predecessor, lag))
+            self._successors[predecessor].append(successor)
+
+        for position in range(n):
+            parent = self._parents[position]
+            if parent is not None:
+                self._successors[parent].append(position)
+            for entry in self._dependencies[position]:
+                task_id, lag = _dependency(entry)
+                predecessor = self.positions.get(str(task_id))
+                if predecessor is None:
+                    logger.warning(f"Task {self._rows[position]['id']} depends on unknown task {task_id}")
+                    continue
+                # A task inside the summary it depends on only waits for the summary's own duration
+                if not predecessor <= position < subtree_end[predecessor]:
+                    predecessor = self._finish[predecessor]
+                link(predecessor, position, lag)
+        for summary in self._summary_of:
+            link(summary, self._finish[summary])
+            for child in children[summary]:
+                link(self._finish[child], self._finish[summary])
+
+    def _row_of(self, node: int) -> int:
+        """Row position of a graph node (a finish node belongs to its summary row)."""
+        return node if node < len(self._rows) else self._summary_of[node - len(self._rows)]
+
+    def _order(self) -> List[int]:
+        """Topological order of all positions; cycles are recorded and placed after their inputs."""
+        n = len(self._successors)
+        indegree = [0] * n
+        for successors in self._successors:
+            for s in successors:
+                indegree[s] += 1
+        ready = deque(position for position in range(n) if indegree[position] == 0)
+        order = []
+        while ready:
+            position = ready.popleft()
+            order.append(position)
+            for s in self._successors[position]:
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    ready.append(s)
+        self.dependency_cycles = []
+        if len(order) < n:
+            done = set(order)
+            remaining = [position for position in range(n) if position not in done]
+            for component in strongly_connected_components(remaining, self._successors):
+                if len(component) > 1 or component[0] in self._successors[component[0]]:
+                    rows = sorted({self._row_of(node) for node in component})
+                    self.dependency_cycles.append([self._rows[position]['id'] for position in rows])
+                order.extend(component)
+            logger.warning(f"Dependency cycles in Gantt data: {self.dependency_cycles}")
+        return order
+
+    def _compute(self, position: int) -> bool:
+        """Set the dates of one graph node from its memoized predecessors; True if they changed."""
+        rank = self._rank[position]
+        if position >= len(self._rows):
+            # Finish node: the latest end of the summary and of its subtasks
+            end = max((self._end[predecessor] for predecessor, _ in self._predecessors[position]
+                       if self._rank[predecessor] < rank), default=None)
+            summary = self._row_of(position)
+            end = end or self._end[summary]
+            if end == self._end[position]:
+                return False
+            self._end[position] = end
+            self._rows[summary]['end_date'] = end.isoformat()
+            return True
+        parent = self._parents[position]
+        start = self._fixed_start[position] or (self._start[parent] if parent is not None else self._today)
+        for predecessor, lag in self._predecessors[position]:
+            # Predecessors ranked later are inside a cycle with this task; their edges are ignored
+            if self._rank[predecessor] < rank:
+                start = max(start, self._end[predecessor] + datetime.timedelta(days=lag))
+        end = start + datetime.timedelta(days=self._durations[position])
+        if start == self._start[position] and end == self._end[position]:
+            return False
+        self._start[position], self._end[position] = start, end
+        row = self._rows[position]
+        row['start_date'] = start.isoformat()
+        if self._finish[position] == position:
+            row['end_date'] = end.isoformat()
+        return True
+
+    def _row_dates(self, position: int) -> Tuple[datetime.date, datetime.date]:
+        """Displayed start and end of a row; a summary ends with its finish node."""
+        return self._start[position], self._end[self._finish[position]]
+
+    def schedule(self) -> List[Dict[str, Any]]:
+        """Flatten the tasks and compute every row's dates. Returns the rows in pre-order."""
+        self._today = datetime.date.today()
+        self._index = None
+        self._flatten()
+        order = self._order()
+        self._rank = [0] * len(order)
+        for rank, position in enumerate(order):
+            self._rank[position] = rank
+        self._start = [None] * len(order)
+        self._end = [None] * len(order)
+        for position in order:
+            self._compute(position)
+        return self._rows
+
+    def update_task(self, task_id, start_date=None, duration_days=None) -> List[Any]:
+        """
+        Change a task's own start date and/or duration and shift the tasks that
+        depend on it, directly or through subtasks. Only tasks downstream of the
+        change are visited, in topological order, and propagation stops at tasks
+        whose dates do not move. The input task dicts are not modified.
+
+        Args:
+            task_id: Task to change
+            start_date: New start_date (date or ISO string)
+            duration_days: New duration in days (a non-negative number)
+
+        Returns:
+            Ids of the tasks whose dates changed
+
+        Raises:
+            KeyError: If task_id is not in the WBS
+            ValueError: On an invalid start_date or duration_days
+        """
+        self.rows()
+        if str(task_id) not in self.positions:
+            raise KeyError(f"Task {task_id} not found")
+        position = self.positions[str(task_id)]
+        if duration_days is not None and explicit_duration({'duration_days': duration_days}) is None:
+            raise ValueError("duration_days must be a non-negative number")
+        if start_date is not None:
+            self._fixed_start[position] = _to_date(start_date, 'start_date')
+        if duration_days is not None:
+            self._durations[position] = duration_days
+
+        changed = []
+        changed_rows = set()
+        pending = [(self._rank[position], position)]
+        queued = {position}
+        while pending:
+            _, current = heapq.heappop(pending)
+            if not self._compute(current):
+                continue
+            row = self._row_of(current)
+            if row not in changed_rows:
+                changed_rows.add(row)
+                changed.append(self._rows[row]['id'])
+            if self._index is not None:
+                self._index.update_dates(row, *self._row_dates(row))
+            for s in self._successors[current]:
+                if s not in queued:
+                    queued.add(s)
+                    heapq.heappush(pending, (self._rank[s], s))
+        return changed
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """The scheduled rows, computing them on first use."""
+        return self._rows if self._rows is not None else self.schedule()
+
+    def iter_rows(self):
+        """Yield (row, depth, parent_id) for every task in pre-order."""
+        rows = self.rows()
+        for position, row in enumerate(rows):
+            parent = self._parents[position]
+            yield row, self._depths[position], rows[parent]['id'] if parent is not None else None
+
     def build_gantt_data(self) -> List[Dict[str, Any]]:
         """
         Build Gantt chart data from tasks.
@@ -32,40 +451,21 @@ class GanttChartData:
             - id
             - name
             - start_date
-            - end_date (calculated from start_date + duration)
-            - dependencies (list of task ids)
+            - end_date (start_date + duration, after its dependencies and their lag)
+            - dependencies (list of task ids or {'id', 'lag'} dicts)
             - progress (0-100)
         """
-        gantt_data = []
-
-        def process_task(task, parent_start: Optional[datetime.date] = None):
-            task_id = task.get('id')
-            name = task.get('name') or task.get('title') or f"Task {task_id}"
-            start_date_str = task.get('start_date')
-            duration_days = task.get('duration_days') or task.get('duration') or 1
-            dependencies = task.get('dependencies', [])
-
-            start_date = self.parse_date(start_date_str) or parent_start or datetime.date.today()
-            end_date = start_date + datetime.timedelta(days=duration_days)
-
-            progress = task.get('progress', 0) * 100 if isinstance(task.get('progress'), float) else task.get('progress', 0)
-
-            gantt_data.append({
-                'id': task_id,
-                'name': name,
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'dependencies': dependencies,
-                'progress': progress,
-            })
-
-            for subtask in task.get('subtasks', []):
-                process_task(subtask, start_date)
+        return [dict(row) for row in self.rows()]
 
-        for task in self.tasks:
-            process_task(task)
+    def get_index(self) -> GanttIndex:
+        """GanttIndex over the loaded tasks, built on first use and kept current by update_task()."""
+        if self._index is None:
+            self._index = GanttIndex(self.iter_rows())
+        return self._index
 
-        return gantt_data
+    def query(self, **kwargs) -> Dict[str, Any]:
+        """One page of Gantt rows; see GanttIndex.query for the arguments."""
+        return self.get_index().query(**kwargs)
 
 def generate_gantt_chart(tasks):
     """Generate Gantt chart data from a list of tasks."""
@@ -1,18 +1,25 @@
 import subprocess
 import re
 from collections import defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import json
 import os
+import tempfile
 
 # Global instance for module-level functions
 _global_git_progress_updater = None
 
+GIT_LOG_FORMAT = "--pretty=format:==COMMIT==%n%H%n%s%n%b%n==END=="
+TASK_ID_PATTERN = re.compile(r'\b\d+(?:\.\d+)*\b')
+
 class GitProgressUpdater:
-    def __init__(self, workflow_definition: List[Dict[str, Any]] = None):
+    def __init__(self, workflow_definition: List[Dict[str, Any]] = None, repo_path: str = None):
         self.workflow_definition = workflow_definition or []
+        self.repo_path = repo_path
         self.task_progress = defaultdict(float)
         self.data_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../data/git_progress_data.json')
+        # Last processed commit and running task-id counts per branch, stored next to the progress data
+        self.cursor_file_path = os.path.join(os.path.dirname(self.data_file_path), 'git_progress_cursor.json')
         self._load_progress_data()
 
     def _load_progress_data(self):
@@ -34,57 +41,157 @@ class GitProgressUpdater:
         except Exception as e:
             print(f"Failed to save progress data: {e}")
 
+    def _load_cursor(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if os.path.exists(self.cursor_file_path):
+                with open(self.cursor_file_path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Failed to load git progress cursor: {e}")
+        return {}
+
+    def _save_cursor(self, cursor: Dict[str, Dict[str, Any]]):
+        try:
+            os.makedirs(os.path.dirname(self.cursor_file_path), exist_ok=True)
+            with open(self.cursor_file_path, 'w') as f:
+                json.dump(cursor, f)
+        except Exception as e:
+            print(f"Failed to save git progress cursor: {e}")
+
+    def _git_output(self, args: List[str]) -> str:
+        try:
+            result = subprocess.run(["git"] + args, capture_output=True, text=True, check=True, cwd=self.repo_path)
+            return result.stdout.strip()
+        except (subprocess.CalledProcessError, OSError):
+            return ""
+
     def run_git_log(self) -> str:
         try:
             result = subprocess.run(
-                ["git", "log", "--name-only", "--pretty=format:%H%n%s%n%b%n==END=="],
+                ["git", "log", "--name-only", GIT_LOG_FORMAT],
                 capture_output=True,
                 text=True,
                 check=True,
+                cwd=self.repo_path,
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
             print(f"Git log command failed: {e}")
             return ""
 
+    def iter_git_log(self, revision_range: str = "HEAD") -> Iterator[Dict[str, Any]]:
+        """
+        Stream commits of `git log <revision_range>` from the subprocess pipe,
+        parsing line by line instead of buffering the whole output.
+        Raises subprocess.CalledProcessError if git exits with an error.
+        """
+        # stderr goes to a file: a second pipe left unread while stdout is
+        # consumed could fill up and block git
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                ["git", "log", "--name-only", GIT_LOG_FORMAT, revision_range],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                cwd=self.repo_path,
+            )
+            try:
+                yield from self.parse_git_log_lines(process.stdout)
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, process.args, stderr=stderr)
+
+    def parse_git_log_lines(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Parse git log output produced with GIT_LOG_FORMAT, yielding one commit at a time.
+        Each commit starts with ==COMMIT==, then hash, subject and body up to ==END==,
+        followed by the file names from --name-only.
+        """
+        commit = None
+        in_message = False
+        for line in lines:
+            line = line.rstrip('\n')
+            if line == '==COMMIT==':
+                if commit is not None:
+                    yield commit
+                commit = {"hash": None, "message": [], "files": []}
+                in_message = True
+            elif commit is None:
+                continue
+            elif commit["hash"] is None:
+                commit["hash"] = line.strip()
+            elif in_message:
+                if line.strip() == '==END==':
+                    commit["message"] = "\n".join(commit["message"]).strip()
+                    in_message = False
+                else:
+                    commit["message"].append(line)
+            elif line.strip():
+                commit["files"].append(line.strip())
+        if commit is not None:
+            if in_message:
+                commit["message"] = "\n".join(commit["message"]).strip()
+            yield commit
+
     def parse_git_log(self, log_text: str) -> List[Dict[str, Any]]:
-        commits = []
-        lines = log_text.splitlines()
-        i = 0
-        while i < len(lines):
-            commit_hash = lines[i].strip()
-            i += 1
-            message_lines = []
-            while i < len(lines) and lines[i].strip() != '' and lines[i].strip() != '==END==':
-                message_lines.append(lines[i])
-                i += 1
-            message = "\n".join(message_lines).strip()
-            files = []
-            while i < len(lines) and lines[i].strip() != '==END==':
-                if lines[i].strip() != '':
-                    files.append(lines[i].strip())
-                i += 1
-            i += 1
-            commits.append({
-                "hash": commit_hash,
-                "message": message,
-                "files": files
-            })
-        return commits
+        return list(self.parse_git_log_lines(log_text.splitlines()))
 
-    def map_commits_to_tasks(self, commits: List[Dict[str, Any]]) -> Dict[str, float]:
-        task_progress_counts = defaultdict(int)
+    def count_task_ids(self, commits: Iterable[Dict[str, Any]], counts: Dict[str, int] = None) -> Dict[str, int]:
+        """Add the task IDs referenced by each commit message to the running counts."""
+        counts = defaultdict(int, counts or {})
         for commit in commits:
-            message = commit['message']
-            # Improved regex to capture task IDs like 1, 1.1, 1.1.1 etc.
-            task_ids = re.findall(r'\b\d+(?:\.\d+)*\b', message)
-            for task_id in task_ids:
-                task_progress_counts[task_id] += 1
-        if task_progress_counts:
-            max_count = max(task_progress_counts.values())
-            for task_id in task_progress_counts:
-                task_progress_counts[task_id] = (task_progress_counts[task_id] / max_count) * 100
-        return task_progress_counts
+            # Capture task IDs like 1, 1.1, 1.1.1 etc.
+            for task_id in TASK_ID_PATTERN.findall(commit['message']):
+                counts[task_id] += 1
+        return counts
+
+    def normalize_task_counts(self, counts: Dict[str, int]) -> Dict[str, float]:
+        task_progress = defaultdict(float)
+        if counts:
+            max_count = max(counts.values())
+            for task_id, count in counts.items():
+                task_progress[task_id] = (count / max_count) * 100
+        return task_progress
+
+    def map_commits_to_tasks(self, commits: List[Dict[str, Any]]) -> Dict[str, float]:
+        return self.normalize_task_counts(self.count_task_ids(commits))
+
+    def update_commit_counts(self) -> Dict[str, int]:
+        """
+        Bring the per-branch running task-id counts up to date by reading only
+        `<last processed commit>..HEAD`. Falls back to a full scan when there is
+        no cursor yet or the cursor is no longer an ancestor of HEAD (rewritten
+        history). Returns None if git is unavailable.
+        """
+        head = self._git_output(["rev-parse", "HEAD"])
+        if not head:
+            return None
+        branch = self._git_output(["rev-parse", "--abbrev-ref", "HEAD"]) or "HEAD"
+        cursor = self._load_cursor()
+        state = cursor.get(branch) or {"last_commit": None, "task_counts": {}}
+        last_commit = state.get("last_commit")
+        if last_commit == head:
+            return state["task_counts"]
+
+        counts = state.get("task_counts", {})
+        if last_commit and subprocess.run(["git", "merge-base", "--is-ancestor", last_commit, head],
+                                          capture_output=True, cwd=self.repo_path).returncode == 0:
+            revision_range = f"{last_commit}..{head}"
+        else:
+            revision_range = head
+            counts = {}
+        try:
+            counts = self.count_task_ids(self.iter_git_log(revision_range), counts)
+        except subprocess.CalledProcessError as e:
+            print(f"Git log command failed: {e}")
+            return None
+        cursor[branch] = {"last_commit": head, "task_counts": dict(counts)}
+        self._save_cursor(cursor)
+        return cursor[branch]["task_counts"]
 
     def calculate_workflow_progress(self) -> Dict[str, float]:
         # Placeholder for actual workflow step completion tracking
@@ -98,12 +205,11 @@ class GitProgressUpdater:
         return combined
 
     def update_progress(self) -> Dict[str, float]:
-        log_text = self.run_git_log()
-        if not log_text:
+        counts = self.update_commit_counts()
+        if not counts:
             print("No git log data available.")
             return {}
-        commits = self.parse_git_log(log_text)
-        commit_progress = self.map_commits_to_tasks(commits)
+        commit_progress = self.normalize_task_counts(counts)
         workflow_progress = self.calculate_workflow_progress()
         combined_progress = self.combine_progress(commit_progress, workflow_progress)
         return combined_progress
@@ -1,12 +1,53 @@
 import json
 import os
 import logging
+import datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for batch scoring
+    np = None
+
+from project_management.modules.main_modules.critical_path import build_engine_from_wbs, critical_task_ids
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+PRIORITY_MAP = {
+    "low": 1,
+    "medium": 5,
+    "high": 10,
+    "بالا": 10,
+    "اهم": 10,
+}
+_EPOCH = datetime.datetime(1970, 1, 1)
+_URGENCY_WINDOW_SECONDS = 3 * 24 * 3600
+
+class BatchScores:
+    """
+    Result of ImportanceUrgencyCalculator.score_batch.
+    ids, importance and urgency are aligned per flattened WBS row (pre-order);
+    rows that failed validation, or parents without valid subtasks, hold NaN.
+    errors is a list of {'row', 'id', 'field', 'error'} dicts.
+    """
+
+    def __init__(self, ids, parent_index, importance, urgency, errors):
+        self.ids = ids
+        self.parent_index = parent_index
+        self.importance = importance
+        self.urgency = urgency
+        self.errors = errors
+
+    def to_dict(self):
+        scores = {}
+        valid = ~(np.isnan(self.importance) | np.isnan(self.urgency))
+        for row in np.flatnonzero(valid).tolist():
+            scores[self.ids[row]] = {'importance': float(self.importance[row]),
+                                     'urgency': float(self.urgency[row])}
+        return scores
+
 class ImportanceUrgencyCalculator:
-    def __init__(self, wbs_data):
+    def __init__(self, wbs_data, critical_path_ids=None):
         """
         wbs_data: list of dicts representing tasks with hierarchical structure
         Each task dict should have:
@@ -15,10 +56,19 @@ class ImportanceUrgencyCalculator:
             - level: hierarchical level (int)
             - subtasks: list of subtasks (same structure)
             - other metadata as needed
+        critical_path_ids: optional set of task ids on the critical path, e.g. from
+            critical_path.critical_task_ids; when given it replaces the tasks'
+            own critical_path fields
         """
         self.wbs_data = wbs_data
+        self.critical_path_ids = set(critical_path_ids) if critical_path_ids is not None else None
         self.task_scores = {}
 
+    def is_critical(self, task):
+        if self.critical_path_ids is not None:
+            return task.get('id') in self.critical_path_ids
+        return bool(task.get('critical_path', False))
+
     def score_task(self, task):
         """
         Recursively score a task based on its subtasks or base criteria.
@@ -59,8 +109,7 @@ class ImportanceUrgencyCalculator:
                 raise TypeError("dependencies must be a list")
             dependency_factor = min(1, len(dependencies) / 10)
 
-            critical_path = task.get('critical_path', False)
-            critical_path_factor = 1 if critical_path else 0
+            critical_path_factor = 1 if self.is_critical(task) else 0
 
             cost_impact = task.get('cost_impact', 0)
             if isinstance(cost_impact, bool):
@@ -75,14 +124,7 @@ class ImportanceUrgencyCalculator:
             if isinstance(priority, bool):
                 raise TypeError("priority must not be a boolean")
             if isinstance(priority, str):
-                priority_map = {
-                    "low": 1,
-                    "medium": 5,
-                    "high": 10,
-                    "بالا": 10,
-                    "اهم": 10,
-                }
-                priority_factor = priority_map.get(priority.lower(), 0) / 10
+                priority_factor = PRIORITY_MAP.get(priority.lower(), 0) / 10
             elif isinstance(priority, (int, float)) and not isinstance(priority, bool):
                 if priority < 0 or priority > 10:
                     raise TypeError("priority numeric value out of range")
@@ -114,7 +156,6 @@ class ImportanceUrgencyCalculator:
         if task is None:
             raise TypeError("Task cannot be None")
         try:
-            import datetime
             now = datetime.datetime.now()
             deadline_str = task.get('deadline', None)
             if deadline_str is None:
@@ -169,6 +210,214 @@ class ImportanceUrgencyCalculator:
             self.score_task(task)
         return self.task_scores
 
+    def flatten_wbs(self):
+        """
+        Flatten the WBS once into NumPy columns (pre-order rows).
+        Leaf fields are validated per row; invalid rows are reported in the
+        returned errors list instead of raising on the first bad task.
+        Returns (ids, columns, errors) where columns is a dict of arrays:
+        parent_index, depth, is_leaf, valid, dependency_count, critical_path,
+        cost_impact, priority, deadline_epoch, risk_of_delay, stakeholder_pressure.
+        """
+        if np is None:
+            raise ImportError("numpy is required for batch scoring")
+        ids = []
+        errors = []
+        deadline_cache = {}
+        numbers = (int, float)
+        nan = float('nan')
+
+        def deadline_epoch(value):
+            epoch = deadline_cache.get(value)
+            if epoch is None:
+                try:
+                    deadline = datetime.datetime.fromisoformat(value)
+                    # Timezone-aware deadlines cannot be compared with now() and score 0
+                    epoch = nan if deadline.tzinfo else (deadline - _EPOCH).total_seconds()
+                except ValueError:
+                    epoch = nan
+                deadline_cache[value] = epoch
+            return epoch
+
+        def validate_leaf(task, row):
+            """Slow path: mirror calculate_importance/calculate_urgency checks, collecting errors."""
+            task_id = task.get('id')
+            values = {}
+            dependencies = task.get('dependencies', [])
+            if isinstance(dependencies, list):
+                values['dependencies'] = len(dependencies)
+            else:
+                errors.append({'row': row, 'id': task_id, 'field': 'dependencies',
+                               'error': "dependencies must be a list"})
+            for name in ('cost_impact', 'risk_of_delay', 'stakeholder_pressure'):
+                value = task.get(name, 0)
+                if isinstance(value, bool):
+                    errors.append({'row': row, 'id': task_id, 'field': name, 'error': f"{name} must not be a boolean"})
+                elif not isinstance(value, numbers):
+                    errors.append({'row': row, 'id': task_id, 'field': name, 'error': f"{name} must be a number"})
+                else:
+                    values[name] = value
+            priority = task.get('priority', 0)
+            message = None
+            if priority is None:
+                message = "priority must not be None"
+            elif isinstance(priority, bool):
+                message = "priority must not be a boolean"
+            elif isinstance(priority, str):
+                values['priority'] = PRIORITY_MAP.get(priority.lower(), 0)
+            elif isinstance(priority, numbers):
+                if 0 <= priority <= 10:
+                    values['priority'] = priority
+                else:
+                    message = "priority numeric value out of range"
+            else:
+                message = "priority must be a number or recognized string"
+            if message:
+                errors.append({'row': row, 'id': task_id, 'field': 'priority', 'error': message})
+            deadline = task.get('deadline', None)
+            if deadline is None:
+                values['deadline'] = nan
+            elif isinstance(deadline, (bool, int, float)) or deadline == '':
+                errors.append({'row': row, 'id': task_id, 'field': 'deadline',
+                               'error': "deadline must be a string in ISO format"})
+            else:
+                values['deadline'] = deadline_epoch(deadline if isinstance(deadline, str) else str(deadline))
+            if len(values) < 6:
+                return None
+            return (values['dependencies'], values['cost_impact'], values['priority'], values['deadline'],
+                    values['risk_of_delay'], values['stakeholder_pressure'])
+
+        parent_index = []
+        depth = []
+        is_leaf = []
+        valid = []
+        dependency_count = []
+        critical_path = []
+        cost_impact = []
+        priority = []
+        deadline = []
+        risk_of_delay = []
+        stakeholder_pressure = []
+        columns = (parent_index, depth, is_leaf, valid, dependency_count, critical_path,
+                   cost_impact, priority, deadline, risk_of_delay, stakeholder_pressure)
+        appends = [column.append for column in columns]
+        is_critical = self.is_critical
+        parent_row_values = (0, 1, 0, 0, 0, 0, nan, 0, 0)
+        invalid_row_values = (1, 0, 0, 0, 0, 0, nan, 0, 0)
+
+        stack = [(task, -1, 0) for task in reversed(self.wbs_data)]
+        while stack:
+            task, parent_row, level = stack.pop()
+            row = len(ids)
+            get = task.get
+            ids.append(get('id'))
+            subtasks = get('subtasks')
+            if subtasks:
+                values = (parent_row, level) + parent_row_values
+                stack.extend((subtask, row, level + 1) for subtask in reversed(subtasks))
+            else:
+                # Fast path for well-typed leaves, falling back to validate_leaf otherwise
+                task_dependencies = get('dependencies', [])
+                task_cost = get('cost_impact', 0)
+                task_priority = get('priority', 0)
+                task_deadline = get('deadline', None)
+                task_risk = get('risk_of_delay', 0)
+                task_pressure = get('stakeholder_pressure', 0)
+                priority_type = type(task_priority)
+                if priority_type is str:
+                    task_priority = PRIORITY_MAP.get(task_priority.lower(), 0)
+                elif priority_type not in numbers or not 0 <= task_priority <= 10:
+                    task_priority = None
+                if task_deadline is None:
+                    task_deadline = nan
+                elif type(task_deadline) is str and task_deadline:
+                    task_deadline = deadline_epoch(task_deadline)
+                else:
+                    task_deadline = None
+                if (type(task_dependencies) is list and type(task_cost) in numbers and task_priority is not None
+                        and task_deadline is not None and type(task_risk) in numbers
+                        and type(task_pressure) in numbers):
+                    fields = (len(task_dependencies), task_cost, task_priority, task_deadline, task_risk, task_pressure)
+                else:
+                    fields = validate_leaf(task, row)
+                task_critical = 1 if is_critical(task) else 0
+                if fields is None:
+                    values = (parent_row, level) + invalid_row_values
+                else:
+                    values = (parent_row, level, 1, 1, fields[0], task_critical) + fields[1:]
+            for append, value in zip(appends, values):
+                append(value)
+
+        columns = {
+            'parent_index': np.array(parent_index, dtype=np.int64),
+            'depth': np.array(depth, dtype=np.int64),
+            'is_leaf': np.array(is_leaf, dtype=bool),
+            'valid': np.array(valid, dtype=bool),
+            'dependency_count': np.array(dependency_count, dtype=np.float64),
+            'critical_path': np.array(critical_path, dtype=bool),
+            'cost_impact': np.array(cost_impact, dtype=np.float64),
+            'priority': np.array(priority, dtype=np.float64),
+            'deadline_epoch': np.array(deadline, dtype=np.float64),
+            'risk_of_delay': np.array(risk_of_delay, dtype=np.float64),
+            'stakeholder_pressure': np.array(stakeholder_pressure, dtype=np.float64),
+        }
+        return ids, columns, errors
+
+    def score_batch(self, now=None, flattened=None):
+        """
+        Score the whole WBS with array expressions instead of per-task calls.
+        Leaf scores use the same formulas as calculate_importance/calculate_urgency;
+        parent scores are the mean of their valid subtasks, computed level by level
+        with segment sums (np.bincount) from the deepest level up.
+        flattened: optional result of flatten_wbs() to reuse across scoring runs.
+        Returns a BatchScores instance.
+        """
+        ids, c, errors = flattened or self.flatten_wbs()
+        now = now or datetime.datetime.now()
+        now_epoch = (now - _EPOCH).total_seconds()
+
+        importance = np.round(100 * (0.3 * np.minimum(1, c['dependency_count'] / 10) +
+                                     0.3 * c['critical_path'] +
+                                     0.2 * np.minimum(1, c['cost_impact'] / 100000) +
+                                     0.2 * np.minimum(1, c['priority'] / 10)), 2)
+        remaining = (c['deadline_epoch'] - now_epoch) / _URGENCY_WINDOW_SECONDS
+        time_factor = np.where(np.isnan(remaining), 0, 1 - np.clip(remaining, 0, 1))
+        urgency = np.round(100 * (0.5 * time_factor +
+                                  0.3 * np.minimum(1, c['risk_of_delay'] / 10) +
+                                  0.2 * np.minimum(1, c['stakeholder_pressure'] / 10)), 2)
+
+        scored = c['is_leaf'] & c['valid']
+        importance[~scored] = np.nan
+        urgency[~scored] = np.nan
+
+        parent_index = c['parent_index']
+        depth = c['depth']
+        size = len(ids)
+        for level in range(int(depth.max()) if size else 0, 0, -1):
+            rows = np.flatnonzero((depth == level) & ~np.isnan(importance))
+            if not len(rows):
+                continue
+            parents = parent_index[rows]
+            counts = np.bincount(parents, minlength=size)
+            has_children = counts > 0
+            importance_sums = np.bincount(parents, weights=importance[rows], minlength=size)
+            urgency_sums = np.bincount(parents, weights=urgency[rows], minlength=size)
+            importance[has_children] = importance_sums[has_children] / counts[has_children]
+            urgency[has_children] = urgency_sums[has_children] / counts[has_children]
+
+        return BatchScores(ids, parent_index, importance, urgency, errors)
+
+    def calculate_all_batch(self, now=None):
+        """
+        Batch equivalent of calculate_all: fills and returns self.task_scores.
+        Rows that failed validation are logged and left out of the scores.
+        """
+        result = self.score_batch(now=now)
+        for error in result.errors:
+            logger.error(f"Error scoring task {error['id']} ({error['field']}): {error['error']}")
+        self.task_scores = result.to_dict()
+        return self.task_scores
+
 def load_wbs_from_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
@@ -187,7 +436,8 @@ if __name__ == "__main__":
     except FileNotFoundError:
         print(f"Error: WBS data file not found at {wbs_file}")
         exit(1)
-    calculator = ImportanceUrgencyCalculator(wbs_data)
+    engine, summary_leaves = build_engine_from_wbs(wbs_data)
+    calculator = ImportanceUrgencyCalculator(wbs_data, critical_task_ids(engine, summary_leaves))
     scores = calculator.calculate_all()
     save_scores_to_json(scores, scores_file)
     print(f"Importance and urgency scores saved to {scores_file}")
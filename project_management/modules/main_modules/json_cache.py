@@ -0,0 +1,177 @@
+"""
+JSON Cache Module - Process-wide cache of parsed JSON documents
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Cached JSON documents are read-only; load with copy=True to modify")
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict returned for cached documents. It is still a dict, so
+    isinstance checks, .get() and json.dump work unchanged; copy() and
+    copy.deepcopy() return ordinary, mutable dicts.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list counterpart of FrozenDict."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def copy(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Read-only view of a parsed JSON value; values that are already frozen are returned as they are."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable copy of a parsed JSON value, frozen or not."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _read_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class JSONDocumentCache:
+    """
+    LRU cache of parsed JSON files keyed by path, validated against the file's
+    mtime and size on every lookup, so a file changed on disk is re-read.
+
+    Documents are stored as read-only views (FrozenDict/FrozenList) and shared
+    between callers; pass copy=True to get a private mutable copy instead.
+    The memory cap is counted in bytes of JSON text (file sizes); a document
+    larger than the cap is returned but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, path: str, copy: bool = False) -> Any:
+        """
+        Parsed contents of a JSON file.
+
+        Args:
+            path: JSON file path
+            copy: Return a mutable copy instead of the shared read-only view
+
+        Returns:
+            Parsed document
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Nothing to validate a cached copy against; read the file directly
+            return _read_json(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return thaw(entry[1]) if copy else entry[1]
+            self.misses += 1
+
+        data = _read_json(path)
+        if stat.st_size > self.max_bytes:
+            return data if copy else freeze(data)
+        view = freeze(data)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (signature, view)
+            self.current_bytes += stat.st_size
+            while self._entries and (self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                self._discard(next(iter(self._entries)))
+        # The freshly parsed data is not shared with the cache, so it can be handed out as the copy
+        return data if copy else view
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[0][1]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one path from the cache, or everything if path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+            else:
+                self._discard(os.path.abspath(path))
+
+
+_document_cache = JSONDocumentCache()
+
+
+def get_document_cache() -> JSONDocumentCache:
+    return _document_cache
+
+
+def load_json_cached(path: str, copy: bool = False) -> Any:
+    """Load a JSON file through the process-wide document cache."""
+    return _document_cache.load(path, copy=copy)
+
+
+def invalidate_cached_json(path: Optional[str] = None) -> None:
+    _document_cache.invalidate(path)
@@ -16,6 +16,13 @@ class ProgressCalculator:
         self.commit_progress = {}
         self.importance_cache = {}
         self.urgency_cache = {}
+        # Indexes built by build_indexes() so per-task lookups are O(1)
+        self.task_index = {}
+        self.workflow_step_index = {}
+        self.workflow_counts = {}
+        self.combined_progress = {}
+        self._step_completed = {}
+        self._indexed_sources = None
 
     def load_json_file(self, filename: str) -> Any:
         path = os.path.join(self.input_dir, filename)
@@ -30,6 +37,42 @@ class ProgressCalculator:
         self.tasks = self.load_json_file('detailed_wbs.json') or []
         self.workflow_steps = self.load_json_file('workflow_definition.json') or []
         self.commit_progress = self.load_json_file('commit_progress.json') or {}
+        self.build_indexes()
+
+    @staticmethod
+    def _workflow_step_key(step: dict):
+        return step.get('step_id', step.get('id', step.get('name', step.get('step'))))
+
+    def build_indexes(self):
+        """Index tasks by id and workflow steps by task id, with per-task completed/total counts."""
+        self.task_index = {}
+        for task in self.tasks:
+            task_id = task.get('id')
+            if task_id is not None and task_id not in self.task_index:
+                self.task_index[task_id] = task
+        self.workflow_step_index = {}
+        self.workflow_counts = {}
+        self._step_completed = {}
+        for step in self.workflow_steps:
+            task_id = step.get('task_id')
+            counts = self.workflow_counts.setdefault(task_id, [0, 0])
+            counts[1] += 1
+            if step.get('completed', False):
+                counts[0] += 1
+            step_key = self._workflow_step_key(step)
+            if step_key is not None and (task_id, step_key) not in self.workflow_step_index:
+                self.workflow_step_index[(task_id, step_key)] = step
+                self._step_completed[(task_id, step_key)] = bool(step.get('completed', False))
+        self.combined_progress = {}
+        self._indexed_sources = self._index_sources()
+
+    def _index_sources(self):
+        return (id(self.tasks), len(self.tasks), id(self.workflow_steps), len(self.workflow_steps))
+
+    def _ensure_indexes(self):
+        # Rebuild if tasks/workflow_steps were replaced or resized outside load_inputs/update_*
+        if self._indexed_sources != self._index_sources():
+            self.build_indexes()
 
     def calculate_commit_progress(self, task_id: str) -> float:
         """Return commit-based progress percentage for a task."""
@@ -37,11 +80,11 @@ class ProgressCalculator:
 
     def calculate_workflow_progress(self, task_id: str) -> float:
         """Calculate workflow progress as ratio of completed steps to total steps for the task."""
-        steps = [step for step in self.workflow_steps if step.get('task_id') == task_id]
-        if not steps:
+        self._ensure_indexes()
+        counts = self.workflow_counts.get(task_id)
+        if not counts or not counts[1]:
             return 0.0
-        completed_steps = sum(1 for step in steps if step.get('completed', False))
-        return completed_steps / len(steps)
+        return counts[0] / counts[1]
 
     def calculate_combined_progress(self, task_id: str, weight_commit: float = 0.5, weight_workflow: float = 0.5) -> float:
         """
@@ -51,7 +94,8 @@ class ProgressCalculator:
         commit_prog = self.calculate_commit_progress(task_id)
         workflow_prog = self.calculate_workflow_progress(task_id)
         combined = (commit_prog * weight_commit) + (workflow_prog * weight_workflow)
-        task = next((t for t in self.tasks if t.get('id') == task_id), None)
+        self._ensure_indexes()
+        task = self.task_index.get(task_id)
         if task:
             status = task.get('status', '').lower()
             if status == 'completed' and combined < 1.0:
@@ -60,6 +104,50 @@ class ProgressCalculator:
                 combined = min(combined, 0.5)
         return combined
 
+    def refresh_task_progress(self, task_id: str) -> float:
+        """Recompute the cached combined progress of one task and update the task dict in place."""
+        progress = self.calculate_combined_progress(task_id)
+        self.combined_progress[task_id] = progress
+        task = self.task_index.get(task_id)
+        if task is not None and 'progress' in task:
+            task['progress'] = progress
+        return progress
+
+    def update_workflow_step(self, step: dict) -> float:
+        """
+        Apply a single workflow step change (new step or completed flag change)
+        and refresh only the affected task's combined progress.
+        Steps are matched on task_id plus step_id/id/name/step.
+        """
+        self._ensure_indexes()
+        task_id = step.get('task_id')
+        step_key = self._workflow_step_key(step)
+        index_key = (task_id, step_key)
+        existing = self.workflow_step_index.get(index_key) if step_key is not None else None
+        counts = self.workflow_counts.setdefault(task_id, [0, 0])
+        if existing is None:
+            was_completed = False
+            self.workflow_steps.append(step)
+            counts[1] += 1
+            if step_key is not None:
+                self.workflow_step_index[index_key] = step
+        else:
+            was_completed = self._step_completed[index_key]
+            if existing is not step:
+                existing.update(step)
+                step = existing
+        is_completed = bool(step.get('completed', False))
+        counts[0] += is_completed - was_completed
+        if step_key is not None:
+            self._step_completed[index_key] = is_completed
+        self._indexed_sources = self._index_sources()
+        return self.refresh_task_progress(task_id)
+
+    def update_commit_progress(self, task_id: str, progress: float) -> float:
+        """Apply a single commit progress entry and refresh only that task's combined progress."""
+        self.commit_progress[task_id] = progress
+        return self.refresh_task_progress(task_id)
+
     def calculate_dynamic_importance(self, task: dict) -> float:
         """
         Calculate dynamic importance score based on:
@@ -136,6 +224,7 @@ class ProgressCalculator:
                 self.urgency_cache[task_id] = urgency
             score = self.calculate_score(importance, urgency)
             progress = self.calculate_combined_progress(task_id)
+            self.combined_progress[task_id] = progress
             task['importance'] = importance
             task['urgency'] = urgency
             task['score'] = score
@@ -1,7 +1,9 @@
 import os
-import json
 from datetime import datetime
 
+from project_management.modules.main_modules.commit_task_log import CommitTaskLog, log_path_for
+from project_management.modules.main_modules.json_cache import load_json_cached
+
 DASHBOARD_PATH = os.path.join('JSonDataBase', 'OutPuts', 'progress_report.md')
 
 class ProgressReport:
@@ -13,12 +15,12 @@ class ProgressReport:
     def load_json(self, path):
         if not os.path.exists(path):
             raise FileNotFoundError(f"JSON file not found: {path}")
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached(path)
 
     def generate_progress_summary(self):
         progress_data = self.load_json(self.progress_path)
-        task_db = self.load_json(self.task_db_path)
+        task_log = CommitTaskLog(log_path_for(self.task_db_path))
+        task_db = task_log.load_all() if task_log.exists() else self.load_json(self.task_db_path)
 
         total_tasks = len(task_db)
         completed_tasks = sum(1 for v in progress_data.values() if v >= 100)
@@ -2,6 +2,8 @@
 import json
 import os
 
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json
+
 class BaseManagement:
     def __init__(self, input_paths: dict, output_path: str):
         """
@@ -15,13 +17,13 @@ class BaseManagement:
 
     def load_json(self, path):
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_cached(path)
         return None
 
     def save_json(self, data, path):
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        invalidate_cached_json(path)
 
     def load_inputs(self):
         for key, path in self.input_paths.items():
@@ -2,6 +2,9 @@ import json
 import os
 from datetime import datetime
 
+from project_management.modules.main_modules.wbs_index import WBSIndex
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json
+
 class ResourceAllocationManager:
     def __init__(self,
                  resource_allocation_path='JSonDataBase/Inputs/UserInputs/task_resource_allocation.json',
@@ -20,25 +23,38 @@ class ResourceAllocationManager:
         self.resource_costs = {}
 
         self.task_cost_summary = {}
+        self._wbs_index = None
 
     def load_json(self, path):
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # The WBS is modified in place, so take a private copy of the cached document
+            return load_json_cached(path, copy=True)
         return None
 
     def save_json(self, data, path):
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        invalidate_cached_json(path)
 
     def load_inputs(self):
         self.resource_allocations = self.load_json(self.resource_allocation_path) or []
         self.detailed_wbs = self.load_json(self.detailed_wbs_path) or {}
         self.resource_costs = self.load_json(self.resource_costs_path) or {}
 
+    @property
+    def wbs_index(self):
+        """WBSIndex over detailed_wbs, rebuilt when detailed_wbs is replaced."""
+        if self._wbs_index is None or self._wbs_index.root is not self.detailed_wbs:
+            self._wbs_index = WBSIndex(self.detailed_wbs)
+        return self._wbs_index
+
+    def invalidate_wbs_index(self):
+        """Call after changing detailed_wbs in place without going through the index."""
+        self._wbs_index = None
+
     def find_task_by_id(self, task_id, node=None):
         if node is None:
-            node = self.detailed_wbs
+            return self.wbs_index.get(task_id)
         if not node:
             return None
         if node.get('id') == task_id:
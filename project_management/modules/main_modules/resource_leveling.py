@@ -1,17 +1,102 @@
 import json
+import heapq
+import logging
+from bisect import bisect_right
 from collections import defaultdict
 
+from project_management.modules.main_modules.critical_path import CriticalPathEngine
+
+DURATION_TYPES = ('optimistic', 'normal', 'pessimistic')
+PRIORITY_RULES = ('slack', 'priority')
+PRIORITY_VALUES = {"low": 1, "medium": 5, "high": 10}
+
+logger = logging.getLogger(__name__)
+
+
+def _as_number(value):
+    """Whole-hour times are written as ints, as before leveling used floats."""
+    return int(value) if float(value).is_integer() else value
+
+
+class ResourceTimeline:
+    """
+    Usage of one resource over time as a step function: usage[k] units are in
+    use from times[k] up to times[k + 1] (the last step runs forever and is
+    always 0). Lookups are a bisect plus a scan over the steps the task spans.
+    """
+
+    def __init__(self, capacity=1):
+        if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 1:
+            raise ValueError(f"Resource capacity must be a positive integer, got {capacity!r}")
+        self.capacity = capacity
+        self.times = [0.0]
+        self.usage = [0]
+
+    def _split(self, time):
+        """Index of the step starting at time, adding a breakpoint if needed."""
+        k = bisect_right(self.times, time) - 1
+        if k >= 0 and self.times[k] == time:
+            return k
+        if k < 0:
+            self.times.insert(0, time)
+            self.usage.insert(0, 0)
+            return 0
+        self.times.insert(k + 1, time)
+        self.usage.insert(k + 1, self.usage[k])
+        return k + 1
+
+    def reserve(self, start, end, units=1):
+        if end <= start:
+            return
+        first = self._split(start)
+        last = self._split(end)
+        for k in range(first, last):
+            self.usage[k] += units
+
+    def block(self, start, end):
+        """Make the resource unavailable from start to end (e.g. a calendar holiday)."""
+        self.reserve(start, end, self.capacity)
+
+    def earliest_fit(self, start, duration, units=1):
+        """Earliest time >= start at which units are free for the whole duration."""
+        if units > self.capacity:
+            raise ValueError(f"Cannot fit {units} units on a resource with capacity {self.capacity}")
+        times, usage, limit = self.times, self.usage, self.capacity - units
+        k = max(bisect_right(times, start) - 1, 0)
+        candidate = start
+        while True:
+            if usage[k] > limit:
+                candidate = times[k + 1]
+            elif k + 1 == len(times) or times[k + 1] >= candidate + duration:
+                return candidate
+            k += 1
+
+
 class ResourceLeveler:
-    def __init__(self, tasks_filepath, allocations_filepath, output_filepath, duration_type='normal'):
+    def __init__(self, tasks_filepath, allocations_filepath, output_filepath, duration_type='normal',
+                 priority_rule='slack', resource_capacities=None, resource_calendars=None):
+        if duration_type not in DURATION_TYPES:
+            raise ValueError(f"duration_type must be one of {DURATION_TYPES}")
+        if priority_rule not in PRIORITY_RULES:
+            raise ValueError(f"priority_rule must be one of {PRIORITY_RULES}")
         self.tasks_filepath = tasks_filepath
         self.allocations_filepath = allocations_filepath
         self.output_filepath = output_filepath
         self.duration_type = duration_type  # 'optimistic', 'normal', or 'pessimistic'
+        self.priority_rule = priority_rule  # 'slack' (least latest start first) or 'priority'
+        # resource_id -> units available at once (default 1)
+        self.resource_capacities = resource_capacities or {}
+        for resource_id, capacity in self.resource_capacities.items():
+            if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 1:
+                raise ValueError(f"Capacity of resource {resource_id} must be a positive integer, got {capacity!r}")
+        # resource_id -> [{'start': hours, 'end': hours}] periods when the resource is unavailable
+        self.resource_calendars = resource_calendars or {}
         self.tasks = []
         self.allocations = []
         self.flat_tasks = []
         self.task_map = {}
         self.task_schedules = {}
+        self.resource_schedules = {}
 
     def load_json_file(self, filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -34,43 +119,151 @@ class ResourceLeveler:
             flat_list.extend(self.flatten_tasks(subtasks, task_copy['id']))
         return flat_list
 
+    def task_duration(self, task):
+        return task.get(f'{self.duration_type}_hours', 1)  # default 1 hour if missing
+
+    def priority_key(self, task, late_start):
+        """Heap key of an eligible task: least latest start first, or highest priority first."""
+        if self.priority_rule == 'priority':
+            priority = task.get('priority', 0)
+            if isinstance(priority, str):
+                priority = PRIORITY_VALUES.get(priority.lower(), 0)
+            elif not isinstance(priority, (int, float)) or isinstance(priority, bool):
+                priority = 0
+            return (-priority, late_start)
+        return (late_start,)
+
     def resource_leveling(self):
         """
-        Basic resource leveling algorithm:
-        - For each resource, ensure tasks assigned do not overlap in time.
-        - Adjust task start times to avoid resource conflicts.
-        Note: This is a simplified example assuming tasks have duration fields and no explicit start/end dates.
+        Resource-constrained scheduling with a serial schedule generation scheme:
+        - Leaf tasks, and summary tasks with allocations, are activities; 'dependencies' are
+          finish-to-start constraints (see _build_engine).
+        - A CPM pass gives each task its latest start; eligible tasks (all predecessors
+          scheduled) are kept in a heap ordered by that slack, or by task priority.
+        - Each popped task starts at the earliest time after its predecessors finish at
+          which every resource allocated to it has free capacity for the whole duration.
+          Resource usage is kept per resource in a step-function timeline, and calendar
+          blocks are reserved on those timelines up front.
+        Times are in hours from the project start. Only tasks with allocations are returned.
         """
         # Map task_id to task details
         self.task_map = {task['id']: task for task in self.flat_tasks}
 
-        # Map resource_id to list of assigned tasks
-        resource_tasks = defaultdict(list)
+        # Map task_id to the resources (roles) it needs
+        task_resources = defaultdict(list)
         for alloc in self.allocations:
             # Use 'task_id' and 'role' from allocation to assign resource_id as role for demo
             resource_id = alloc.get('role', 'unknown')
-            resource_tasks[resource_id].append(alloc['task_id'])
-
-        # Assign start and end times per resource
-        resource_schedules = {}
-
-        for resource_id, task_ids in resource_tasks.items():
-            current_time = 0
-            schedule = []
-            for tid in task_ids:
-                task = self.task_map.get(tid)
-                if not task:
-                    continue
-                duration = task.get(f'{self.duration_type}_hours', 1)  # default 1 hour if missing
-                start = current_time
-                end = start + duration
-                schedule.append({'task_id': tid, 'start': start, 'end': end})
-                self.task_schedules[tid] = {'resource_id': resource_id, 'start': start, 'end': end}
-                current_time = end  # next task starts after current ends
-            resource_schedules[resource_id] = schedule
+            if alloc['task_id'] in self.task_map and resource_id not in task_resources[alloc['task_id']]:
+                task_resources[alloc['task_id']].append(resource_id)
+        task_resources = {task_id: roles for task_id, roles in task_resources.items() if roles}
+
+        timelines = {}
+        for resource_id in {role for roles in task_resources.values() for role in roles}:
+            timeline = ResourceTimeline(self.resource_capacities.get(resource_id, 1))
+            for block in self.resource_calendars.get(resource_id, []):
+                timeline.block(block['start'], block['end'])
+            timelines[resource_id] = timeline
 
+        engine = self._build_engine(task_resources)
+        ids = engine.ids
+        durations = engine.durations
+        predecessors = engine.predecessors
+        successors = engine.successors
+        remaining = [len(preds) for preds in predecessors]
+        finish = [0.0] * len(ids)
+        keys = [self.priority_key(self.task_map[task_id], engine.late_start[i]) for i, task_id in enumerate(ids)]
+        eligible = [(keys[i], i) for i in range(len(ids)) if remaining[i] == 0]
+        heapq.heapify(eligible)
+
+        self.task_schedules = {}
+        self.resource_schedules = defaultdict(list)
+        while eligible:
+            _, i = heapq.heappop(eligible)
+            task_id = ids[i]
+            duration = durations[i]
+            start = max([finish[p] for p in predecessors[i]], default=0.0)
+            roles = task_resources.get(task_id, [])
+            if roles and duration > 0:
+                start = self._earliest_common_start([timelines[role] for role in roles], start, duration)
+                for role in roles:
+                    timelines[role].reserve(start, start + duration)
+            finish[i] = start + duration
+            if roles:
+                start, end = _as_number(start), _as_number(finish[i])
+                self.task_schedules[task_id] = {'resource_id': roles[0], 'resources': roles, 'start': start, 'end': end}
+                for role in roles:
+                    self.resource_schedules[role].append({'task_id': task_id, 'start': start, 'end': end})
+            for s in successors[i]:
+                remaining[s] -= 1
+                if remaining[s] == 0:
+                    heapq.heappush(eligible, (keys[s], s))
+
+        for schedule in self.resource_schedules.values():
+            schedule.sort(key=lambda entry: entry['start'])
+        self.resource_schedules = dict(self.resource_schedules)
         return self.task_schedules
 
+    def _build_engine(self, task_resources):
+        """
+        CPM engine over the tasks to schedule: leaf tasks, plus summary tasks
+        that have resources allocated. As in build_engine_from_wbs, a task also
+        waits for the dependencies of its ancestors, and a dependency on a
+        summary task is a dependency on every leaf under it. Dependencies that
+        close a cycle are logged and ignored.
+        """
+        children = defaultdict(list)
+        for task_id, task in self.task_map.items():
+            if task.get('parent_id') in self.task_map:
+                children[task['parent_id']].append(task_id)
+
+        engine = CriticalPathEngine()
+        for task_id, task in self.task_map.items():
+            if task_id not in children or task_id in task_resources:
+                engine.add_activity(task_id, self.task_duration(task))
+
+        leaves = {}
+
+        def leaves_under(summary_id):
+            if summary_id not in leaves:
+                found, stack = [], [summary_id]
+                while stack:
+                    node = stack.pop()
+                    if node in children:
+                        stack.extend(children[node])
+                    if node != summary_id and node in engine:
+                        found.append(node)
+                leaves[summary_id] = found + ([summary_id] if summary_id in engine else [])
+            return leaves[summary_id]
+
+        for task_id in engine.ids:
+            ancestors = []
+            parent = self.task_map[task_id].get('parent_id')
+            while parent in self.task_map and parent not in ancestors:
+                ancestors.append(parent)
+                parent = self.task_map[parent].get('parent_id')
+            for owner in [task_id] + ancestors:
+                for dependency in self.task_map[owner].get('dependencies') or []:
+                    if dependency not in self.task_map or dependency in ancestors:
+                        continue
+                    predecessors = leaves_under(dependency) if dependency in children else [dependency]
+                    for predecessor in predecessors:
+                        if predecessor != task_id and predecessor in engine:
+                            engine.add_dependency(predecessor, task_id)
+        engine.break_cycles()
+        return engine.compute()
+
+    @staticmethod
+    def _earliest_common_start(timelines, start, duration):
+        """Earliest time from start at which all timelines can take the task."""
+        while True:
+            candidate = start
+            for timeline in timelines:
+                candidate = timeline.earliest_fit(candidate, duration)
+            if candidate == start:
+                return start
+            start = candidate
+
     def run(self):
         self.tasks = self.load_json_file(self.tasks_filepath)
         self.allocations = self.load_json_file(self.allocations_filepath)
@@ -0,0 +1,235 @@
+"""
+Schedule Simulation Module - Monte Carlo schedule risk analysis over three-point estimates
+"""
+
+import datetime
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed to run simulations
+    np = None
+
+from project_management.modules.main_modules.critical_path import build_engine_from_wbs
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ('pert', 'triangular')
+DEFAULT_PERCENTILES = (50, 80, 95)
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _hours(value: Any, default: float) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+        return float(value)
+    return default
+
+
+def three_point_estimate(task: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    (optimistic, most likely, pessimistic) hours of a task.
+
+    Missing or invalid estimates fall back to normal_hours, and normal_hours to
+    1 hour, as in ResourceLeveler; the three values are sorted so that
+    optimistic <= most likely <= pessimistic.
+    """
+    normal = _hours(task.get('normal_hours'), 1.0)
+    optimistic = _hours(task.get('optimistic_hours'), normal)
+    pessimistic = _hours(task.get('pessimistic_hours'), normal)
+    low, mode, high = sorted((optimistic, normal, pessimistic))
+    return low, mode, high
+
+
+class SimulationModel:
+    """
+    Arrays needed to simulate a task network, small and picklable so it can be
+    shipped to worker processes: three-point estimates per task and, per task
+    in topological order, the indexes of its predecessors.
+    """
+
+    def __init__(self, low, mode, high, order, predecessors, distribution='pert'):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+        self.low = low
+        self.mode = mode
+        self.high = high
+        self.order = order
+        self.predecessors = predecessors
+        self.distribution = distribution
+
+    def __len__(self):
+        return len(self.low)
+
+    def sample_durations(self, iterations: int, rng) -> 'np.ndarray':
+        """iterations x tasks matrix of sampled durations."""
+        low, mode, high = self.low, self.mode, self.high
+        durations = np.broadcast_to(mode, (iterations, len(mode))).copy()
+        spread = high - low
+        # Tasks without spread keep their single estimate
+        varying = np.flatnonzero(spread > 0)
+        if varying.size:
+            low, mode, high, spread = low[varying], mode[varying], high[varying], spread[varying]
+            if self.distribution == 'pert':
+                # Beta-PERT with the usual weight of 4 on the most likely value
+                alpha = 1 + 4 * (mode - low) / spread
+                beta = 1 + 4 * (high - mode) / spread
+                durations[:, varying] = low + spread * rng.beta(alpha, beta, size=(iterations, varying.size))
+            else:
+                durations[:, varying] = rng.triangular(low, mode, high, size=(iterations, varying.size))
+        return durations
+
+
+def _simulate_chunk(model: SimulationModel, iterations: int, seed) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Simulate one chunk of iterations.
+
+    The forward and backward passes loop over tasks in topological order; each
+    step is a vectorized operation across all iterations of the chunk.
+
+    Returns:
+        (project finish per iteration, number of iterations each task was critical in)
+    """
+    rng = np.random.default_rng(seed)
+    # Work task-major (one contiguous row of iterations per task) so every step touches contiguous memory
+    durations = np.ascontiguousarray(model.sample_durations(iterations, rng).T)
+    n = len(model)
+    finish = np.empty((n, iterations))
+    for j in model.order:
+        preds = model.predecessors[j]
+        if not preds:
+            finish[j] = durations[j]
+        elif len(preds) == 1:
+            np.add(finish[preds[0]], durations[j], out=finish[j])
+        else:
+            np.add(finish[preds].max(axis=0), durations[j], out=finish[j])
+    project_finish = finish.max(axis=0) if n else np.zeros(iterations)
+
+    # Backward pass: latest finish of every task, starting from the project finish
+    late_finish = np.empty((n, iterations))
+    late_finish[:] = project_finish
+    late_start = np.empty(iterations)
+    for j in reversed(model.order):
+        np.subtract(late_finish[j], durations[j], out=late_start)
+        for p in model.predecessors[j]:
+            np.minimum(late_finish[p], late_start, out=late_finish[p])
+    tolerance = 1e-9 * np.maximum(project_finish, 1.0)
+    critical_counts = (late_finish - finish <= tolerance).sum(axis=1)
+    return project_finish, critical_counts
+
+
+class SimulationResult:
+    """
+    Result of ScheduleSimulation.run.
+
+    project_finish holds the simulated project duration (hours) of every
+    iteration; criticality maps each task id to the share of iterations in
+    which the task had no slack.
+    """
+
+    def __init__(self, project_finish, criticality: Dict[Hashable, float], distribution: str):
+        self.project_finish = project_finish
+        self.criticality = criticality
+        self.distribution = distribution
+
+    @property
+    def iterations(self) -> int:
+        return int(self.project_finish.size)
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """Project duration in hours at each percentile, e.g. {'P50': 120.0, ...}."""
+        percentiles = list(percentiles)
+        if not self.iterations:
+            return {f"P{p:g}": 0.0 for p in percentiles}
+        values = np.percentile(self.project_finish, percentiles)
+        return {f"P{p:g}": float(value) for p, value in zip(percentiles, values)}
+
+    def finish_dates(self, start_date: datetime.datetime, hours_per_day: float = 8,
+                     percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, str]:
+        """
+        Project finish date at each percentile, counting hours_per_day working
+        hours per calendar day from start_date (weekends are not skipped).
+        """
+        return {key: (start_date + datetime.timedelta(days=hours / hours_per_day)).isoformat()
+                for key, hours in self.percentiles(percentiles).items()}
+
+    def to_dict(self, start_date: Optional[datetime.datetime] = None, hours_per_day: float = 8,
+                percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        percentiles = list(percentiles)
+        result = {
+            'iterations': self.iterations,
+            'distribution': self.distribution,
+            'mean_hours': float(self.project_finish.mean()) if self.iterations else 0.0,
+            'percentile_hours': self.percentiles(percentiles),
+            'criticality': dict(self.criticality),
+        }
+        if start_date is not None:
+            result['finish_dates'] = self.finish_dates(start_date, hours_per_day, percentiles)
+        return result
+
+
+class ScheduleSimulation:
+    """
+    Monte Carlo simulation of a WBS schedule.
+
+    Every leaf task's duration is drawn from a beta-PERT or triangular
+    distribution over its optimistic/normal/pessimistic hours, for all
+    iterations at once as an iterations x tasks matrix. Dependencies follow
+    build_engine_from_wbs: leaves inherit their ancestors' dependencies and a
+    dependency on a summary task waits for all of its leaves.
+
+    Iterations are simulated in chunks of chunk_size, each with its own seed
+    derived from the simulation seed, so the result for a given seed does not
+    depend on how many worker processes share the chunks.
+    """
+
+    def __init__(self, wbs: Any, distribution: str = 'pert', seed: Optional[int] = None):
+        if np is None:
+            raise ImportError("numpy is required for schedule simulation")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+        estimates = {}
+
+        def most_likely(task):
+            estimates[task['id']] = three_point_estimate(task)
+            return estimates[task['id']][1]
+
+        engine, _ = build_engine_from_wbs(wbs, duration_of=most_likely)
+        self.task_ids = list(engine.ids)
+        low, mode, high = (np.array([estimates[task_id][k] for task_id in self.task_ids], dtype=np.float64)
+                           for k in range(3))
+        self.model = SimulationModel(low, mode, high, list(engine.order),
+                                     [list(preds) for preds in engine.predecessors], distribution)
+        self.seed = seed
+
+    def run(self, iterations: int = 10000, workers: int = 1,
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> SimulationResult:
+        """
+        Run the simulation.
+
+        Args:
+            iterations: Number of simulated schedules
+            workers: Worker processes to split the chunks across; 1 runs in-process
+            chunk_size: Iterations simulated per chunk (bounds memory per worker)
+
+        Returns:
+            SimulationResult
+        """
+        if iterations < 0 or chunk_size < 1:
+            raise ValueError("iterations must be non-negative and chunk_size positive")
+        sizes = [min(chunk_size, iterations - start) for start in range(0, iterations, chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        if workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+                chunks = list(pool.map(_simulate_chunk, [self.model] * len(sizes), sizes, seeds))
+        else:
+            chunks = [_simulate_chunk(self.model, size, seed) for size, seed in zip(sizes, seeds)]
+
+        project_finish = np.concatenate([finish for finish, _ in chunks]) if chunks else np.zeros(0)
+        counts = sum((counts for _, counts in chunks), np.zeros(len(self.task_ids), dtype=np.int64))
+        share = counts / iterations if iterations else counts.astype(np.float64)
+        criticality = {task_id: float(value) for task_id, value in zip(self.task_ids, share.tolist())}
+        logger.info(f"Simulated {iterations} schedules of {len(self.task_ids)} tasks")
+        return SimulationResult(project_finish, criticality, self.model.distribution)
@@ -2,6 +2,9 @@ import json
 import os
 from datetime import datetime
 
+from project_management.modules.main_modules.wbs_index import WBSIndex
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json
+
 class ScopeManagement:
     def __init__(self,
                  detailed_wbs_path='JSonDataBase/Inputs/UserInputs/detailed_wbs.json',
@@ -14,21 +17,34 @@ class ScopeManagement:
         self.detailed_wbs = {}
         self.scope_changes = []
         self.scope_status = {}
+        self._wbs_index = None
 
     def load_json(self, path):
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # The WBS is modified in place, so take a private copy of the cached document
+            return load_json_cached(path, copy=True)
         return None
 
     def save_json(self, data, path):
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        invalidate_cached_json(path)
 
     def load_inputs(self):
         self.detailed_wbs = self.load_json(self.detailed_wbs_path) or {}
         self.scope_changes = self.load_json(self.scope_changes_path) or []
 
+    @property
+    def wbs_index(self):
+        """WBSIndex over detailed_wbs, rebuilt when detailed_wbs is replaced."""
+        if self._wbs_index is None or self._wbs_index.root is not self.detailed_wbs:
+            self._wbs_index = WBSIndex(self.detailed_wbs)
+        return self._wbs_index
+
+    def invalidate_wbs_index(self):
+        """Call after changing detailed_wbs in place without going through the index."""
+        self._wbs_index = None
+
     def apply_scope_changes(self):
         """
         Apply scope changes to the detailed WBS.
@@ -42,6 +58,7 @@ class ScopeManagement:
             'removed_tasks': [],
             'modified_tasks': []
         }
+        index = self.wbs_index
         for change in self.scope_changes:
             task_id = change.get('task_id')
             change_type = change.get('change_type')
@@ -51,28 +68,22 @@ class ScopeManagement:
                 parent_id = details.get('parent_id')
                 new_task = details.get('task')
                 if parent_id and new_task:
-                    parent_task = self.find_task_by_id(parent_id)
-                    if parent_task is not None:
-                        if 'subtasks' not in parent_task:
-                            parent_task['subtasks'] = []
-                        parent_task['subtasks'].append(new_task)
+                    if index.add(parent_id, new_task):
                         self.scope_status['added_tasks'].append(new_task['id'])
             elif change_type == 'remove':
-                # Remove task by id
-                removed = self.remove_task_by_id(task_id)
+                # Remove task by id; the subtasks lists are compacted once after the loop
+                removed = index.remove(task_id, deferred=True)
                 if removed:
                     self.scope_status['removed_tasks'].append(task_id)
             elif change_type == 'modify':
                 # Modify task attributes
-                task = self.find_task_by_id(task_id)
-                if task:
-                    for key, value in details.items():
-                        task[key] = value
+                if index.update(task_id, details):
                     self.scope_status['modified_tasks'].append(task_id)
+        index.flush()
 
     def find_task_by_id(self, task_id, node=None):
         if node is None:
-            node = self.detailed_wbs
+            return self.wbs_index.get(task_id)
         if not node:
             return None
         if node.get('id') == task_id:
@@ -85,12 +96,13 @@ class ScopeManagement:
 
     def remove_task_by_id(self, task_id, node=None):
         if node is None:
-            node = self.detailed_wbs
+            return self.wbs_index.remove(task_id)
         if not node or 'subtasks' not in node:
             return False
         for i, subtask in enumerate(node['subtasks']):
             if subtask.get('id') == task_id:
                 del node['subtasks'][i]
+                self.invalidate_wbs_index()
                 return True
             else:
                 removed = self.remove_task_by_id(task_id, subtask)
@@ -1,7 +1,58 @@
 import datetime
-from typing import List, Dict, Optional
+from collections.abc import MutableMapping
+from typing import Any, List, Dict, Optional, Tuple
+
+from project_management.modules.main_modules.critical_path import strongly_connected_components
+
+WORKFLOW_STEPS = (
+    "Coding",
+    "Testing",
+    "Documentation",
+    "Code Review",
+    "Merge and Deployment",
+    "Verification",
+)
+WORKFLOW_STEP_BITS = {step: 1 << i for i, step in enumerate(WORKFLOW_STEPS)}
+ALL_WORKFLOW_STEPS_MASK = (1 << len(WORKFLOW_STEPS)) - 1
+# Number of completed steps for every possible workflow mask
+_COMPLETED_STEPS_BY_MASK = [bin(mask).count("1") for mask in range(ALL_WORKFLOW_STEPS_MASK + 1)]
+
+class WorkflowStepsView(MutableMapping):
+    """
+    Dict-like view over a Task's workflow bitmask, so task.workflow_steps keeps
+    behaving like the old {step name: bool} dict without storing one per task.
+    """
+    __slots__ = ("_task",)
+
+    def __init__(self, task: "Task"):
+        self._task = task
+
+    def __getitem__(self, step_name: str) -> bool:
+        return bool(self._task.workflow_mask & WORKFLOW_STEP_BITS[step_name])
+
+    def __setitem__(self, step_name: str, completed: bool):
+        bit = WORKFLOW_STEP_BITS[step_name]
+        if completed:
+            self._task.workflow_mask |= bit
+        else:
+            self._task.workflow_mask &= ~bit
+
+    def __delitem__(self, step_name: str):
+        raise TypeError("Workflow steps cannot be removed")
+
+    def __iter__(self):
+        return iter(WORKFLOW_STEPS)
+
+    def __len__(self) -> int:
+        return len(WORKFLOW_STEPS)
+
+    def __repr__(self):
+        return repr(dict(self))
 
 class Task:
+    __slots__ = ("id", "title", "description", "deadline", "dependencies", "assigned_to", "status",
+                 "priority", "parent_id", "urgency", "importance", "github_issue_number", "workflow_mask")
+
     def __init__(self, id: int, title: str, description: str = "", deadline: Optional[datetime.date] = None,
                  dependencies: Optional[List[int]] = None, assigned_to: Optional[List[str]] = None,
                  status: str = "pending", priority: int = 0, parent_id: Optional[int] = None,
@@ -19,32 +70,126 @@ class Task:
         self.urgency = urgency
         self.importance = importance
         self.github_issue_number = github_issue_number
-        # Workflow steps completion status: dict of step name to bool
-        self.workflow_steps = {
-            "Coding": False,
-            "Testing": False,
-            "Documentation": False,
-            "Code Review": False,
-            "Merge and Deployment": False,
-            "Verification": False,
-        }
+        # Workflow steps completion status: one bit per entry of WORKFLOW_STEPS
+        self.workflow_mask = 0
+
+    @property
+    def workflow_steps(self) -> WorkflowStepsView:
+        return WorkflowStepsView(self)
+
+    @workflow_steps.setter
+    def workflow_steps(self, steps: Dict[str, bool]):
+        self.workflow_mask = 0
+        for step_name, completed in steps.items():
+            if completed and step_name in WORKFLOW_STEP_BITS:
+                self.workflow_mask |= WORKFLOW_STEP_BITS[step_name]
 
     def mark_workflow_step_completed(self, step_name: str):
-        if step_name in self.workflow_steps:
-            self.workflow_steps[step_name] = True
+        if step_name in WORKFLOW_STEP_BITS:
+            self.workflow_mask |= WORKFLOW_STEP_BITS[step_name]
 
     def is_workflow_completed(self):
-        return all(self.workflow_steps.values())
+        return self.workflow_mask == ALL_WORKFLOW_STEPS_MASK
 
     def workflow_progress_percentage(self):
-        total_steps = len(self.workflow_steps)
-        completed_steps = sum(1 for completed in self.workflow_steps.values() if completed)
-        return (completed_steps / total_steps) * 100 if total_steps > 0 else 0
+        return _COMPLETED_STEPS_BY_MASK[self.workflow_mask] / len(WORKFLOW_STEPS) * 100
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__ if name != "workflow_mask"}
+        data["workflow_steps"] = dict(self.workflow_steps)
+        return data
+
+class Conflict(str):
+    """
+    A problem found by TaskManagement.detect_conflicts.
+
+    The value is the readable message, so code that compares or prints
+    conflicts as strings keeps working; kind, task_ids and details carry the
+    structured information. Kinds: 'unknown_dependency', 'unknown_parent',
+    'dependency_cycle' and 'over_allocation'.
+    """
+
+    def __new__(cls, kind: str, message: str, task_ids: List[int], details: Optional[Dict[str, Any]] = None):
+        conflict = super().__new__(cls, message)
+        conflict.kind = kind
+        conflict.task_ids = task_ids
+        conflict.details = details or {}
+        return conflict
+
+    @property
+    def message(self) -> str:
+        return str(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "message": str(self), "task_ids": list(self.task_ids), **self.details}
 
 class TaskManagement:
     def __init__(self):
         self.tasks: Dict[int, Task] = {}
         self.next_task_id = 1
+        # Parent -> children index, maintained by add_task/remove_task so that
+        # hierarchy walks never have to rescan every task.
+        self.children_by_parent: Dict[Optional[int], List[int]] = {}
+        self._indexed_ids = set()
+
+    def _index_task(self, task: Task):
+        self.children_by_parent.setdefault(task.parent_id, []).append(task.id)
+        self._indexed_ids.add(task.id)
+
+    def _unlink_from_parent(self, task: Task):
+        siblings = self.children_by_parent.get(task.parent_id, [])
+        if task.id in siblings:
+            siblings.remove(task.id)
+
+    def _ensure_children_index(self, full_check: bool = False):
+        """
+        Rebuild the parent -> children index if self.tasks was modified directly
+        (e.g. tasks assigned into the dict) instead of through add_task/remove_task.
+        The cheap check compares sizes only; full_check compares the id sets.
+        """
+        if len(self._indexed_ids) == len(self.tasks) and (not full_check or self._indexed_ids == self.tasks.keys()):
+            return
+        self.children_by_parent = {}
+        self._indexed_ids = set()
+        for task in self.tasks.values():
+            self._index_task(task)
+
+    def get_children(self, task_id: Optional[int]) -> List[Task]:
+        """
+        Return the direct children of a task (or the root tasks for None).
+        """
+        self._ensure_children_index()
+        return [self.tasks[child_id] for child_id in self.children_by_parent.get(task_id, [])]
+
+    def add_task(self, task: Task) -> Task:
+        """
+        Register a task and keep the hierarchy index up to date.
+        """
+        self._ensure_children_index()
+        if task.id in self.tasks:
+            # Replacing an existing task keeps its subtasks, only the parent link moves
+            self._unlink_from_parent(self.tasks[task.id])
+            self._indexed_ids.discard(task.id)
+        self.tasks[task.id] = task
+        self._index_task(task)
+        self.next_task_id = max(self.next_task_id, task.id + 1)
+        return task
+
+    def remove_task(self, task_id: int) -> bool:
+        """
+        Remove a task together with all of its subtasks.
+        """
+        if task_id not in self.tasks:
+            return False
+        self._ensure_children_index()
+        self._unlink_from_parent(self.tasks[task_id])
+        stack = [task_id]
+        while stack:
+            current_id = stack.pop()
+            stack.extend(self.children_by_parent.pop(current_id, []))
+            self.tasks.pop(current_id, None)
+            self._indexed_ids.discard(current_id)
+        return True
 
     def update_workflow_steps_from_commit_message(self, commit_message: str):
         """
@@ -69,10 +214,7 @@ class TaskManagement:
         Parse creative user input text into a formal Task object.
         This is a placeholder for NLP or rule-based parsing logic.
         """
-        task = Task(id=self.next_task_id, title=input_text)
-        self.tasks[self.next_task_id] = task
-        self.next_task_id += 1
-        return task
+        return self.add_task(Task(id=self.next_task_id, title=input_text))
 
     def generate_wbs_from_idea(self, input_text: str) -> List[Task]:
         """
@@ -81,21 +223,15 @@ class TaskManagement:
         Returns a list of Tasks with parent-child relationships up to 5 levels deep.
         """
         # Placeholder implementation: create a dummy 3-level WBS for demonstration
-        root_task = Task(id=self.next_task_id, title=input_text)
-        self.tasks[self.next_task_id] = root_task
-        self.next_task_id += 1
+        root_task = self.add_task(Task(id=self.next_task_id, title=input_text))
 
         # Level 1 subtasks
         for i in range(1, 4):
-            level1_task = Task(id=self.next_task_id, title=f"{input_text} - Subtask Level 1.{i}", parent_id=root_task.id)
-            self.tasks[self.next_task_id] = level1_task
-            self.next_task_id += 1
+            level1_task = self.add_task(Task(id=self.next_task_id, title=f"{input_text} - Subtask Level 1.{i}", parent_id=root_task.id))
 
             # Level 2 subtasks
             for j in range(1, 3):
-                level2_task = Task(id=self.next_task_id, title=f"{input_text} - Subtask Level 2.{i}.{j}", parent_id=level1_task.id)
-                self.tasks[self.next_task_id] = level2_task
-                self.next_task_id += 1
+                self.add_task(Task(id=self.next_task_id, title=f"{input_text} - Subtask Level 2.{i}.{j}", parent_id=level1_task.id))
 
         return list(self.tasks.values())
 
@@ -155,61 +291,76 @@ class TaskManagement:
             # Scale to 1-100
             return max(1, min(100, urgency_score))
 
+        self._ensure_children_index(full_check=True)
+        children_by_parent = self.children_by_parent
+
         # Calculate urgency and importance for leaf tasks
         for task in self.tasks.values():
-            if not any(t.parent_id == task.id for t in self.tasks.values()):
+            if not children_by_parent.get(task.id):
                 # Leaf task
                 task.importance = calculate_importance_factors(task)
                 task.urgency = calculate_urgency_factors(task)
 
-        # Propagate urgency and importance up the hierarchy
-        def propagate(task_id):
-            children = [t for t in self.tasks.values() if t.parent_id == task_id]
-            if not children:
-                return self.tasks[task_id].urgency, self.tasks[task_id].importance
-            urgency_sum = 0
-            importance_sum = 0
-            for child in children:
-                u, i = propagate(child.id)
-                urgency_sum += u
-                importance_sum += i
-            # Average or weighted sum can be used; here simple sum
-            self.tasks[task_id].urgency = urgency_sum
-            self.tasks[task_id].importance = importance_sum
-            return urgency_sum, importance_sum
-
-        # Find root tasks (no parent)
-        root_tasks = [t for t in self.tasks.values() if t.parent_id is None]
-        for root in root_tasks:
-            propagate(root.id)
+        # Propagate urgency and importance up the hierarchy with an iterative
+        # post-order walk (children are summed before their parent), so deep
+        # hierarchies are not limited by the recursion depth.
+        root_ids = [t.id for t in self.tasks.values() if t.parent_id is None or t.parent_id not in self.tasks]
+        visited = set()
+        for root_id in root_ids:
+            stack = [(root_id, False)]
+            while stack:
+                task_id, children_done = stack.pop()
+                child_ids = children_by_parent.get(task_id)
+                if not child_ids:
+                    continue
+                if children_done:
+                    # Average or weighted sum can be used; here simple sum
+                    task = self.tasks[task_id]
+                    task.urgency = sum(self.tasks[c].urgency for c in child_ids)
+                    task.importance = sum(self.tasks[c].importance for c in child_ids)
+                    continue
+                if task_id in visited:
+                    continue
+                visited.add(task_id)
+                stack.append((task_id, True))
+                stack.extend((child_id, False) for child_id in child_ids)
+
+    def workflow_progress_percentages(self) -> Dict[int, float]:
+        """
+        Workflow progress percentage for every task, computed from the step bitmasks.
+        """
+        # A lookup per task rather than NumPy: the masks live on Task objects, and
+        # gathering them into an array and the results back into a dict costs
+        # more than the lookups themselves
+        total_steps = len(WORKFLOW_STEPS)
+        return {task_id: _COMPLETED_STEPS_BY_MASK[task.workflow_mask] / total_steps * 100
+                for task_id, task in self.tasks.items()}
+
+    def completed_workflow_task_ids(self) -> List[int]:
+        """
+        IDs of all tasks whose workflow steps are all completed.
+        """
+        return [task_id for task_id, task in self.tasks.items() if task.workflow_mask == ALL_WORKFLOW_STEPS_MASK]
 
     def classify_tasks_eisenhower(self):
         """
         Classify tasks into Eisenhower matrix quadrants based on importance and urgency.
         Returns a dict with keys: 'do_now', 'schedule', 'delegate', 'eliminate'
         """
-        do_now = []
-        schedule = []
-        delegate = []
-        eliminate = []
-
+        # Quadrant index: bit 1 = not important, bit 0 = not urgent
+        quadrants = ([], [], [], [])
         for task in self.tasks.values():
-            if task.importance is None or task.urgency is None:
+            importance = task.importance
+            urgency = task.urgency
+            if importance is None or urgency is None:
                 continue
-            if task.importance >= 70 and task.urgency >= 70:
-                do_now.append(task)
-            elif task.importance >= 70 and task.urgency < 70:
-                schedule.append(task)
-            elif task.importance < 70 and task.urgency >= 70:
-                delegate.append(task)
-            else:
-                eliminate.append(task)
+            quadrants[(importance < 70) * 2 + (urgency < 70)].append(task)
 
         return {
-            "do_now": do_now,
-            "schedule": schedule,
-            "delegate": delegate,
-            "eliminate": eliminate,
+            "do_now": quadrants[0],
+            "schedule": quadrants[1],
+            "delegate": quadrants[2],
+            "eliminate": quadrants[3],
         }
 
     def _calculate_urgency(self, task: Task) -> float:
@@ -253,15 +404,101 @@ class TaskManagement:
         # Placeholder: return tasks in priority order
         return self.prioritize_tasks()
 
-    def detect_conflicts(self):
+    def detect_conflicts(self, schedule: Optional[Dict[int, Tuple[Any, Any]]] = None,
+                         max_concurrent: int = 1) -> List[Conflict]:
         """
         Detect conflicts in task dependencies or assignments.
+
+        - Dependencies and parents that are not known tasks (dict lookups).
+        - Dependency cycles, found as strongly connected components (Tarjan)
+          among the tasks a topological sort cannot order; unresolved cycles
+          would otherwise make the schedulers loop or stall.
+        - Over-allocation: with a schedule of task id -> (start, end), a sweep
+          over each user's assignment intervals reports every period in which
+          the user holds more than max_concurrent unfinished tasks at once.
+
+        Runs in O(V + E) plus O(A log A) for A scheduled assignments.
         """
         conflicts = []
-        for task in self.tasks.values():
+        tasks = self.tasks
+        ids = list(tasks)
+        position = {task_id: i for i, task_id in enumerate(ids)}
+        # Edges run from a dependency to the task that waits for it; most tasks have no dependents,
+        # so their successor list stays the shared empty tuple
+        successors = [()] * len(ids)
+        for i, task in enumerate(tasks.values()):
             for dep_id in task.dependencies:
-                if dep_id not in self.tasks:
-                    conflicts.append(f"Task {task.id} depends on unknown task {dep_id}")
+                dep = position.get(dep_id)
+                if dep is None:
+                    conflicts.append(Conflict("unknown_dependency", f"Task {task.id} depends on unknown task {dep_id}",
+                                              [task.id], {"dependency_id": dep_id}))
+                elif successors[dep]:
+                    successors[dep].append(i)
+                else:
+                    successors[dep] = [i]
+            if task.parent_id is not None and task.parent_id not in tasks:
+                conflicts.append(Conflict("unknown_parent", f"Task {task.id} has unknown parent {task.parent_id}",
+                                          [task.id], {"parent_id": task.parent_id}))
+
+        # Peel off everything a topological sort can order; only tasks left over sit on or behind a cycle
+        indegree = [0] * len(ids)
+        for dependents in successors:
+            for i in dependents:
+                indegree[i] += 1
+        ordered = [i for i, degree in enumerate(indegree) if not degree]
+        for v in ordered:
+            for i in successors[v]:
+                indegree[i] -= 1
+                if not indegree[i]:
+                    ordered.append(i)
+        remaining = [i for i, degree in enumerate(indegree) if degree] if len(ordered) < len(ids) else []
+        for component in strongly_connected_components(remaining, successors):
+            if len(component) > 1:
+                cycle = [ids[i] for i in component]
+                conflicts.append(Conflict("dependency_cycle",
+                                          f"Tasks {', '.join(map(str, cycle))} form a dependency cycle", cycle))
+            elif component[0] in successors[component[0]]:
+                task_id = ids[component[0]]
+                conflicts.append(Conflict("dependency_cycle", f"Task {task_id} depends on itself", [task_id]))
+
+        if schedule:
+            conflicts.extend(self._over_allocations(schedule, max_concurrent))
+        return conflicts
+
+    def _over_allocations(self, schedule: Dict[int, Tuple[Any, Any]], max_concurrent: int) -> List[Conflict]:
+        events_by_user: Dict[str, list] = {}
+        for task_id, (start, end) in schedule.items():
+            task = self.tasks.get(task_id)
+            if task is None or task.status == 'completed' or not end > start:
+                continue
+            for user in task.assigned_to:
+                events = events_by_user.setdefault(user, [])
+                # Ends sort before starts at the same instant, so back-to-back tasks do not overlap
+                events.append((end, 0, task_id))
+                events.append((start, 1, task_id))
+
+        conflicts = []
+        for user, events in events_by_user.items():
+            events.sort()
+            active = set()
+            overloaded, period_start = set(), None
+            for time, is_start, task_id in events:
+                if is_start:
+                    active.add(task_id)
+                    if len(active) > max_concurrent:
+                        if period_start is None:
+                            period_start = time
+                        overloaded.update(active)
+                    continue
+                active.discard(task_id)
+                if period_start is not None and len(active) <= max_concurrent:
+                    task_ids = sorted(overloaded, key=str)
+                    conflicts.append(Conflict(
+                        "over_allocation",
+                        f"User {user} is assigned {len(task_ids)} overlapping tasks "
+                        f"({', '.join(map(str, task_ids))}) from {period_start} to {time}",
+                        task_ids, {"user": user, "start": period_start, "end": time}))
+                    overloaded, period_start = set(), None
         return conflicts
 
     def assign_task(self, task_id: int, users: List[str]):
@@ -1,7 +1,15 @@
 import json
 import os
+import logging
 from datetime import datetime, timedelta
 
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json
+from project_management.modules.main_modules.critical_path import (
+    build_engine_from_wbs, critical_task_ids, explicit_duration,
+)
+
+logger = logging.getLogger(__name__)
+
 class TimeManagement:
     def __init__(self,
                  detailed_wbs_path='JSonDataBase/Inputs/UserInputs/detailed_wbs.json',
@@ -15,16 +23,19 @@ class TimeManagement:
         self.resource_allocations = []
 
         self.task_schedules = {}
+        self.cpm_engine = None
+        self.critical_path_ids = set()
+        self.critical_path = []
 
     def load_json(self, path):
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_cached(path)
         return None
 
     def save_json(self, data, path):
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        invalidate_cached_json(path)
 
     def load_inputs(self):
         self.detailed_wbs = self.load_json(self.detailed_wbs_path) or {}
@@ -76,9 +87,42 @@ class TimeManagement:
         for subtask in node.get('subtasks', []):
             self.schedule_tasks(subtask)
 
+    def cpm_duration(self, task):
+        """Duration used for CPM: an explicit duration_days/duration, else the allocation span."""
+        duration = explicit_duration(task)
+        return duration if duration is not None else self.calculate_task_duration(task)
+
+    def compute_critical_path(self):
+        """
+        Run CPM over the leaf tasks' dependencies and add early/late dates (in days
+        from the project start), total slack and a critical_path flag to each
+        task schedule. Summary tasks are critical if any task under them is.
+        If the dependencies form a cycle the error is logged and the schedules
+        are left without CPM fields.
+        """
+        if not self.detailed_wbs:
+            return
+        try:
+            self.cpm_engine, summary_leaves = build_engine_from_wbs(self.detailed_wbs, self.cpm_duration)
+        except ValueError as e:
+            logger.error(f"Skipping critical path analysis: {e}")
+            self.cpm_engine = None
+            self.critical_path_ids = set()
+            self.critical_path = []
+            return
+        self.critical_path_ids = critical_task_ids(self.cpm_engine, summary_leaves)
+        self.critical_path = self.cpm_engine.critical_path()
+        for task_id, schedule in self.task_schedules.items():
+            if task_id in self.cpm_engine:
+                cpm = self.cpm_engine.schedule(task_id)
+                for key in ('early_start', 'early_finish', 'late_start', 'late_finish', 'total_slack'):
+                    schedule[key] = cpm[key]
+            schedule['critical_path'] = task_id in self.critical_path_ids
+
     def run(self):
         self.load_inputs()
         self.schedule_tasks()
+        self.compute_critical_path()
         self.save_json(self.task_schedules, self.output_path)
         print(f"Time management schedule saved to {self.output_path}")
 
@@ -1,28 +1,52 @@
 import os
 import json
+import time
+from functools import partial
+
+from project_management.modules.main_modules.wbs_part_loader import (
+    iter_parts_in_order, list_part_files, load_json_part, log_part_timings,
+)
 
 class WBSAggregator:
-    def __init__(self, parts_dir='SystemInputs/user_inputs/wbs_parts', output_file='SystemInputs/user_inputs/detailed_wbs.json'):
+    def __init__(self, parts_dir='SystemInputs/user_inputs/wbs_parts', output_file='SystemInputs/user_inputs/detailed_wbs.json',
+                 max_workers=8, process_min_bytes=None):
         self.parts_dir = parts_dir
         self.output_file = output_file
+        # Parts are loaded concurrently; parts of at least process_min_bytes are decoded in a process pool
+        self.max_workers = max_workers
+        self.process_min_bytes = process_min_bytes
+        self.part_timings = []
 
     def load_part(self, filename):
         path = os.path.join(self.parts_dir, filename)
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    def _is_large_part(self, filename):
+        try:
+            return os.path.getsize(os.path.join(self.parts_dir, filename)) >= self.process_min_bytes
+        except OSError:
+            return False
+
     def aggregate(self):
-        # Load level 0 from any part (all have same root)
-        parts_files = [f for f in os.listdir(self.parts_dir) if f.endswith('.json')]
+        # Load level 0 from the first part by name (all have same root)
+        parts_files = list_part_files(self.parts_dir)
         if not parts_files:
             print("No WBS parts found in directory.")
             return
 
         root = None
         subtasks = []
+        results = []
+        large_load = partial(load_json_part, self.parts_dir) if self.process_min_bytes is not None else None
+        start = time.perf_counter()
 
-        for file in parts_files:
-            part = self.load_part(file)
+        for result in iter_parts_in_order(parts_files, self.load_part, self.max_workers,
+                                          large_load=large_load, is_large=self._is_large_part):
+            results.append(result)
+            if result.error is not None:
+                raise result.error
+            part = result.data
             if root is None:
                 root = {
                     "id": part["id"],
@@ -33,6 +57,8 @@ class WBSAggregator:
             # Append the main branch (level 1) from this part to root subtasks
             if "subtasks" in part and part["subtasks"]:
                 root["subtasks"].extend(part["subtasks"])
+        self.part_timings = [result.to_dict() for result in results]
+        log_part_timings(results, time.perf_counter() - start)
 
         # Write aggregated WBS to output file
         with open(self.output_file, 'w', encoding='utf-8') as f:
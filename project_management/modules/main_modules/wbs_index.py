@@ -0,0 +1,175 @@
+class WBSIndex:
+    """
+    Hash index over a nested WBS (nodes with an 'id' and a 'subtasks' list).
+
+    Maps id -> (node, parent, position) after a single pre-order pass, where
+    parent is the parent node (None for top-level nodes) and position is the
+    node's index in the list that holds it. The root may be a single node dict
+    or a list of top-level nodes.
+
+    add/remove/update keep the index consistent with the tree. Removals only
+    drop the nodes from the index and remember which lists need filtering;
+    flush() filters those lists in place and renumbers positions, so a batch of
+    removals under one parent costs one pass over its children rather than one
+    pass per removal. remove() flushes immediately unless deferred=True.
+
+    As with a pre-order search, the first node seen with a given id is the one
+    indexed. Changes made to the tree without going through the index are not
+    seen until rebuild() is called.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+        self._pending = {}
+        self.entries = {}
+        self._duplicates = set()
+        self._removed = set()
+        self._stale = False
+        self.rebuild()
+
+    def rebuild(self):
+        if self._pending:
+            self.flush()
+        self.entries = {}
+        self._duplicates = set()
+        self._removed = set()
+        self._pending = {}
+        self._stale = False
+        if isinstance(self.root, list):
+            for position, node in enumerate(self.root):
+                self._index_subtree(node, None, position)
+        elif self.root:
+            self._index_subtree(self.root, None, 0)
+
+    def _index_subtree(self, node, parent, position):
+        stack = [(node, parent, position)]
+        while stack:
+            node, parent, position = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            node_id = node.get('id')
+            if node_id in self.entries:
+                self._duplicates.add(node_id)
+            elif node_id is not None:
+                self.entries[node_id] = (node, parent, position)
+            subtasks = node.get('subtasks') or []
+            # Reversed so children are popped, and therefore indexed, in pre-order
+            for child_position in range(len(subtasks) - 1, -1, -1):
+                stack.append((subtasks[child_position], node, child_position))
+
+    def _iter_subtree(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                yield node
+                stack.extend(node.get('subtasks') or [])
+
+    def _unindex_subtree(self, node):
+        for descendant in self._iter_subtree(node):
+            node_id = descendant.get('id')
+            if node_id in self._duplicates:
+                # Another node with this id may now be the first one
+                self._stale = True
+            entry = self.entries.get(node_id)
+            if entry is not None and entry[0] is descendant:
+                del self.entries[node_id]
+
+    def _container(self, parent):
+        if parent is None:
+            return self.root if isinstance(self.root, list) else None
+        return parent.get('subtasks')
+
+    def _ensure_current(self):
+        if self._pending:
+            self.flush()
+        if self._stale:
+            self.rebuild()
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def __len__(self):
+        self._ensure_current()
+        return len(self.entries)
+
+    def get(self, task_id):
+        """The node with this id, or None."""
+        entry = self.entries.get(task_id)
+        if entry is None and self._stale:
+            self.rebuild()
+            entry = self.entries.get(task_id)
+        return entry[0] if entry is not None else None
+
+    def parent_of(self, task_id):
+        entry = self.entries.get(task_id)
+        return entry[1] if entry is not None else None
+
+    def position_of(self, task_id):
+        self._ensure_current()
+        entry = self.entries.get(task_id)
+        return entry[2] if entry is not None else None
+
+    def add(self, parent_id, node):
+        """Append node (and its subtree) to the subtasks of parent_id. Returns False if the parent is unknown."""
+        parent = self.get(parent_id)
+        if parent is None:
+            return False
+        if 'subtasks' not in parent or parent['subtasks'] is None:
+            parent['subtasks'] = []
+        parent['subtasks'].append(node)
+        self._index_subtree(node, parent, len(parent['subtasks']) - 1)
+        return True
+
+    def remove(self, task_id, deferred=False):
+        """
+        Remove a non-root node and its subtree. With deferred=True the node is
+        only dropped from the index; its list is filtered on the next flush().
+        """
+        entry = self.entries.get(task_id)
+        if entry is None and self._stale:
+            self.rebuild()
+            entry = self.entries.get(task_id)
+        if entry is None:
+            return False
+        node, parent, _ = entry
+        container = self._container(parent)
+        if container is None:
+            return False
+        self._unindex_subtree(node)
+        self._removed.add(id(node))
+        self._pending[id(container)] = (container, parent)
+        if not deferred:
+            self.flush()
+        return True
+
+    def update(self, task_id, changes):
+        """Apply changes to a node's attributes, re-indexing it if its id or subtasks change."""
+        entry = self.entries.get(task_id)
+        if entry is None and self._stale:
+            self.rebuild()
+            entry = self.entries.get(task_id)
+        if entry is None:
+            return False
+        node, parent, position = entry
+        structural = 'id' in changes or 'subtasks' in changes
+        if structural:
+            self._unindex_subtree(node)
+        for key, value in changes.items():
+            node[key] = value
+        if structural:
+            self._index_subtree(node, parent, position)
+        return True
+
+    def flush(self):
+        """Filter removed nodes out of their lists and renumber the remaining positions."""
+        pending, self._pending = self._pending, {}
+        removed, self._removed = self._removed, set()
+        for container, parent in pending.values():
+            container[:] = [child for child in container if id(child) not in removed]
+            for position, child in enumerate(container):
+                if not isinstance(child, dict):
+                    continue
+                entry = self.entries.get(child.get('id'))
+                if entry is not None and entry[0] is child:
+                    self.entries[child.get('id')] = (child, parent, position)
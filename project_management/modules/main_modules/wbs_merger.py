@@ -4,26 +4,101 @@ WBS Merger Module - Merges multiple WBS parts into a single detailed WBS
 
 import os
 import json
-from typing import List, Dict, Any
+import time
+import hashlib
+import logging
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
+
+from project_management.modules.main_modules.wbs_part_loader import (
+    iter_parts_in_order, list_part_files, log_part_timings,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def read_part_subtasks(parts_dir: str, filename: str) -> List[Dict]:
+    """
+    Read the top-level subtasks of a WBS part file. Module level so it can
+    also run in a process pool.
+
+    Raises:
+        FileNotFoundError: If the part file does not exist
+        ValueError: If the part file is not valid JSON or not a JSON object
+    """
+    filepath = os.path.join(parts_dir, filename)
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            part = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"WBS part file not found: {filepath}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in file {filepath}: {e}")
+    if not isinstance(part, dict):
+        raise ValueError(f"WBS part {filepath} is not a JSON object")
+    return part.get('subtasks') or []
+
+
+def validate_subtasks(subtasks: Any) -> None:
+    """
+    Check that a part's subtasks can be merged: every task at every level is
+    an object with a hashable id, and its subtasks, if set, are a list.
+    
+    Raises:
+        ValueError: If any task in the tree cannot be merged
+    """
+    pending = [subtasks]
+    while pending:
+        tasks = pending.pop()
+        if not isinstance(tasks, list):
+            raise ValueError(f"subtasks must be a list, not {type(tasks).__name__}")
+        for task in tasks:
+            if not isinstance(task, dict) or 'id' not in task:
+                raise ValueError(f"WBS task without an id: {task!r}")
+            try:
+                hash(task['id'])
+            except TypeError:
+                raise ValueError(f"WBS task id is not hashable: {task['id']!r}")
+            if task.get('subtasks') is not None:
+                pending.append(task['subtasks'])
 
 
 class WBSMerger:
     """
     Merges multiple WBS (Work Breakdown Structure) parts into a single detailed WBS.
     Handles merging of tasks, subtasks, and their relationships.
+
+    Tasks are matched by id among their siblings. A merge keeps one index of
+    (subtasks list, task id) -> task for the whole run, so each subtasks list is
+    indexed once no matter how many parts add to it. Part files are read on a
+    pool of worker threads and merged in file name order.
     """
     
     def __init__(self, parts_dir: str = 'SystemInputs/user_inputs/wbs_parts', 
-                 output_file: str = 'SystemInputs/system_generated/detailed_wbs.json'):
+                 output_file: str = 'SystemInputs/system_generated/detailed_wbs.json',
+                 max_workers: int = 8, process_min_bytes: Optional[int] = None,
+                 use_cache: bool = True):
         """
         Initialize WBS Merger with directory paths
         
         Args:
             parts_dir: Directory containing WBS parts
             output_file: Output file for merged WBS
+            max_workers: Number of parts loaded concurrently
+            process_min_bytes: Decode parts of at least this size in a process pool (None disables it)
+            use_cache: Skip or narrow the merge using the manifest stored beside the output
         """
         self.parts_dir = parts_dir
         self.output_file = output_file
+        self.max_workers = max_workers
+        self.process_min_bytes = process_min_bytes
+        self.use_cache = use_cache
+        self.manifest_file = os.path.splitext(output_file)[0] + '.manifest.json'
+        self.part_timings = []
+        self.cache_status = None
+        self.changed_subtask_ids = []
         
     def load_part(self, filename: str) -> Dict[str, Any]:
         """
@@ -44,6 +119,64 @@ class WBSMerger:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in file {filepath}: {e}")
     
+    def load_part_subtasks(self, filename: str) -> List[Dict]:
+        """
+        Read the top-level subtasks of a WBS part file
+        
+        Args:
+            filename: Path to the WBS part file
+            
+        Returns:
+            List of the part's top-level subtasks
+        """
+        return read_part_subtasks(self.parts_dir, filename)
+
+    def _is_large_part(self, filename: str) -> bool:
+        try:
+            return os.path.getsize(os.path.join(self.parts_dir, filename)) >= self.process_min_bytes
+        except OSError:
+            return False
+
+    def _merge_into(self, index: Dict[Tuple[int, Any], Dict], indexed_lists: set,
+                    base_subtasks: List[Dict], additional_subtasks: List[Dict]) -> None:
+        """
+        Merge additional_subtasks into base_subtasks in place, recursing into
+        subtasks of matching tasks. additional_subtasks must pass
+        validate_subtasks first, so the merge cannot stop halfway.
+        
+        Args:
+            index: Persistent (id(subtasks list), task id) -> task lookup
+            indexed_lists: ids of the subtasks lists already added to index
+            base_subtasks: Subtasks list to merge into
+            additional_subtasks: Subtasks to merge
+        """
+        pending = [(base_subtasks, additional_subtasks)]
+        while pending:
+            base, additional = pending.pop()
+            list_key = id(base)
+            if list_key not in indexed_lists:
+                for task in base:
+                    index[(list_key, task['id'])] = task
+                indexed_lists.add(list_key)
+
+            for additional_task in additional:
+                task_id = additional_task['id']
+                existing_task = index.get((list_key, task_id))
+                if existing_task is None:
+                    # Add new task
+                    base.append(additional_task)
+                    index[(list_key, task_id)] = additional_task
+                    continue
+
+                # Update existing task and merge subtasks recursively
+                for key, value in additional_task.items():
+                    if key != 'subtasks':
+                        existing_task[key] = value
+                if additional_task.get('subtasks') is not None:
+                    if existing_task.get('subtasks') is None:
+                        existing_task['subtasks'] = []
+                    pending.append((existing_task['subtasks'], additional_task['subtasks']))
+
     def merge_subtasks(self, base_subtasks: List[Dict], additional_subtasks: List[Dict]) -> List[Dict]:
         """
         Merge subtasks from additional subtasks into base subtasks
@@ -55,71 +188,278 @@ class WBSMerger:
         Returns:
             Merged list of subtasks
         """
+        validate_subtasks(additional_subtasks)
         merged = base_subtasks.copy()
-        
-        # Create a lookup dictionary for existing tasks
-        task_lookup = {task['id']: task for task in merged}
-        
-        for additional_task in additional_subtasks:
-            task_id = additional_task['id']
-            
-            if task_id in task_lookup:
-                # Update existing task
-                existing_task = task_lookup[task_id]
-                existing_task.update(additional_task)
-                
-                # Merge subtasks recursively
-                if 'subtasks' in additional_task:
-                    existing_subtasks = existing_task.get('subtasks', [])
-                    additional_subtasks_list = additional_task.get('subtasks', [])
-                    existing_task['subtasks'] = self.merge_subtasks(existing_subtasks, additional_subtasks_list)
-            else:
-                # Add new task
-                merged.append(additional_task)
-        
+        self._merge_into({}, set(), merged, additional_subtasks)
         return merged
     
-    def merge_all_parts(self) -> Dict[str, Any]:
+    def write_output(self, merged_wbs: Dict[str, Any]) -> None:
         """
-        Merge all WBS parts into a single detailed WBS
+        Write the merged WBS with the streaming JSON encoder, replacing the
+        output file only once the whole document has been written
         
-        Returns:
-            Dictionary containing the merged WBS
+        Args:
+            merged_wbs: Merged WBS to write
         """
-        merged_wbs = {
+        output_dir = os.path.dirname(self.output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_file = self.output_file + '.tmp'
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for chunk in encoder.iterencode(merged_wbs):
+                f.write(chunk)
+        os.replace(tmp_file, self.output_file)
+
+    def _new_root(self) -> Dict[str, Any]:
+        return {
             "id": 1,
             "name": "Project",
             "level": 0,
             "subtasks": []
         }
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the manifest written beside the output by the last merge
+        
+        Returns:
+            Manifest dictionary, or None if there is no usable manifest
+        """
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def save_manifest(self, parts: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Save part fingerprints and the output file's size and mtime beside the output
+        
+        Args:
+            parts: File name -> fingerprint, with the ids of the top-level subtasks each part contributes
+        """
+        stat = os.stat(self.output_file)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'output': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+            'parts': parts,
+        }
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.manifest_file)
+
+    def fingerprint_part(self, filename: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Size, mtime and SHA-256 of a part file. The hash is reused from the
+        previous fingerprint when size and mtime are unchanged.
+        
+        Args:
+            filename: Part file name
+            previous: Fingerprint recorded in the manifest, if any
+            
+        Returns:
+            Fingerprint dictionary
+        """
+        stat = os.stat(os.path.join(self.parts_dir, filename))
+        if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+            sha256 = previous['sha256']
+        else:
+            digest = hashlib.sha256()
+            with open(os.path.join(self.parts_dir, filename), 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            sha256 = digest.hexdigest()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+
+    def _output_matches(self, manifest: Dict[str, Any]) -> bool:
+        try:
+            stat = os.stat(self.output_file)
+        except OSError:
+            return False
+        output = manifest.get('output') or {}
+        return output.get('size') == stat.st_size and output.get('mtime_ns') == stat.st_mtime_ns
+
+    def _load_output(self) -> Dict[str, Any]:
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _iter_parts(self, filenames: List[str]):
+        large_load = partial(read_part_subtasks, self.parts_dir) if self.process_min_bytes is not None else None
+        return iter_parts_in_order(filenames, self.load_part_subtasks, self.max_workers,
+                                   large_load=large_load, is_large=self._is_large_part)
+
+    def _merge_parts(self, wbs_files: List[str], fingerprints: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge every part from scratch, recording each part's top-level subtask ids in its fingerprint."""
+        merged_wbs = self._new_root()
+        # Load parts concurrently and merge them in file name order; a part is
+        # merged only once it has been read completely
+        index = {}
+        indexed_lists = set()
+        results = []
+        start = time.perf_counter()
+        for result in self._iter_parts(wbs_files):
+            results.append(result)
+            fingerprint = fingerprints[result.filename]
+            try:
+                if result.error is not None:
+                    raise result.error
+                # Validate the whole part first so a bad task cannot leave it half merged
+                validate_subtasks(result.data)
+                fingerprint['subtask_ids'] = [task['id'] for task in result.data]
+                self._merge_into(index, indexed_lists, merged_wbs['subtasks'], result.data)
+            except Exception as e:
+                fingerprint['subtask_ids'] = []
+                fingerprint['error'] = True
+                logger.error("Error processing %s: %s", result.filename, e)
+                continue
+        self.part_timings = [result.to_dict() for result in results]
+        log_part_timings(results, time.perf_counter() - start)
+        return merged_wbs
+
+    def _remerge_changed_parts(self, wbs_files: List[str], fingerprints: Dict[str, Dict[str, Any]],
+                               manifest: Dict[str, Any], changed: set) -> Optional[Dict[str, Any]]:
+        """
+        Re-merge only the top-level subtrees that changed parts contribute to,
+        taking every other subtree from the previous output. Returns None when
+        that is not possible and a full merge is needed.
+        """
+        previous_parts = manifest['parts']
+        if any(part.get('error') for part in previous_parts.values()):
+            return None
+
+        changed_files = [f for f in wbs_files if f in changed]
+        changed_data = {}
+        affected = set()
+        results = []
+        start = time.perf_counter()
+        for result in self._iter_parts(changed_files):
+            results.append(result)
+            if result.error is not None:
+                return None
+            try:
+                validate_subtasks(result.data)
+            except ValueError:
+                return None
+            changed_data[result.filename] = result.data
+            fingerprints[result.filename]['subtask_ids'] = [task['id'] for task in result.data]
+        try:
+            for filename in changed:
+                affected.update(previous_parts.get(filename, {}).get('subtask_ids', []))
+                affected.update(fingerprints.get(filename, {}).get('subtask_ids', []))
+            for filename in wbs_files:
+                if filename not in changed:
+                    fingerprints[filename]['subtask_ids'] = previous_parts[filename]['subtask_ids']
+        except TypeError:
+            # Unhashable ids cannot be tracked per subtree
+            return None
+
+        # Unchanged parts only need to be read if they contribute to an affected subtree
+        shared_files = [f for f in wbs_files
+                        if f not in changed and affected.intersection(fingerprints[f]['subtask_ids'])]
+        shared_data = {}
+        for result in self._iter_parts(shared_files):
+            results.append(result)
+            if result.error is not None:
+                return None
+            shared_data[result.filename] = result.data
+
+        previous_subtasks = {task.get('id'): task for task in self._load_output().get('subtasks', [])}
+        index = {}
+        indexed_lists = set()
+        remerged = []
+        for filename in wbs_files:
+            data = changed_data.get(filename, shared_data.get(filename))
+            if data is not None:
+                self._merge_into(index, indexed_lists, remerged,
+                                 [task for task in data if task.get('id') in affected])
+        remerged_subtasks = {task['id']: task for task in remerged}
+
+        # Top-level order is the order of first appearance across parts, as in a full merge
+        merged_wbs = self._new_root()
+        seen = set()
+        for filename in wbs_files:
+            for task_id in fingerprints[filename]['subtask_ids']:
+                if task_id in seen:
+                    continue
+                seen.add(task_id)
+                source = remerged_subtasks if task_id in affected else previous_subtasks
+                if task_id not in source:
+                    return None
+                merged_wbs['subtasks'].append(source[task_id])
+
+        self.part_timings = [result.to_dict() for result in results]
+        log_part_timings(results, time.perf_counter() - start)
+        self.changed_subtask_ids = [task_id for task_id in seen if task_id in affected]
+        return merged_wbs
+
+    def merge_all_parts(self) -> Dict[str, Any]:
+        """
+        Merge all WBS parts into a single detailed WBS
+        
+        When the manifest beside the output shows that no part changed since the
+        last merge, the merge is skipped and the existing output is returned.
+        When some parts changed, only the top-level subtrees they contribute to
+        are re-merged. cache_status is set to 'hit', 'partial' or 'miss'.
+        
+        Returns:
+            Dictionary containing the merged WBS
+        """
+        self.cache_status = 'miss'
+        self.changed_subtask_ids = []
+        merged_wbs = self._new_root()
         
         # Get all WBS part files
         if not os.path.exists(self.parts_dir):
             raise FileNotFoundError(f"WBS parts directory not found: {self.parts_dir}")
         
-        wbs_files = [f for f in os.listdir(self.parts_dir) if f.endswith('.json')]
+        wbs_files = list_part_files(self.parts_dir)
         
         if not wbs_files:
             print("No WBS parts found in directory.")
             return merged_wbs
         
-        # Load and merge all parts
-        for filename in wbs_files:
+        manifest = self.load_manifest() if self.use_cache else None
+        previous_parts = manifest['parts'] if manifest and self._output_matches(manifest) else {}
+        fingerprints = {f: self.fingerprint_part(f, previous_parts.get(f)) for f in wbs_files}
+        changed = {f for f in wbs_files if previous_parts.get(f, {}).get('sha256') != fingerprints[f]['sha256']}
+        changed.update(f for f in previous_parts if f not in fingerprints)
+
+        if previous_parts and not changed:
+            for filename, fingerprint in fingerprints.items():
+                fingerprint['subtask_ids'] = previous_parts[filename].get('subtask_ids', [])
+                if previous_parts[filename].get('error'):
+                    fingerprint['error'] = True
+            merged_wbs = self._load_output()
+            self.part_timings = []
+            self.cache_status = 'hit'
+            if any(fingerprints[f]['mtime_ns'] != previous_parts[f]['mtime_ns'] for f in wbs_files):
+                # Touched but unchanged parts: record the new mtimes so they are not hashed again
+                self.save_manifest(fingerprints)
+            print(f"Merged detailed WBS is up to date: {self.output_file}")
+            return merged_wbs
+
+        remerged = None
+        if previous_parts:
             try:
-                part = self.load_part(filename)
-                if 'subtasks' in part:
-                    merged_wbs['subtasks'] = self.merge_subtasks(
-                        merged_wbs['subtasks'], 
-                        part.get('subtasks', [])
-                    )
+                remerged = self._remerge_changed_parts(wbs_files, fingerprints, manifest, changed)
             except Exception as e:
-                print(f"Error processing {filename}: {e}")
-                continue
+                logger.info("Falling back to a full merge of %s: %s", self.parts_dir, e)
+        if remerged is not None:
+            merged_wbs = remerged
+            self.cache_status = 'partial'
+        else:
+            self.changed_subtask_ids = []
+            merged_wbs = self._merge_parts(wbs_files, fingerprints)
         
         # Save merged WBS
-        os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_wbs, f, indent=2, ensure_ascii=False)
+        self.write_output(merged_wbs)
+        if self.use_cache:
+            self.save_manifest(fingerprints)
         
         print(f"Merged detailed WBS saved to {self.output_file}")
         return merged_wbs
@@ -0,0 +1,119 @@
+"""
+WBS Part Loader Module - Concurrent, ordered loading of WBS part files
+"""
+
+import os
+import json
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PartLoadResult:
+    """Outcome of loading one part file: the loaded data or the error, and the load time."""
+
+    __slots__ = ('filename', 'data', 'error', 'seconds')
+
+    def __init__(self, filename: str, data: Any, error: Optional[Exception], seconds: float):
+        self.filename = filename
+        self.data = data
+        self.error = error
+        self.seconds = seconds
+
+    def to_dict(self) -> dict:
+        return {
+            'file': self.filename,
+            'seconds': round(self.seconds, 6),
+            'error': str(self.error) if self.error is not None else None,
+        }
+
+
+def list_part_files(parts_dir: str) -> List[str]:
+    """JSON part files in parts_dir, sorted by name so merges are reproducible."""
+    return sorted(f for f in os.listdir(parts_dir) if f.endswith('.json'))
+
+
+def load_json_part(parts_dir: str, filename: str) -> Any:
+    """Load one JSON part file. Module level so it can run in a process pool."""
+    with open(os.path.join(parts_dir, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _timed_load(load: Callable[[str], Any], filename: str):
+    start = time.perf_counter()
+    try:
+        return load(filename), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def iter_parts_in_order(filenames: Iterable[str], load: Callable[[str], Any], max_workers: int = 8,
+                        large_load: Optional[Callable[[str], Any]] = None,
+                        is_large: Optional[Callable[[str], bool]] = None) -> Iterator[PartLoadResult]:
+    """
+    Load part files concurrently and yield the results in the order of filenames
+
+    Loads run on a thread pool, which overlaps file I/O latency. When large_load
+    and is_large are given, parts for which is_large(filename) is true are loaded
+    with large_load on a process pool instead, so decoding them does not hold the
+    GIL; large_load must be picklable (a module-level function or a
+    functools.partial of one). At most 2 * max_workers loads are in flight, so a
+    slow consumer does not cause every part to be held in memory at once.
+
+    Args:
+        filenames: Part file names, in the order results should be yielded
+        load: Callable loading one part by file name
+        max_workers: Number of worker threads (and processes, if used)
+        large_load: Picklable loader used on the process pool
+        is_large: Predicate selecting the parts to load on the process pool
+
+    Returns:
+        Iterator of PartLoadResult; a failed load is reported through its error
+    """
+    filenames = iter(filenames)
+    window = max(1, max_workers) * 2
+    threads = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    processes = ProcessPoolExecutor(max_workers=max(1, max_workers)) if large_load is not None and is_large is not None else None
+    pending = deque()
+
+    def submit(filename):
+        if processes is not None and is_large(filename):
+            future = processes.submit(_timed_load, large_load, filename)
+        else:
+            future = threads.submit(_timed_load, load, filename)
+        pending.append((filename, future))
+
+    try:
+        for filename in filenames:
+            submit(filename)
+            if len(pending) >= window:
+                break
+        while pending:
+            filename, future = pending.popleft()
+            data, error, seconds = future.result()
+            next_filename = next(filenames, None)
+            if next_filename is not None:
+                submit(next_filename)
+            if error is None:
+                logger.info("Loaded WBS part %s in %.3fs", filename, seconds)
+            else:
+                logger.info("Failed to load WBS part %s after %.3fs: %s", filename, seconds, error)
+            yield PartLoadResult(filename, data, error, seconds)
+    finally:
+        threads.shutdown(wait=True, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=True, cancel_futures=True)
+
+
+def log_part_timings(results: List[PartLoadResult], elapsed: float) -> None:
+    """Log a one-line summary of a load run."""
+    if not results:
+        return
+    slowest = max(results, key=lambda result: result.seconds)
+    logger.info("Loaded %d WBS parts in %.3fs (total load time %.3fs, slowest %s at %.3fs)",
+                len(results), elapsed, sum(result.seconds for result in results),
+                slowest.filename, slowest.seconds)
@@ -10,6 +10,8 @@ import json
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
+from project_management.modules.main_modules.commit_task_log import CommitTaskLog, log_path_for
+
 def format_commit_message(message):
     """
     Format a commit message by cleaning and normalizing it.
@@ -49,10 +51,95 @@ def format_commit_message(message):
     
     return message
 
+def format_git_date(timestamp, tz_offset):
+    """
+    Format a unix timestamp and git timezone offset (e.g. '+0330') the way
+    `git log --pretty=format:%ad` does with the default date format.
+    """
+    sign = -1 if tz_offset.startswith('-') else 1
+    offset = datetime.timedelta(hours=int(tz_offset[1:3]), minutes=int(tz_offset[3:5])) * sign
+    dt = datetime.datetime.fromtimestamp(int(timestamp), datetime.timezone(offset))
+    return f"{dt:%a %b} {dt.day} {dt:%H:%M:%S %Y} {tz_offset}"
+
+class GitCatFileBatch:
+    """
+    Long-lived `git cat-file --batch` process. Objects and revisions (hashes,
+    HEAD, branch names) are resolved through a single process instead of
+    spawning git for every lookup.
+    """
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self.process = None
+
+    def _ensure_process(self):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd,
+            )
+        return self.process
+
+    def read_object(self, revision):
+        """Return (sha, object_type, raw_bytes) for a revision, or None if it does not exist."""
+        try:
+            process = self._ensure_process()
+            process.stdin.write(revision.encode('utf-8') + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline().decode('utf-8', errors='ignore').split()
+        except (OSError, ValueError):
+            self.close()
+            return None
+        if len(header) != 3:
+            # "<revision> missing" or "<revision> ambiguous"
+            return None
+        sha, object_type, size = header
+        data = process.stdout.read(int(size))
+        process.stdout.read(1)  # trailing newline
+        return sha, object_type, data
+
+    def resolve(self, revision):
+        """Resolve a revision (e.g. HEAD) to a full object hash."""
+        result = self.read_object(revision)
+        return result[0] if result else None
+
+    def read_commit(self, revision):
+        """Return commit metadata: hash, author, email, date, parent_commits."""
+        result = self.read_object(revision)
+        if not result or result[1] != "commit":
+            return None
+        sha, _, data = result
+        headers = data.decode('utf-8', errors='ignore').split("\n\n", 1)[0]
+        metadata = {"hash": sha, "author": "", "email": "", "date": "", "parent_commits": []}
+        for line in headers.splitlines():
+            if line.startswith("parent "):
+                metadata["parent_commits"].append(line[len("parent "):].strip())
+            elif line.startswith("author "):
+                match = re.match(r"author (.*) <(.*)> (\d+) ([+-]\d{4})", line)
+                if match:
+                    metadata["author"] = match.group(1)
+                    metadata["email"] = match.group(2)
+                    metadata["date"] = format_git_date(match.group(3), match.group(4))
+        return metadata
+
+    def close(self):
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+            self.process = None
+
 class AutoCommit:
     def __init__(self):
         from project_management.modules.services.backup_manager import BackupManager
         self.bm = BackupManager()
+        self.cat_file = GitCatFileBatch()
+        self._current_branch = None
 
     def run_git_command(self, args, cwd=None):
         """Run a git command and return (success, output)."""
@@ -148,7 +235,31 @@ class AutoCommit:
         except subprocess.CalledProcessError:
             return "Could not retrieve diff."
 
-    def generate_commit_message(self, group_name, category_name, files):
+    def get_staged_diff_summaries(self, file_paths):
+        """
+        Short diff summaries for several staged files from a single `git diff --staged` call.
+        Returns {file_path: summary}.
+        """
+        summaries = {f: "No diff available." for f in file_paths}
+        if not file_paths:
+            return summaries
+        success, output = self.run_git_command(["--literal-pathspecs", "diff", "--staged", "--"] + list(file_paths))
+        if not success:
+            return {f: "Could not retrieve diff." for f in file_paths}
+        current_file = None
+        current_lines = []
+        for line in output.splitlines() + ["diff --git "]:
+            if line.startswith("diff --git "):
+                if current_file in summaries and current_lines:
+                    summaries[current_file] = "\\n    ".join(current_lines[:5])
+                match = re.match(r"diff --git a/.* b/(.*)", line)
+                current_file = match.group(1) if match else None
+                current_lines = [line]
+            else:
+                current_lines.append(line)
+        return summaries
+
+    def generate_commit_message(self, group_name, category_name, files, diff_summaries=None):
         """Generate a professional conventional commit style message."""
         type_map = {
             "Added": "feat",
@@ -215,7 +326,7 @@ class AutoCommit:
                 "Unstaged": "This file has unstaged changes.",
                 "Both Modified": "This file was modified in both the index and working tree.",
             }.get(category_name, "")
-            diff_summary = self.get_file_diff_summary(f)
+            diff_summary = diff_summaries[f] if diff_summaries and f in diff_summaries else self.get_file_diff_summary(f)
             body += f"- {f}: {desc}\\n  Summary:\\n    {diff_summary}\\n"
 
         footer = "\\nPlease describe the reason or issue addressed by these changes."
@@ -320,44 +431,101 @@ class AutoCommit:
         urgency = min(max(urgency, 0), 1)
         return round(urgency, 3)
 
-    def update_commit_task_database(self, commit_hash, task_id, file_path, commit_message, workflow_stage=None, progress_change=0.0, importance_change=0, priority_change=0, db_path="JSonDataBase/OutPuts/commit_task_database.json"):
-        try:
-            with open(db_path, "r", encoding="utf-8") as f:
-                db = json.load(f)
-        except FileNotFoundError:
-            db = {}
-
-        dir_path = os.path.dirname(db_path)
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path, exist_ok=True)
+    def get_current_branch(self):
+        """Name of the checked-out branch, looked up once per AutoCommit instance."""
+        if self._current_branch is None:
+            success, branch = self.run_git_command(["rev-parse", "--abbrev-ref", "HEAD"])
+            self._current_branch = branch if success else ""
+        return self._current_branch
 
-        success_author, author = self.run_git_command(["log", "-1", "--pretty=format:%an", commit_hash])
-        success_email, email = self.run_git_command(["log", "-1", "--pretty=format:%ae", commit_hash])
-        success_date, date = self.run_git_command(["log", "-1", "--pretty=format:%ad", commit_hash])
-        success_branch, branch = self.run_git_command(["branch", "--contains", commit_hash])
-        success_parents, parents = self.run_git_command(["log", "-1", "--pretty=format:%P", commit_hash])
+    def get_commits_metadata(self, commit_hashes):
+        """
+        Fetch author, email, date and parents for many commits with one
+        `git log --no-walk` call. Returns {commit_hash: metadata}.
+        """
+        if not commit_hashes:
+            return {}
+        # One commit per line, fields separated by NUL
+        success, output = self.run_git_command(
+            ["log", "--no-walk=unsorted", "--pretty=format:%H%x00%an%x00%ae%x00%ad%x00%P"] + list(commit_hashes))
+        if not success:
+            return {}
+        metadata = {}
+        for record in output.splitlines():
+            fields = record.split("\x00")
+            if len(fields) != 5:
+                continue
+            commit_hash, author, email, date, parents = fields
+            metadata[commit_hash] = {
+                "hash": commit_hash,
+                "author": author,
+                "email": email,
+                "date": date,
+                "parent_commits": parents.split(),
+            }
+        return metadata
+
+    def get_commit_metadata(self, commit_hash):
+        """Metadata for a single commit, read through the long-lived cat-file process."""
+        return self.cat_file.read_commit(commit_hash)
+
+    def build_commit_task_entry(self, commit_hash, task_id, file_path, commit_message, workflow_stage=None, progress_change=0.0, importance_change=0, priority_change=0, metadata=None, file_paths=None):
+        # file_path is always one real path; file_paths lists every file in the commit
+        if metadata is None:
+            metadata = self.get_commit_metadata(commit_hash) or {}
+        # Commits created by an auto-commit pass are on the checked-out branch
+        branch = metadata.get("branch", self.get_current_branch())
 
         import time
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
 
-        db[commit_hash] = {
+        return {
             "task_id": task_id,
             "file_path": file_path,
+            "file_paths": list(file_paths) if file_paths else [file_path],
             "commit_message": commit_message,
             "workflow_stage": workflow_stage if workflow_stage else "",
             "progress_change": round(progress_change, 3),
             "importance_change": importance_change,
             "priority_change": priority_change,
             "timestamp": timestamp,
-            "author": author if success_author else "",
-            "email": email if success_email else "",
-            "date": date if success_date else "",
-            "branch": branch.strip() if success_branch else "",
-            "parent_commits": parents.split() if success_parents else []
+            "author": metadata.get("author", ""),
+            "email": metadata.get("email", ""),
+            "date": metadata.get("date", ""),
+            "branch": branch,
+            "parent_commits": metadata.get("parent_commits", [])
         }
 
-        with open(db_path, "w", encoding="utf-8") as f:
-            json.dump(db, f, indent=4, ensure_ascii=False)
+    def update_commit_task_database(self, commit_hash, task_id, file_path, commit_message, workflow_stage=None, progress_change=0.0, importance_change=0, priority_change=0, db_path="JSonDataBase/OutPuts/commit_task_database.json", metadata=None):
+        self.update_commit_task_database_batch([{
+            "commit_hash": commit_hash,
+            "task_id": task_id,
+            "file_path": file_path,
+            "commit_message": commit_message,
+            "workflow_stage": workflow_stage,
+            "progress_change": progress_change,
+            "importance_change": importance_change,
+            "priority_change": priority_change,
+            "metadata": metadata,
+        }], db_path=db_path)
+
+    def update_commit_task_database_batch(self, records, db_path="JSonDataBase/OutPuts/commit_task_database.json"):
+        """
+        Append several commits to the commit-task log next to db_path in one write.
+        Each record holds the keyword arguments of update_commit_task_database.
+        A legacy JSON database at db_path is imported into the log the first time.
+        """
+        log = CommitTaskLog(log_path_for(db_path))
+        log.import_json_database(db_path)
+
+        entries = []
+        for record in records:
+            record = dict(record)
+            commit_hash = record.pop("commit_hash")
+            entry = self.build_commit_task_entry(commit_hash, **record)
+            entry["commit_hash"] = commit_hash
+            entries.append(entry)
+        log.append(entries)
 
     def collect_commit_progress(self):
         changes = self.get_git_changes()
@@ -391,8 +559,9 @@ class AutoCommit:
 
         return progress_data
 
-    def write_commit_progress_to_json(self, file_path="JSonDataBase/OutPuts/commit_progress.json"):
-        progress_data = self.collect_commit_progress()
+    def write_commit_progress_to_json(self, file_path="JSonDataBase/OutPuts/commit_progress.json", progress_data=None):
+        if progress_data is None:
+            progress_data = self.collect_commit_progress()
         if not progress_data:
             print("No commit progress data to write.")
             return
@@ -420,7 +589,70 @@ class AutoCommit:
             print(f"Failed to write commit progress data to {file_path}: {e}")
 
 
-    def commit_and_push(self):
+    def calculate_file_task_changes(self, linked_wbs, group_name, workflow_stage, file_path):
+        """Importance and priority change for a committed file, based on its linked WBS task."""
+        task = self.find_task_by_file_path(linked_wbs, file_path)
+        if task:
+            dependencies = task.get("predecessors", [])
+            progress = 0.0
+            delays = 0
+            deadline_str = None
+            allocations = task.get("allocations", [])
+            if allocations:
+                start_dates = [alloc.get("start_date") for alloc in allocations if alloc.get("start_date")]
+                end_dates = [alloc.get("end_date") for alloc in allocations if alloc.get("end_date")]
+                if end_dates:
+                    deadline_str = max(end_dates)
+            if deadline_str:
+                try:
+                    deadline = datetime.datetime.strptime(deadline_str, "%Y-%m-%d")
+                except ValueError:
+                    deadline = None
+            else:
+                deadline = None
+        else:
+            dependencies = []
+            progress = 0.0
+            delays = 0
+            deadline = None
+
+        current_time = datetime.datetime.now()
+
+        importance_change = self.calculate_importance(group_name, workflow_stage, dependencies, progress, delays)
+        priority_change = self.calculate_urgency(deadline, current_time, delays, progress)
+        return importance_change, priority_change
+
+    def _run_git_with_paths(self, args, file_paths):
+        """Run `git <args>` on many files, passed through --pathspec-from-file."""
+        import tempfile
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".pathspec", delete=False) as f:
+            f.write("\0".join(file_paths))
+            pathspec_file = f.name
+        try:
+            # Paths are names, not globs: "a[1].py" or "*.md" must match only that file
+            success, _ = self.run_git_command(["--literal-pathspecs"] + args +
+                                              [f"--pathspec-from-file={pathspec_file}", "--pathspec-file-nul"])
+        finally:
+            os.remove(pathspec_file)
+        return success
+
+    def stage_files(self, file_paths):
+        """Stage many files with one `git add --pathspec-from-file` call."""
+        return self._run_git_with_paths(["add", "-A"], file_paths)
+
+    def unstage_files(self, file_paths):
+        """Unstage files again, e.g. after their commit failed."""
+        return self._run_git_with_paths(["reset", "-q"], file_paths)
+
+    def commit_and_push(self, grouped=False):
+        """
+        Commit every changed file separately and push after each commit.
+        With grouped=True, create one commit per group/category instead and
+        push the final HEAD once at the end (see commit_groups_and_push).
+        """
+        if grouped:
+            return self.commit_groups_and_push()
+
         linked_wbs = self.load_linked_wbs_resources()
         changes = self.get_git_changes()
         if not changes or (len(changes) == 1 and changes[0] == ''):
@@ -453,42 +685,13 @@ class AutoCommit:
                         print(f"Failed to commit file {f} for {group_name} - {category_name}. Skipping push.")
                         continue
 
-                    success_hash, commit_hash = self.run_git_command(["rev-parse", "HEAD"])
-                    if not success_hash:
+                    commit_hash = self.cat_file.resolve("HEAD")
+                    if not commit_hash:
                         print(f"Failed to get commit hash for file {f} in {group_name} - {category_name}.")
                         continue
 
                     progress_change = self.calculate_progress_change(workflow_stage, total_commits_in_group)
-
-                    task = self.find_task_by_file_path(linked_wbs, f)
-                    if task:
-                        dependencies = task.get("predecessors", [])
-                        progress = 0.0
-                        delays = 0
-                        deadline_str = None
-                        allocations = task.get("allocations", [])
-                        if allocations:
-                            start_dates = [alloc.get("start_date") for alloc in allocations if alloc.get("start_date")]
-                            end_dates = [alloc.get("end_date") for alloc in allocations if alloc.get("end_date")]
-                            if end_dates:
-                                deadline_str = max(end_dates)
-                        if deadline_str:
-                            try:
-                                deadline = datetime.datetime.strptime(deadline_str, "%Y-%m-%d")
-                            except ValueError:
-                                deadline = None
-                        else:
-                            deadline = None
-                    else:
-                        dependencies = []
-                        progress = 0.0
-                        delays = 0
-                        deadline = None
-
-                    current_time = datetime.datetime.now()
-
-                    importance_change = self.calculate_importance(group_name, workflow_stage, dependencies, progress, delays)
-                    priority_change = self.calculate_urgency(deadline, current_time, delays, progress)
+                    importance_change, priority_change = self.calculate_file_task_changes(linked_wbs, group_name, workflow_stage, f)
 
                     self.update_commit_task_database(commit_hash, group_name, f, commit_message, workflow_stage, progress_change, importance_change, priority_change)
 
@@ -500,8 +703,89 @@ class AutoCommit:
                     print(f"Committed and pushed changes for file: {f} in group: {group_name} - {category_name}")
 
         self.write_commit_progress_to_json()
+        self.cat_file.close()
+
+    def commit_groups_and_push(self):
+        """
+        Grouped auto-commit: one `git add --pathspec-from-file` and one commit per
+        group/category, then a single push of the final HEAD. Commit metadata is
+        fetched with one git log call and the commit-task database and progress
+        file are written once, after all commits are made.
+        """
+        linked_wbs = self.load_linked_wbs_resources()
+        changes = self.get_git_changes()
+        if not changes or (len(changes) == 1 and changes[0] == ''):
+            print("No changes detected.")
+            return
+
+        grouped_files = self.group_related_files(changes)
+        records = []
+        progress_data = defaultdict(dict)
+
+        for group_name, files in grouped_files.items():
+            categories = self.categorize_files(files)
+            workflow_stage = self.map_group_to_workflow_stage(group_name)
+            total_commits_in_group = len([c for c in categories.values() if c])
+
+            for category_name, category_files in categories.items():
+                if not category_files:
+                    continue
+
+                if not self.stage_files(category_files):
+                    print(f"Failed to stage files for {group_name} - {category_name}. Skipping commit.")
+                    continue
+
+                diff_summaries = self.get_staged_diff_summaries(category_files)
+                commit_message = self.generate_commit_message(group_name, category_name, category_files, diff_summaries)
+
+                success, _ = self.run_git_command(["commit", "-m", commit_message])
+                if not success:
+                    print(f"Failed to commit files for {group_name} - {category_name}.")
+                    # Otherwise the next category's commit would include them
+                    self.unstage_files(category_files)
+                    continue
+
+                commit_hash = self.cat_file.resolve("HEAD")
+                if not commit_hash:
+                    print(f"Failed to get commit hash for {group_name} - {category_name}.")
+                    continue
+
+                task_changes = [self.calculate_file_task_changes(linked_wbs, group_name, workflow_stage, f) for f in category_files]
+                records.append({
+                    "commit_hash": commit_hash,
+                    "task_id": group_name,
+                    "file_path": category_files[0],
+                    "file_paths": category_files,
+                    "commit_message": commit_message,
+                    "workflow_stage": workflow_stage,
+                    "progress_change": self.calculate_progress_change(workflow_stage, total_commits_in_group),
+                    "importance_change": max(change[0] for change in task_changes),
+                    "priority_change": max(change[1] for change in task_changes),
+                })
+                # Same shape as collect_commit_progress; the files share one commit
+                progress_data[group_name][category_name] = {
+                    "files": category_files,
+                    "commit_messages": [{"file": f, "commit_message": commit_message} for f in category_files],
+                }
+                print(f"Committed {len(category_files)} file(s) in group: {group_name} - {category_name}")
+
+        self.cat_file.close()
+        if not records:
+            return
+
+        metadata = self.get_commits_metadata([record["commit_hash"] for record in records])
+        for record in records:
+            record["metadata"] = metadata.get(record["commit_hash"], {})
+        self.update_commit_task_database_batch(records)
+        self.write_commit_progress_to_json(progress_data=progress_data)
+
+        success, output = self.run_git_command(["push", "--set-upstream", "origin", "main"])
+        if not success:
+            print(f"Failed to push {len(records)} commit(s). Error: {output}")
+            return
+        print(f"Pushed {len(records)} commit(s) in a single push.")
 
 if __name__ == "__main__":
     auto_commit = AutoCommit()
     auto_commit.backup()
-    auto_commit.commit_and_push()
+    auto_commit.commit_and_push(grouped="--grouped" in sys.argv)
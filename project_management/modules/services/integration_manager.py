@@ -1,42 +1,125 @@
-import subprocess
+import os
+import sys
 import logging
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from project_management.modules.main_modules.wbs_merger import WBSMerger
+from project_management.modules.main_modules.resource_allocation_manager import ResourceAllocationManager
+from project_management.modules.main_modules.scope_management import ScopeManagement
+from project_management.modules.main_modules.time_management import TimeManagement
+from project_management.modules.main_modules.resource_management import ResourceManagement
+from project_management.modules.main_modules.quality_management import QualityManagement
+from project_management.modules.main_modules.communication_management import CommunicationManagement
+from project_management.modules.main_modules.estimation_management import EstimationManagement
+from project_management.modules.main_modules.commit_progress_manager import CommitProgressManager
+from project_management.modules.main_modules.reporting import Reporting
+from project_management.modules.services.pipeline import Pipeline, Stage, ManagerStage, ScriptStage
+
+MAIN_MODULES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'main_modules'))
+
 logger = logging.getLogger("integration_manager")
 logging.basicConfig(level=logging.INFO)
 
+# Stages whose outputs are derived from the merged detailed WBS. When the WBS
+# merge is a cache hit they are skipped if their outputs are newer than their inputs.
+WBS_DEPENDENT_STAGES = ('resource_allocation_manager', 'scope_management', 'time_management')
+
+
+def _stage_paths(manager):
+    """Input and output file paths declared by a manager's *_path attributes."""
+    inputs = []
+    outputs = []
+    for name, value in vars(manager).items():
+        if not name.endswith('_path') or not isinstance(value, str):
+            continue
+        if name == 'output_path' or name.endswith('_output_path'):
+            outputs.append(value)
+        else:
+            inputs.append(value)
+    return inputs, outputs
+
+
+def is_up_to_date(manager):
+    """True if every output of the manager exists and is newer than all of its existing inputs."""
+    inputs, outputs = _stage_paths(manager)
+    if not outputs or not all(os.path.exists(path) for path in outputs):
+        return False
+    newest_input = max((os.path.getmtime(path) for path in inputs if os.path.exists(path)), default=0)
+    return min(os.path.getmtime(path) for path in outputs) >= newest_input
+
+
 class IntegrationManager:
-    def __init__(self):
-        self.modules = [
-            'wbs_merger.py',
-            'resource_allocation_manager.py',
-            'scope_management.py',
-            'time_management.py',
-            'resource_management.py',
-            'quality_management.py',
-            'risk_management.py',
-            'communication_management.py',
-            'estimation_management.py',
-            'commit_progress_manager.py',
-            'reporting.py'
-        ]
+    """
+    Runs the project management modules as one in-process pipeline. Stages
+    that do not depend on each other run concurrently, and outputs are passed
+    to later stages in memory rather than re-read from disk. The WBS-based
+    stages read the merger's output_file, so they get the merged WBS from the
+    wbs_merger stage.
+    """
+
+    def __init__(self, max_workers=4, wbs_merger=None):
+        self.max_workers = max_workers
+        self.wbs_merger = wbs_merger if wbs_merger is not None else WBSMerger()
+        self.wbs_cache_status = None
+        self.skipped_modules = []
+        self.timings = []
+
+    def run_wbs_merge(self, artifacts):
+        """Merge the WBS parts; the merge's cache status decides whether WBS-derived stages rerun."""
+        merger = self.wbs_merger
+        merged_wbs = merger.merge_all_parts()
+        self.wbs_cache_status = merger.cache_status
+        logger.info(f"WBS merge cache status: {self.wbs_cache_status}")
+        return {merger.output_file: merged_wbs}
+
+    def _skip_if_wbs_unchanged(self, manager):
+        return lambda: self.wbs_cache_status == 'hit' and is_up_to_date(manager)
 
-    def run_module(self, module_name):
-        logger.info(f"Running {module_name}...")
-        result = subprocess.run(['python3', f'project_management/modules/{module_name}'], capture_output=True, text=True)
-        logger.info(result.stdout)
-        if result.returncode != 0:
-            logger.error(f"Error running {module_name}: {result.stderr}")
-            return False
-        return True
+    def _manager_stage(self, name, manager, after=(), copy_inputs=True):
+        skip_if = self._skip_if_wbs_unchanged(manager) if name in WBS_DEPENDENT_STAGES else None
+        return ManagerStage(name, manager, after=after, copy_inputs=copy_inputs, skip_if=skip_if)
+
+    def build_pipeline(self):
+        commit_progress = CommitProgressManager()
+        wbs_path = self.wbs_merger.output_file
+        stages = [
+            Stage('wbs_merger', self.run_wbs_merge, outputs=[wbs_path]),
+            # Resource allocation and scope management modify the WBS they load, so they get their own copy
+            self._manager_stage('resource_allocation_manager', ResourceAllocationManager(detailed_wbs_path=wbs_path),
+                                after=['wbs_merger']),
+            self._manager_stage('scope_management', ScopeManagement(detailed_wbs_path=wbs_path), after=['wbs_merger']),
+            self._manager_stage('time_management', TimeManagement(detailed_wbs_path=wbs_path), after=['wbs_merger'],
+                                copy_inputs=False),
+            self._manager_stage('resource_management', ResourceManagement(), copy_inputs=False),
+            self._manager_stage('quality_management', QualityManagement(detailed_wbs_path=wbs_path),
+                                after=['wbs_merger'], copy_inputs=False),
+            ScriptStage('risk_management', os.path.join(MAIN_MODULES_DIR, 'risk_management.py')),
+            self._manager_stage('communication_management', CommunicationManagement(), copy_inputs=False),
+            self._manager_stage('estimation_management', EstimationManagement(detailed_wbs_path=wbs_path),
+                                after=['wbs_merger'], copy_inputs=False),
+            Stage('commit_progress_manager', lambda artifacts: commit_progress.run(),
+                  inputs=[commit_progress.commit_task_db_path], outputs=[commit_progress.commit_progress_path]),
+            self._manager_stage('reporting', Reporting(), copy_inputs=False,
+                                after=['resource_allocation_manager', 'time_management',
+                                       'risk_management', 'quality_management']),
+        ]
+        return Pipeline(stages, max_workers=self.max_workers)
 
     def run_all(self):
-        for module in self.modules:
-            success = self.run_module(module)
-            if not success:
-                logger.error(f"Stopping integration due to error in {module}")
-                break
-        else:
+        self.wbs_cache_status = None
+        pipeline = self.build_pipeline()
+        success = pipeline.run()
+        self.timings = pipeline.timings
+        self.skipped_modules = [t['stage'] for t in self.timings if t['status'] == 'skipped']
+        for timing in sorted(self.timings, key=lambda t: -t['seconds']):
+            logger.info(f"{timing['stage']}: {timing['status']} in {timing['seconds']:.3f}s")
+        if success:
             logger.info("All modules executed successfully.")
+        else:
+            failed = [t['stage'] for t in self.timings if t['status'] == 'failed']
+            logger.error(f"Stopping integration due to error in {', '.join(failed)}")
+        return success
 
 if __name__ == "__main__":
     manager = IntegrationManager()
@@ -1,6 +1,8 @@
 import json
 import os
 
+from project_management.modules.main_modules.json_cache import load_json_cached, invalidate_cached_json
+
 class JSONDataLinker:
     def __init__(self, input_dir="project_inputs/PM_JSON/user_inputs", intermediate_dir="project_management/PM_SystemOutputs/intermediate", output_dir="project_management/PM_SystemOutputs/system_outputs"):
         self.input_dir = input_dir
@@ -11,14 +13,15 @@ class JSONDataLinker:
 
     def load_json(self, filename):
         path = os.path.join(self.input_dir, filename)
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Tasks are enriched in place, so take a private copy of the cached document
+        return load_json_cached(path, copy=True)
 
     def save_json(self, data, filename, intermediate=True):
         dir_path = self.intermediate_dir if intermediate else self.output_dir
         path = os.path.join(dir_path, filename)
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        invalidate_cached_json(path)
 
     def link_wbs_and_resources(self):
         """
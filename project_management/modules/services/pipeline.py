@@ -0,0 +1,241 @@
+"""
+Pipeline Module - In-process runner for a DAG of project management stages
+"""
+
+import os
+import runpy
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from project_management.modules.main_modules.json_cache import freeze, thaw
+
+logger = logging.getLogger(__name__)
+
+# runpy swaps sys.modules['__main__'] while a script runs, so scripts run one at a time
+_script_lock = threading.Lock()
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    func(artifacts) runs the step and returns {output path: parsed object} for
+    the outputs it wrote; artifacts maps the normalized paths of outputs written
+    by earlier stages of the same run to read-only views (FrozenDict/FrozenList)
+    of their parsed objects. Dependencies come
+    from inputs (a stage runs after any stage that outputs one of its inputs)
+    and from after (names of stages that must run first).
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), after=(), skip_if=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.skip_if = skip_if
+
+    def run(self, artifacts):
+        produced = self.func(artifacts)
+        return produced if isinstance(produced, dict) else {}
+
+
+class ManagerStage(Stage):
+    """
+    Stage running a manager's run() method in-process.
+
+    Works with any manager that reads its inputs through load_json(path) and
+    writes its outputs through save_json(data, path), as BaseManagement and the
+    WBS managers do. Inputs produced earlier in the run are served from memory
+    instead of being read from disk, and everything passed to save_json is
+    returned as the stage's output artifacts. Managers that modify their inputs
+    in place get a mutable copy (copy_inputs=True); the others share the
+    artifact's read-only view, as they would get from load_json_cached, so
+    stages running concurrently never share a mutable object.
+    """
+
+    def __init__(self, name, manager, after=(), copy_inputs=True, skip_if=None):
+        super().__init__(name, None, inputs=manager_input_paths(manager),
+                         outputs=manager_output_paths(manager), after=after, skip_if=skip_if)
+        self.manager = manager
+        self.copy_inputs = copy_inputs
+
+    def run(self, artifacts):
+        manager = self.manager
+        load_json = manager.load_json
+        save_json = manager.save_json
+        produced = {}
+
+        def load_from_pipeline(path):
+            key = normalize_path(path)
+            if key in artifacts:
+                value = artifacts[key]
+                return thaw(value) if self.copy_inputs else value
+            return load_json(path)
+
+        def save_to_pipeline(data, path):
+            save_json(data, path)
+            produced[path] = data
+
+        manager.load_json = load_from_pipeline
+        manager.save_json = save_to_pipeline
+        try:
+            manager.run()
+        finally:
+            del manager.load_json
+            del manager.save_json
+        return produced
+
+
+class ScriptStage(Stage):
+    """Stage running a module file as __main__ in this interpreter, for modules without a manager class."""
+
+    def __init__(self, name, path, inputs=(), outputs=(), after=(), skip_if=None):
+        super().__init__(name, None, inputs=inputs, outputs=outputs, after=after, skip_if=skip_if)
+        self.path = path
+
+    def run(self, artifacts):
+        with _script_lock:
+            runpy.run_path(self.path, run_name='__main__')
+        return {}
+
+
+def manager_input_paths(manager):
+    """Input paths of a manager: input_paths for BaseManagement, otherwise its *_path attributes."""
+    if isinstance(getattr(manager, 'input_paths', None), dict):
+        return list(manager.input_paths.values())
+    return [value for name, value in vars(manager).items()
+            if name.endswith('_path') and isinstance(value, str)
+            and name != 'output_path' and not name.endswith('_output_path')]
+
+
+def manager_output_paths(manager):
+    return [value for name, value in vars(manager).items()
+            if (name == 'output_path' or name.endswith('_output_path')) and isinstance(value, str)]
+
+
+class PipelineError(Exception):
+    pass
+
+
+class Pipeline:
+    """
+    Runs stages in dependency order, running stages whose dependencies are all
+    done concurrently on a thread pool. Parsed outputs are handed to later
+    stages in memory as read-only views, frozen once when the producing stage
+    finishes. After a stage fails no new stages are started, like the
+    sequential runner this replaces.
+
+    Each run records one timing entry per stage in timings:
+    {'stage', 'status', 'seconds', 'start'} where status is 'ok', 'failed',
+    'skipped' or 'not_run' and start is relative to the start of the run.
+    """
+
+    def __init__(self, stages, max_workers=4):
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self.dependencies = self._build_dependencies()
+        self.timings = []
+        self.artifacts = {}
+
+    def _build_dependencies(self):
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise PipelineError("Stage names must be unique")
+        producers = {}
+        for stage in self.stages:
+            for path in stage.outputs:
+                producers.setdefault(normalize_path(path), []).append(stage.name)
+        dependencies = {}
+        for stage in self.stages:
+            deps = set()
+            for path in stage.inputs:
+                deps.update(producers.get(normalize_path(path), []))
+            for name in stage.after:
+                if name not in names:
+                    raise PipelineError(f"Stage {stage.name} runs after unknown stage {name}")
+                deps.add(name)
+            deps.discard(stage.name)
+            dependencies[stage.name] = deps
+        self._check_acyclic(dependencies)
+        return dependencies
+
+    def _check_acyclic(self, dependencies):
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise PipelineError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _run_stage(self, stage, run_start):
+        start = time.perf_counter()
+        try:
+            if stage.skip_if is not None and stage.skip_if():
+                return stage, 'skipped', {}, None, start - run_start, 0.0
+            produced = stage.run(self.artifacts)
+            return stage, 'ok', produced, None, start - run_start, time.perf_counter() - start
+        except (Exception, SystemExit) as e:
+            # SystemExit from a script stage is a failure of that stage, not of the runner
+            return stage, 'failed', {}, e, start - run_start, time.perf_counter() - start
+
+    def run(self):
+        """
+        Run all stages.
+
+        Returns:
+            True if every stage succeeded or was skipped
+        """
+        self.timings = []
+        self.artifacts = {}
+        stages = {stage.name: stage for stage in self.stages}
+        waiting = {name: set(deps) for name, deps in self.dependencies.items()}
+        done = set()
+        failed = False
+        running = {}
+        run_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            while True:
+                if not failed:
+                    # Start stages in declaration order as soon as their dependencies are done
+                    for stage in self.stages:
+                        if stage.name in waiting and waiting[stage.name] <= done:
+                            del waiting[stage.name]
+                            running[executor.submit(self._run_stage, stage, run_start)] = stage.name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    stage, status, produced, error, started, seconds = future.result()
+                    self.timings.append({'stage': stage.name, 'status': status,
+                                         'seconds': round(seconds, 6), 'start': round(started, 6)})
+                    if status == 'failed':
+                        logger.error(f"Error running {stage.name}: {error}")
+                        failed = True
+                        continue
+                    for path, data in produced.items():
+                        self.artifacts[normalize_path(path)] = freeze(data)
+                    done.add(stage.name)
+                    if status == 'skipped':
+                        logger.info(f"Skipped {stage.name}")
+                    else:
+                        logger.info(f"Finished {stage.name} in {seconds:.3f}s")
+
+        for stage in self.stages:
+            if stage.name in waiting:
+                self.timings.append({'stage': stage.name, 'status': 'not_run', 'seconds': 0.0, 'start': None})
+        elapsed = time.perf_counter() - run_start
+        logger.info(f"Pipeline ran {len(done)} of {len(stages)} stages in {elapsed:.3f}s "
+                    f"(total stage time {sum(t['seconds'] for t in self.timings):.3f}s)")
+        return not failed